@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Memory benchmark of the plain Python graph model. Prints the bytes allocated per `Node`, `Socket` and `Edge` and
+for a whole loaded scene. Usage::
+
+    python benchmarks/model_memory.py [number of nodes]
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from nodeeditor.node_model import SceneModel, NodeModel, SocketModel, EdgeModel
+
+
+def allocated(create: 'function', count: int) -> float:
+    """Return the bytes allocated per object by calling `create` `count` times"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [create(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # the list holding the objects is not part of their cost
+    return (after - before - sys.getsizeof(objects)) / count
+
+
+def buildChain(scene: SceneModel, count: int):
+    """Fill `scene` with `count` nodes with two inputs and one output, each output connected to the next node"""
+    previous = None
+    for i in range(count):
+        node = NodeModel(scene)
+        node.inputs = [SocketModel(node, 0, socket_type=0, is_input=True),
+                       SocketModel(node, 1, socket_type=1, is_input=True)]
+        node.outputs = [SocketModel(node, 0, socket_type=0)]
+        scene.addNode(node)
+        for socket in node.inputs + node.outputs: scene.addSocket(socket)
+        if previous is not None: scene.addEdge(EdgeModel(previous.outputs[0], node.inputs[0]))
+        previous = node
+
+
+def main(argv: list = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 20000
+
+    scene = SceneModel()
+    node = NodeModel(scene)
+    sockets = [SocketModel(node, 0, is_input=True), SocketModel(node, 0)]
+
+    print("%-12s %10s" % ("object", "bytes"))
+    print("%-12s %10.1f" % ("NodeModel", allocated(lambda i: NodeModel(scene), count)))
+    print("%-12s %10.1f" % ("SocketModel", allocated(lambda i: SocketModel(node, i), count)))
+    print("%-12s %10.1f" % ("EdgeModel", allocated(lambda i: EdgeModel(sockets[1], sockets[0]), count)))
+
+    gc.collect()
+    tracemalloc.start()
+    scene = SceneModel()
+    buildChain(scene, count)
+    total = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print("scene of %d nodes, %d sockets, %d edges: %.1f MB, %.1f bytes per node" % (
+        len(scene.nodes), len(scene.sockets_by_id), len(scene.edges), total / 2 ** 20, total / count))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
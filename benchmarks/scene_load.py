@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Load benchmark of large scenes. Prints the file size and the time to decode and to load into a
+:class:`~nodeeditor.node_model.SceneModel` for the former indented JSON files, the compact JSON files and the
+binary files of :mod:`~nodeeditor.node_scene_binary`. Usage::
+
+    python benchmarks/scene_load.py [number of nodes]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from model_memory import buildChain
+from nodeeditor import node_json
+from nodeeditor.node_model import SceneModel
+from nodeeditor.node_scene_binary import dumpBinary, loadSceneData
+
+
+def best(function: 'function', repeat: int = 3) -> float:
+    """Return the best time of `repeat` calls of `function`"""
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def decode(filename: str):
+    with open(filename, "rb") as file: loadSceneData(file)
+
+
+def main(argv: list = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 10000
+
+    scene = SceneModel()
+    buildChain(scene, count)
+    data = scene.serialize()
+    directory = tempfile.mkdtemp()
+
+    files = [("indented json", os.path.join(directory, "indented.json")),
+             ("compact json", os.path.join(directory, "compact.json")),
+             ("binary", os.path.join(directory, "scene.bin"))]
+    with open(files[0][1], "w") as file: file.write(json.dumps(data, indent=4))
+    with open(files[1][1], "wb") as file: node_json.dumpJSON(data, file)
+    with open(files[2][1], "wb") as file: dumpBinary(data, file)
+
+    print("scene of %d nodes, %d edges, JSON backend %s" % (len(scene.nodes), len(scene.edges),
+                                                             node_json.JSON_BACKEND))
+    print("%-14s %12s %10s %10s" % ("file", "bytes", "decode", "load"))
+    for name, filename in files:
+        print("%-14s %12d %10.3f %10.3f" % (name, os.path.getsize(filename), best(lambda: decode(filename)),
+                                           best(lambda: SceneModel().loadFromFile(filename))))
+        os.remove(filename)
+    os.rmdir(directory)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Save benchmark of large scenes. Prints the time and the file size of the former indented ``json.dumps`` save
+and of the compact streaming writer of :mod:`~nodeeditor.node_json`, with the installed backend and with the
+standard library. Usage::
+
+    python benchmarks/scene_save.py [number of nodes]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from model_memory import buildChain
+from nodeeditor import node_json
+from nodeeditor.node_model import SceneModel
+
+
+def indentedSave(data: dict, filename: str):
+    """Save the way ``NodeScene.saveToFile`` did before the compact mode"""
+    with open(filename, "w") as file:
+        file.write(json.dumps(data, indent=4))
+
+
+def compactSave(data: dict, filename: str):
+    with open(filename, "wb") as file:
+        node_json.dumpJSON(data, file)
+
+
+def measure(save: 'function', data: dict, filename: str, repeat: int = 3) -> (float, int):
+    """Return the best time of `repeat` saves of `data` and the size of the file"""
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        save(data, filename)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, os.path.getsize(filename)
+
+
+def main(argv: list = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 20000
+
+    scene = SceneModel()
+    buildChain(scene, count)
+    data = scene.serialize()
+    filename = os.path.join(tempfile.mkdtemp(), "scene.json")
+
+    results = [("indented json", measure(indentedSave, data, filename))]
+    results.append(("compact %s" % node_json.JSON_BACKEND, measure(compactSave, data, filename)))
+    if node_json.JSON_BACKEND != "json":
+        backends = node_json.orjson, node_json.ujson
+        node_json.orjson = node_json.ujson = None
+        results.append(("compact json", measure(compactSave, data, filename)))
+        node_json.orjson, node_json.ujson = backends
+    os.remove(filename)
+
+    print("scene of %d nodes, %d edges" % (len(scene.nodes), len(scene.edges)))
+    print("%-16s %10s %12s" % ("writer", "seconds", "bytes"))
+    for name, (elapsed, size) in results:
+        print("%-16s %10.3f %12d" % (name, elapsed, size))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,5 @@
 from examples.example_calculator.master_window import *
+from nodeeditor.node_scene_binary import BINARY_EXTENSION
 
 
 class FilesWDG(QWidget):
@@ -37,7 +38,7 @@ class FilesWDG(QWidget):
         for file_name in selected_files:
             file_path = QFileSystemModel().filePath(file_name)
 
-            if file_path.endswith(".json"):
+            if file_path.endswith((".json", BINARY_EXTENSION)):
                 if not all_files.__contains__(file_path):
                     all_files.append(file_path)
                     # print(all_files)
@@ -42,7 +42,7 @@ class PropertiesList(QScrollArea):
         i = self.nodeRef.scene.nodes
         if self.order.value() > len(i)-1:
             self.order.setValue(len(i)-1)
-        i[self.nodeRef.getNodeOrder()], i[self.order.value()] = i[self.order.value()], i[self.nodeRef.getNodeOrder()]
+        i.swap(self.nodeRef.getNodeOrder(), self.order.value())
 
         self.nodeRef.scene.NodeEditor.UpdateTextCode()
 
@@ -177,6 +177,22 @@ class VarEventList(QTabWidget):
         # Add new QListItem to the UI List using Init Data
         self.addMyItem(newEvent.name, newEvent.icon, eventData[1], node.node_type, self.EventList)
 
+    def ClearVars(self):
+        # Forget all Variables, before loading the ones of a restored Scene
+        for varData in self.user_vars_data:
+            if varData[0] in self.var_event_names: self.var_event_names.remove(varData[0])
+        self.user_vars_data = []
+        self.USERVARS = {}
+        self.VarList.clear()
+
+    def ClearEvents(self):
+        # Forget all Events, before loading the ones of a restored Scene
+        for eventData in self.user_events_data:
+            if eventData[0] in self.var_event_names: self.var_event_names.remove(eventData[0])
+        self.user_events_data = []
+        self.USEREVENTS = {}
+        self.EventList.clear()
+
     def addNewVariable(self):
         # Get new Variable type and construct new Variable object
         node = get_node_by_type(self.varsIds.__getitem__(self.varCompoBox.currentIndex()))
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Command line compiler turning saved graph files into Python scripts without a display.
+
+The graph is loaded into a :class:`~nodeeditor.node_model.SceneModel`, no ``QApplication``, ``QGraphicsItem``
+or widget is created. Code comes from the `Node` classes registered in ``nodes_configuration.py``, so the output
+is the same as the code copied from ``MasterWindow``. Usage::
+
+    python -m examples.example_calculator.graph_compiler graph.json -o script.py
+
+A directory is compiled in batch mode: every graph in the directory tree is compiled in parallel by a process pool
+and written to the ``Generated Scripts`` folder, or to the directory given with ``-o``::
+
+    python -m examples.example_calculator.graph_compiler project_directory -j 8
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from examples.example_calculator.nodes.nodes_configuration import EVENTS, ConfException, get_node_by_type
+from nodeeditor.node_code import PythonEmitter, pythonProgram
+from nodeeditor.node_code_passes import defaultPasses
+from nodeeditor.node_model import SceneModel, InvalidFile
+from nodeeditor.node_scene_binary import BINARY_EXTENSION
+
+#: modules of ``examples.example_calculator.nodes`` registering the `Node` classes
+NODE_MODULES = ("default_functions", "variables_nodes", "event_nodes")
+
+#: folders of a project directory which do not hold graphs to compile
+SKIPPED_DIRECTORIES = ("AutoSave", "Generated Scripts")
+
+
+def loadNodeRegistry():
+    """Import the `Node` modules so their classes get registered"""
+    for module in NODE_MODULES:
+        importlib.import_module("examples.example_calculator.nodes." + module)
+
+
+def getCodeFunction(data: dict) -> 'function':
+    """Return the code function of the registered `Node` class for serialized `Node` data. Variables and events
+    use ``setterCode`` or ``getterCode`` like they do after ``Node.deserialize``"""
+    if 'node_type' not in data: return None
+    node_class = get_node_by_type(data['node_type'])
+    if data['is_var'] or data['node_type'] in EVENTS:
+        return node_class.setterCode if data['is_setter'] else node_class.getterCode
+    return node_class.getNodeCode
+
+
+def compileGraph(filename: str, fold_constants: bool = False) -> str:
+    """
+    Compile the graph file into Python
+
+    :param filename: graph file saved by the editor
+    :type filename: ``str``
+    :param fold_constants: fold operations on constants, see :class:`~nodeeditor.node_code_passes.ConstantFoldingPass`
+    :type fold_constants: ``bool``
+    :return: Python source code
+    :rtype: ``str``
+    :raises: :class:`~nodeeditor.node_model.InvalidFile` if the file is not a valid graph
+    """
+    return compileGraphProgram(filename, fold_constants)[0]
+
+
+def compileGraphProgram(filename: str, fold_constants: bool = False) -> tuple:
+    """
+    Compile the graph file into Python, with the source map linking the lines of the code to the `Nodes` of the
+    graph
+
+    :param filename: graph file saved by the editor
+    :type filename: ``str``
+    :param fold_constants: fold operations on constants, see :class:`~nodeeditor.node_code_passes.ConstantFoldingPass`
+    :type fold_constants: ``bool``
+    :return: (Python source code, :class:`~nodeeditor.node_code.SourceMap` of the code)
+    :rtype: ``tuple``
+    :raises: :class:`~nodeeditor.node_model.InvalidFile` if the file is not a valid graph
+    """
+    loadNodeRegistry()
+    scene = SceneModel(getCodeFunction)
+    scene.loadFromFile(filename)
+    return pythonProgram(scene.getCodeRoots(), PythonEmitter(passes=defaultPasses(fold_constants)))
+
+
+def compileGraphJob(filename: str, fold_constants: bool = False) -> tuple:
+    """Compile one graph in a worker process. Errors are returned instead of raised, so one broken graph does not
+    stop the batch
+
+    :return: (`filename`, code or ``None``, error message or ``None``, seconds spent)
+    :rtype: ``tuple``
+    """
+    start = time.perf_counter()
+    try:
+        code, error = compileGraph(filename, fold_constants), None
+    except Exception as e:
+        code, error = None, "%s: %s" % (e.__class__.__name__, e)
+    return filename, code, error, time.perf_counter() - start
+
+
+def findGraphs(directory: str) -> list:
+    """Return all graph files in the `directory` tree, sorted so the batch output order is deterministic"""
+    graphs = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [name for name in dirs if name not in SKIPPED_DIRECTORIES]
+        for name in files:
+            if name.endswith((".json", BINARY_EXTENSION)): graphs.append(os.path.join(root, name))
+    return sorted(graphs)
+
+
+def compileDirectory(directory: str, output_directory: str = None, jobs: int = None, report=None,
+                     fold_constants: bool = False) -> list:
+    """
+    Compile every graph in the `directory` tree in parallel. Scripts keep the relative path of their graph
+    inside `output_directory`
+
+    :param directory: project directory holding the graphs
+    :type directory: ``str``
+    :param output_directory: where to write the scripts, ``Generated Scripts`` inside `directory` by default
+    :type output_directory: ``str``
+    :param jobs: number of worker processes, CPU count by default. ``1`` compiles in this process
+    :type jobs: ``int``
+    :param report: function called with each result of :func:`compileGraphJob`, in the order of the graphs
+    :type report: ``function``
+    :param fold_constants: fold operations on constants
+    :type fold_constants: ``bool``
+    :return: results of :func:`compileGraphJob` sorted by graph file name
+    :rtype: ``list``
+    """
+    if output_directory is None: output_directory = os.path.join(directory, "Generated Scripts")
+    graphs = findGraphs(directory)
+    if jobs is None: jobs = os.cpu_count() or 1
+    job = partial(compileGraphJob, fold_constants=fold_constants)
+
+    if jobs == 1 or len(graphs) < 2:
+        results = map(job, graphs)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        # executor.map keeps the order of the graphs, chunks amortize the inter-process overhead of small graphs
+        results = executor.map(job, graphs, chunksize=max(1, len(graphs) // (jobs * 4)))
+
+    done = []
+    try:
+        for result in results:
+            filename, code, error, seconds = result
+            if code is not None:
+                script = os.path.join(output_directory, os.path.splitext(os.path.relpath(filename, directory))[0] + ".py")
+                os.makedirs(os.path.dirname(script), exist_ok=True)
+                with open(script, "w", encoding='utf-8') as file:
+                    file.write(code)
+            if report is not None: report(result)
+            done.append(result)
+    finally:
+        if executor is not None: executor.shutdown()
+    return done
+
+
+def printReport(result: tuple):
+    filename, code, error, seconds = result
+    if error is None:
+        print("%8.1f ms  %s" % (seconds * 1000, filename))
+    else:
+        print("%8.1f ms  %s FAILED %s" % (seconds * 1000, filename, error), file=sys.stderr)
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Compile graph files into Python scripts without a display")
+    parser.add_argument("graph", help="graph file saved by the editor, or a project directory to compile all graphs")
+    parser.add_argument("-o", "--output", help="write the script to this file instead of stdout. In batch mode the "
+                                               "directory for the scripts")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="batch mode worker processes, CPU count by default")
+    parser.add_argument("--fold-constants", action="store_true", help="compute operations on constants at compile time")
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.graph):
+        start = time.perf_counter()
+        results = compileDirectory(args.graph, args.output, args.jobs, printReport, args.fold_constants)
+        failed = sum(1 for result in results if result[2] is not None)
+        print("compiled %d graphs, %d failed, in %.2f s" % (len(results) - failed, failed, time.perf_counter() - start))
+        return 1 if failed else 0
+
+    try:
+        code = compileGraph(args.graph, args.fold_constants)
+    except (OSError, InvalidFile, ConfException, KeyError) as e:
+        print("%s: %s" % (args.graph, e), file=sys.stderr)
+        return 1
+
+    if args.output is None:
+        sys.stdout.write(code)
+    else:
+        with open(args.output, "w", encoding='utf-8') as file:
+            file.write(code)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
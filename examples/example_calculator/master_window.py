@@ -13,6 +13,7 @@ from examples.example_calculator.editor_var_events_lists import VarEventList
 from examples.example_calculator.editor_proterties_list import PropertiesList
 
 from nodeeditor.utils import dumpException, pp
+from nodeeditor.node_scene_binary import BINARY_EXTENSION
 # from examples.example_calculator.nodes_configuration import FUNCTIONS
 
 # Enabling edge validators
@@ -194,7 +195,7 @@ class MasterWindow(NodeEditorWindow):
         for file_name in selected_files:
             file_path = QFileSystemModel().filePath(file_name)
 
-            if file_path.endswith(".json"):
+            if file_path.endswith((".json", BINARY_EXTENSION)):
                 if not all_files.__contains__(file_path):
                     all_files.append(file_path)
                     # print(all_files)
@@ -250,15 +251,24 @@ class MasterWindow(NodeEditorWindow):
         self.copy_code_btn.triggered.connect(self.CopyTextCode)
         self.copy_code_btn.setShortcut(QKeySequence("Ctrl+Shift+C"))
 
+        # Add and connect self.fold_constants_btn
+        self.fold_constants_btn = QAction("&Fold Constants In The Generated Code", self)
+        self.fold_constants_btn.setCheckable(True)
+        self.tools_bar.addAction(self.fold_constants_btn)
+        self.fold_constants_btn.toggled.connect(self.FoldConstants)
+
+    def FoldConstants(self, checked):
+        for window in self.graphs_parent_wdg.subWindowList():
+            window.widget().setFoldConstants(checked)
+
     def CopyTextCode(self):
         node_editor = self.CurrentNodeEditor()
 
         if node_editor is not None:
-            node_editor.TextCodeWnd.selectAll()
-            node_editor.TextCodeWnd.copy()
+            text = node_editor.getPythonCode()
+            QApplication.instance().clipboard().setText(text)
             python_file_name = node_editor.windowTitle()
 
-            text = node_editor.TextCodeWnd.toPlainText()
             if os.listdir(self.filesWidget.Project_Directory).__contains__("Generated Scripts") is False:
                 os.makedirs(self.filesWidget.Project_Directory + "/Generated Scripts")
                 f = self.filesWidget.Project_Directory + f"""/Generated Scripts/{python_file_name}.py"""
@@ -357,8 +367,12 @@ class MasterWindow(NodeEditorWindow):
                         nodeEditor = MasterEditorWnd()
                         subwnd = self.newGraphTab(nodeEditor)
 
-                        if nodeEditor.fileLoad(file_name):
-                            self.statusBar().showMessage("File %s loaded" % file_name, 5000)
+                        # the nodes show up while the file is loading
+                        loader = nodeEditor.fileLoadAsync(file_name)
+                        if loader is not None:
+                            loader.addFinishedListener(
+                                lambda success, subwnd=subwnd, file_name=file_name:
+                                self.onGraphLoaded(subwnd, file_name, success))
                             nodeEditor.setWindowTitle(os.path.splitext(os.path.basename(file_name))[0])
                             subwnd.show()
                         else:
@@ -366,6 +380,14 @@ class MasterWindow(NodeEditorWindow):
         except Exception as e:
             dumpException(e)
 
+    def onGraphLoaded(self, subwnd, file_name: str, success: bool):
+        """Called when the file opened in `subwnd` by :py:meth:`onFileOpen` has been loaded, or has failed to"""
+        if success:
+            self.statusBar().showMessage("File %s loaded" % file_name, 5000)
+        else:
+            # the load has been cancelled or the file is invalid, the graph is empty
+            subwnd.close()
+
     def about(self):
         QMessageBox.about(self, "About Calculator NodeEditor Example",
                           "The <b>Calculator NodeEditor</b> example demonstrates how to write multiple "
@@ -616,6 +638,7 @@ class MasterWindow(NodeEditorWindow):
 
         nodeEditor.scene.masterRef = self
         nodeEditor.scene.history.masterWndRef = self
+        nodeEditor.setFoldConstants(self.fold_constants_btn.isChecked())
 
         subwnd = self.graphs_parent_wdg.addSubWindow(nodeEditor)
 
@@ -624,6 +647,8 @@ class MasterWindow(NodeEditorWindow):
         # nodeeditor.scene.addItemsDeselectedListener(self.updateEditMenu)
         nodeEditor.scene.history.addHistoryModifiedListener(self.updateEditMenu)
         nodeEditor.addCloseEventListener(self.onSubWndClose)
+        nodeEditor.saver.saved.connect(self.onFileSaved)
+        nodeEditor.saver.failed.connect(self.onFileSaveFailed)
 
         return subwnd
 
@@ -640,6 +665,8 @@ class MasterWindow(NodeEditorWindow):
 
 
         if self.maybeSave():
+            # the changes are saved or discarded
+            widget.journal.close()
             event.accept()
         else:
             event.ignore()
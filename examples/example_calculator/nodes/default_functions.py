@@ -4,20 +4,14 @@ from qtpy.QtCore import *
 
 from examples.example_calculator.nodes.nodes_configuration import *
 from examples.example_calculator.master_node import MasterNode, MasterGraphicsNode
-from textwrap import *
 
+from nodeeditor.node_code import Raw, Call, BinOp, ExprStmt, Assign, RawStmt, If, For
 from nodeeditor.node_content_widget import QDMNodeContentWidget
 from nodeeditor.utils import dumpException
 
-FontSize = 18
-FontFamily = "Roboto"
 mathOperators = "#70307030"
 logicOperators = "#30000050"
 
-
-def Indent(String):
-    return indent(String, '     ')
-
 @set_function_ID(FUN_IF)
 class IfStatement(MasterNode):
     icon = "icons/if.png"
@@ -39,29 +33,11 @@ class IfStatement(MasterNode):
 
         false = self.NodeCodeAtOutput(1)
 
-        rawCode = f"""
-if {condition}:
-{Indent(true)}
-else:
-{Indent(false)}"""
-
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{self.nodeColor};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{rawCode}</span></p></pre> """
+        code = [If(condition, true, false, self)]
 
         return code
 
 
-# code = f"""<pre><b><span style=\" Font-size:20px ; background-color:#553E0B0B;\"  >
-# if {condition}:
-# {textwrap.indent(true, "    ")}
-# else:
-# {textwrap.indent(false, "    ")}</span></pre>"""
-
-
 @set_function_ID(FUN_FOR_LOOP)
 class ForLoop(MasterNode):
     icon = "icons/Loop.png"
@@ -83,15 +59,7 @@ class ForLoop(MasterNode):
 
         loopCode = self.NodeCodeAtOutput(0)
 
-        rawCode = f"""
-for i in range({firstIndex},{lastIndex}):
-{Indent(loopCode)}"""
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{self.nodeColor};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{rawCode}</span></p></pre> """
+        code = [For("i", firstIndex, lastIndex, loopCode, self)]
 
         return code
 
@@ -114,16 +82,7 @@ class Print(MasterNode):
         brotherCode = self.NodeCodeAtOutput(0)
         printCode = self.NodeCodeAtInput(1)
 
-        rawCode = f"""
-print({printCode})
-{brotherCode}"""
-
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{self.nodeColor};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{rawCode}</span></p></pre> """
+        code = [ExprStmt(Call("print", [printCode]), self)] + brotherCode
 
         return code
 
@@ -144,19 +103,13 @@ class Input(MasterNode):
 
         brotherCode = self.NodeCodeAtOutput(0)
         inputName = self.NodeCodeAtInput(1)
-        if inputName != "" and inputName is not None: inputName += " = "
         inputCode = self.NodeCodeAtInput(2)
 
-        rawCode = f"""
-{inputName}input({inputCode})
-{brotherCode}"""
-
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{self.nodeColor};" '''
+        inputCall = Call("input", [inputCode])
+        if isinstance(inputName, Raw) and inputName.isEmpty():
+            code = [ExprStmt(inputCall, self)] + brotherCode
         else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{rawCode}</span></p></pre> """
+            code = [Assign(inputName, inputCall, self)] + brotherCode
 
         return code
 
@@ -178,16 +131,10 @@ class Print(MasterNode):
         brotherCode = self.NodeCodeAtOutput(0)
         inputCode = self.NodeCodeAtInput(1)
 
-        rawCode = f"""
-{inputCode}
-{brotherCode}"""
-
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{self.nodeColor};" '''
+        if isinstance(inputCode, Raw):
+            code = [RawStmt(inputCode.text, self)] + brotherCode
         else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{rawCode}</span></p></pre> """
+            code = [ExprStmt(inputCode, self)] + brotherCode
 
         return code
 
@@ -202,22 +149,16 @@ class Add(MasterNode):
     def __init__(self, scene):
         super().__init__(scene, inputs=[1, 1], outputs=[1])
         self.showCode = False
-        self.grNode._brush_title = QBrush(QColor(mathOperators))
+        self.nodeColor = mathOperators
+        self.grNode._brush_title = QBrush(QColor(self.nodeColor))
 
     def getNodeCode(self):
         A = self.NodeCodeAtInput(0)
         B = self.NodeCodeAtInput(1)
 
-        rawCode = f"({A}+{B})"
+        code = BinOp(A, "+", B, self)
 
-        if self.isSelected() is True:
-            colorStyle = f' style=" Font-size:{FontSize}px ; background-color:{mathOperators};" '
-        else:
-            colorStyle = f' style=" Font-size:{FontSize}px ;" '
-
-        code = f' <p style="font-family: {FontFamily} "><span {colorStyle} >{rawCode}</span></p> '
-
-        return rawCode
+        return code
 
 
 @set_function_ID(FUN_SUB)
@@ -231,22 +172,16 @@ class Sub(MasterNode):
     def __init__(self, scene):
         super().__init__(scene, inputs=[1, 1], outputs=[1])
         self.showCode = False
-        self.grNode._brush_title = QBrush(QColor(mathOperators))
+        self.nodeColor = mathOperators
+        self.grNode._brush_title = QBrush(QColor(self.nodeColor))
 
     def getNodeCode(self):
         A = self.NodeCodeAtInput(0)
         B = self.NodeCodeAtInput(1)
 
-        rawCode = f"({A}-{B})"
-
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{mathOperators};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{rawCode}</span></p></pre> """
+        code = BinOp(A, "-", B, self)
 
-        return rawCode
+        return code
 
 
 @set_function_ID(FUN_MUL)
@@ -260,22 +195,16 @@ class Mul(MasterNode):
     def __init__(self, scene):
         super().__init__(scene, inputs=[1, 1], outputs=[1])
         self.showCode = False
-        self.grNode._brush_title = QBrush(QColor(mathOperators))
+        self.nodeColor = mathOperators
+        self.grNode._brush_title = QBrush(QColor(self.nodeColor))
 
     def getNodeCode(self):
         A = self.NodeCodeAtInput(0)
         B = self.NodeCodeAtInput(1)
 
-        rawCode = f"({A}*{B})"
-
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{mathOperators};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{rawCode}</span></p></pre> """
+        code = BinOp(A, "*", B, self)
 
-        return rawCode
+        return code
 
 
 @set_function_ID(FUN_DIV)
@@ -289,22 +218,16 @@ class Div(MasterNode):
     def __init__(self, scene):
         super().__init__(scene, inputs=[1, 1], outputs=[1])
         self.showCode = False
-        self.grNode._brush_title = QBrush(QColor(mathOperators))
+        self.nodeColor = mathOperators
+        self.grNode._brush_title = QBrush(QColor(self.nodeColor))
 
     def getNodeCode(self):
         A = self.NodeCodeAtInput(0)
         B = self.NodeCodeAtInput(1)
 
-        rawCode = f"({A}/{B})"
-
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{mathOperators};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{rawCode}</span></p></pre> """
+        code = BinOp(A, "/", B, self)
 
-        return rawCode
+        return code
 
 
 @set_function_ID(FUN_GREATER_THAN)
@@ -318,22 +241,16 @@ class GreaterThan(MasterNode):
     def __init__(self, scene):
         super().__init__(scene, inputs=[1, 1], outputs=[3])
         self.showCode = False
-        self.grNode._brush_title = QBrush(QColor(logicOperators))
+        self.nodeColor = logicOperators
+        self.grNode._brush_title = QBrush(QColor(self.nodeColor))
 
     def getNodeCode(self):
         A = self.NodeCodeAtInput(0)
         B = self.NodeCodeAtInput(1)
 
-        rawCode = f"({A}&gt;{B})"
-
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{mathOperators};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
+        code = BinOp(A, ">", B, self)
 
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{rawCode}</span></p></pre> """
-
-        return rawCode
+        return code
 
 
 @set_function_ID(FUN_LESS_THAN)
@@ -347,22 +264,16 @@ class LessThan(MasterNode):
     def __init__(self, scene):
         super().__init__(scene, inputs=[1, 1], outputs=[3])
         self.showCode = False
-        self.grNode._brush_title = QBrush(QColor(logicOperators))
+        self.nodeColor = logicOperators
+        self.grNode._brush_title = QBrush(QColor(self.nodeColor))
 
     def getNodeCode(self):
         A = self.NodeCodeAtInput(0)
         B = self.NodeCodeAtInput(1)
 
-        rawCode = f"({A}&lt;{B})"
+        code = BinOp(A, "<", B, self)
 
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{logicOperators};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{rawCode}</span></p></pre> """
-
-        return rawCode
+        return code
 
 
 @set_function_ID(FUN_Equal)
@@ -376,22 +287,16 @@ class Equal(MasterNode):
     def __init__(self, scene):
         super().__init__(scene, inputs=[1, 1], outputs=[3])
         self.showCode = False
-        self.grNode._brush_title = QBrush(QColor(logicOperators))
+        self.nodeColor = logicOperators
+        self.grNode._brush_title = QBrush(QColor(self.nodeColor))
 
     def getNodeCode(self):
         A = self.NodeCodeAtInput(0)
         B = self.NodeCodeAtInput(1)
 
-        rawCode = f"({A}=={B})"
-
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{logicOperators};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{rawCode}</span></p></pre> """
+        code = BinOp(A, "==", B, self)
 
-        return rawCode
+        return code
 
 
 @set_function_ID(FUN_AND)
@@ -405,19 +310,13 @@ class And(MasterNode):
     def __init__(self, scene):
         super().__init__(scene, inputs=[3, 3], outputs=[3])
         self.showCode = False
-        self.grNode._brush_title = QBrush(QColor(logicOperators))
+        self.nodeColor = logicOperators
+        self.grNode._brush_title = QBrush(QColor(self.nodeColor))
 
     def getNodeCode(self):
         A = self.NodeCodeAtInput(0)
         B = self.NodeCodeAtInput(1)
 
-        rawCode = f"({A} and {B})"
+        code = BinOp(A, "and", B, self)
 
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{logicOperators};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{rawCode}</span></p></pre> """
-
-        return rawCode
+        return code
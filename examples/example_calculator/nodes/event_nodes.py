@@ -1,7 +1,7 @@
-from examples.example_calculator.nodes.default_functions import Indent, FontFamily, FontSize
 from examples.example_calculator.nodes.nodes_configuration import *
 from examples.example_calculator.master_node import MasterNode
 from nodeeditor.node_editor_widget import *
+from nodeeditor.node_code import Call, ExprStmt, FunctionDef
 
 
 
@@ -32,17 +32,7 @@ class Event(MasterNode):
         brotherCode = self.NodeCodeAtOutput(0)
         self.showCode = not self.isInputConnected(0)
 
-        rawCode = f"""
-{self.name}()
-{brotherCode}"""
-
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{self.nodeColor};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        getCode = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{rawCode}</span></p></pre> """
-
+        getCode = [ExprStmt(Call(self.name), self)] + brotherCode
 
         return getCode
 
@@ -50,15 +40,6 @@ class Event(MasterNode):
     def setterCode(self):
         childCode = self.NodeCodeAtOutput(0)
 
-        rawCode = f"""
-def {self.name}():
-{Indent(childCode)}"""
-
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{self.nodeColor};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        setterCode = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{rawCode}</span></p></pre> """
+        setterCode = [FunctionDef(self.name, childCode, self)]
 
-        return setterCode
\ No newline at end of file
+        return setterCode
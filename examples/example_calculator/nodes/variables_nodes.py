@@ -1,8 +1,8 @@
 from PyQt5.QtGui import QBrush, QColor
 
-from examples.example_calculator.nodes.default_functions import FontSize, FontFamily
 from examples.example_calculator.nodes.nodes_configuration import *
 from examples.example_calculator.master_node import MasterNode
+from nodeeditor.node_code import Name, Assign
 
 FloatColor = "#7000FF10"
 IntegerColor = "#aa0070FF"
@@ -19,7 +19,8 @@ class FloatVar(MasterNode):
     def __init__(self, scene):
         super().__init__(scene, inputs=[], outputs=[1])
         self.isVar = True
-        self.grNode._brush_title = QBrush(QColor(FloatColor))
+        self.nodeColor = FloatColor
+        self.grNode._brush_title = QBrush(QColor(self.nodeColor))
 
     def toGetter(self):
         self.isSetter = False
@@ -33,7 +34,7 @@ class FloatVar(MasterNode):
 
     def getterCode(self):
         self.showCode = False
-        getCode = self.name
+        getCode = Name(self.name, self)
         return getCode
 
     def setterCode(self):
@@ -41,16 +42,7 @@ class FloatVar(MasterNode):
         brotherCode = self.NodeCodeAtOutput(0)
         setInput = self.NodeCodeAtInput(1)
 
-        setCode = f"""
-{self.name}={setInput}
-{brotherCode}"""
-
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{FloatColor};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{setCode}</span></p></pre> """
+        code = [Assign(Name(self.name), setInput, self)] + brotherCode
 
         return code
 
@@ -65,7 +57,8 @@ class IntegerVar(MasterNode):
     def __init__(self, scene):
         super().__init__(scene, inputs=[], outputs=[2])
         self.isVar = True
-        self.grNode._brush_title = QBrush(QColor(IntegerColor))
+        self.nodeColor = IntegerColor
+        self.grNode._brush_title = QBrush(QColor(self.nodeColor))
 
     def toGetter(self):
         self.isSetter = False
@@ -79,7 +72,7 @@ class IntegerVar(MasterNode):
 
     def getterCode(self):
         self.showCode = False
-        getCode = self.name
+        getCode = Name(self.name, self)
         return getCode
 
     def setterCode(self):
@@ -87,16 +80,7 @@ class IntegerVar(MasterNode):
         brotherCode = self.NodeCodeAtOutput(0)
         setInput = self.NodeCodeAtInput(1)
 
-        setCode = f"""
-{self.name}={setInput}
-{brotherCode}"""
-
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{IntegerColor};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{setCode}</span></p></pre> """
+        code = [Assign(Name(self.name), setInput, self)] + brotherCode
 
         return code
 
@@ -111,7 +95,8 @@ class BooleanVar(MasterNode):
     def __init__(self, scene):
         super().__init__(scene, inputs=[], outputs=[3])
         self.isVar = True
-        self.grNode._brush_title = QBrush(QColor(BooleanColor))
+        self.nodeColor = BooleanColor
+        self.grNode._brush_title = QBrush(QColor(self.nodeColor))
 
     def toGetter(self):
         self.isSetter = False
@@ -125,7 +110,7 @@ class BooleanVar(MasterNode):
 
     def getterCode(self):
         self.showCode = False
-        getCode = self.name
+        getCode = Name(self.name, self)
         return getCode
 
     def setterCode(self):
@@ -133,16 +118,7 @@ class BooleanVar(MasterNode):
         brotherCode = self.NodeCodeAtOutput(0)
         setInput = self.NodeCodeAtInput(1)
 
-        setCode = f"""
-{self.name}={setInput}
-{brotherCode}"""
-
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{BooleanColor};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{setCode}</span></p></pre> """
+        code = [Assign(Name(self.name), setInput, self)] + brotherCode
 
         return code
 
@@ -157,7 +133,8 @@ class StringVar(MasterNode):
     def __init__(self, scene):
         super().__init__(scene, inputs=[], outputs=[4])
         self.isVar = True
-        self.grNode._brush_title = QBrush(QColor(StringColor))
+        self.nodeColor = StringColor
+        self.grNode._brush_title = QBrush(QColor(self.nodeColor))
 
     def toGetter(self):
         self.isSetter = False
@@ -171,7 +148,7 @@ class StringVar(MasterNode):
 
     def getterCode(self):
         self.showCode = False
-        getCode = self.name
+        getCode = Name(self.name, self)
         return getCode
 
     def setterCode(self):
@@ -179,15 +156,6 @@ class StringVar(MasterNode):
         brotherCode = self.NodeCodeAtOutput(0)
         setInput = self.NodeCodeAtInput(1)
 
-        setCode = f"""
-{self.name}={setInput}
-{brotherCode}"""
-
-        if self.isSelected() is True:
-            colorStyle = f''' style=" Font-size:{FontSize}px ; background-color:{StringColor};" '''
-        else:
-            colorStyle = f''' style=" Font-size:{FontSize}px ;" '''
-
-        code = f""" <pre><p style="font-family: {FontFamily} "><span {colorStyle} >{setCode}</span></p></pre> """
+        code = [Assign(Name(self.name), setInput, self)] + brotherCode
 
         return code
@@ -481,15 +481,16 @@ class GraphGraphics(QGraphicsView):
         self.NodeEditor = NodeEditor
 
     def deleteSelected(self):
-        """Shortcut for safe deleting every object selected in the `Scene`."""
-        for item in self.grScene.selectedItems():
-            if isinstance(item, QDMGraphicsEdge):
-                item.edge.remove()
-            elif hasattr(item, 'node'):
-                item.node.remove()
-
-        self.grScene.scene.history.storeHistory("Delete selected", setModified=True)
-        self.NodeEditor.UpdateTextCode()
+        """Shortcut for safe deleting every object selected in the `Scene`. The removals are one transaction"""
+        with self.grScene.scene.transaction("Delete selected"):
+            for item in self.grScene.selectedItems():
+                if isinstance(item, QDMGraphicsEdge):
+                    item.edge.remove()
+                elif hasattr(item, 'node'):
+                    item.node.remove()
+
+            self.grScene.scene.history.storeHistory("Delete selected", setModified=True)
+            self.NodeEditor.UpdateTextCode()
 
     def deleteNode(self, item):
         """Shortcut for safe deleting every object selected in the Scene."""
@@ -0,0 +1,635 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the lightweight intermediate representation (IR) of the generated code and the emitters
+turning it into plain Python or into rich text for the code view.
+
+`Nodes` return an expression from ``getNodeCode`` when they produce a value (i.e. `Add`, variable getter) or a
+block - a ``list`` of statements - when they are executed (i.e. `Print`, `If Statement`). No formatting happens
+in the `Nodes`, it is done once for the whole program by an emitter.
+
+Statements never contain the code of the `Nodes` executed after them, only a :class:`Flow` reference to the
+`Socket` they continue from. Emitters resolve these references with an explicit stack, so neither building nor
+emitting the code recurses along the execution chain.
+"""
+from html import escape
+
+
+class CodeItem():
+    """Base class of all IR items. Each item remembers the `Node` which has produced it.
+    `expr_fields` names the attributes holding sub-expressions (or lists of them), used by the passes in
+    :mod:`~nodeeditor.node_code_passes`"""
+    __slots__ = ('node',)
+    expr_fields = ()
+
+    def __init__(self, node: 'Node' = None):
+        self.node = node
+
+    def copy(self) -> 'CodeItem':
+        """Return a shallow copy. Items may be shared by cached `Node` code, passes never modify them in place"""
+        item = self.__class__.__new__(self.__class__)
+        for cls in self.__class__.__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                setattr(item, name, getattr(self, name))
+        return item
+
+
+# Expressions
+
+class Literal(CodeItem):
+    """Constant value typed into a socket, i.e. number or boolean"""
+    __slots__ = ('value',)
+
+    def __init__(self, value, node: 'Node' = None):
+        super().__init__(node)
+        self.value = value
+
+
+class FoldedLiteral(Literal):
+    """Constant computed at generation time from an operation on constants. `origins` lists the `Nodes` of
+    the folded operations"""
+    __slots__ = ('origins',)
+
+    def __init__(self, value, origins: list = (), node: 'Node' = None):
+        super().__init__(value, node)
+        self.origins = list(origins)
+
+
+class Raw(CodeItem):
+    """Piece of code written by the user, emitted as it is"""
+    __slots__ = ('text',)
+
+    def __init__(self, text: str, node: 'Node' = None):
+        super().__init__(node)
+        self.text = text
+
+    def isEmpty(self) -> bool:
+        return self.text == ""
+
+
+class Name(CodeItem):
+    """Reference to a variable"""
+    __slots__ = ('name',)
+
+    def __init__(self, name: str, node: 'Node' = None):
+        super().__init__(node)
+        self.name = name
+
+
+class BinOp(CodeItem):
+    """Binary operation ``(left op right)``"""
+    __slots__ = ('left', 'op', 'right')
+    expr_fields = ('left', 'right')
+
+    def __init__(self, left: CodeItem, op: str, right: CodeItem, node: 'Node' = None):
+        super().__init__(node)
+        self.left = left
+        self.op = op
+        self.right = right
+
+
+class Call(CodeItem):
+    """Function call ``func(args)``"""
+    __slots__ = ('func', 'args')
+    expr_fields = ('args',)
+
+    def __init__(self, func: str, args: list = (), node: 'Node' = None):
+        super().__init__(node)
+        self.func = func
+        self.args = list(args)
+
+
+# Statements
+
+class ExprStmt(CodeItem):
+    """Expression evaluated as a statement, i.e. a function call"""
+    __slots__ = ('value',)
+    expr_fields = ('value',)
+
+    def __init__(self, value: CodeItem, node: 'Node' = None):
+        super().__init__(node)
+        self.value = value
+
+
+class Assign(CodeItem):
+    """Assignment ``target = value``"""
+    __slots__ = ('target', 'value')
+    expr_fields = ('target', 'value')
+
+    def __init__(self, target: CodeItem, value: CodeItem, node: 'Node' = None):
+        super().__init__(node)
+        self.target = target
+        self.value = value
+
+
+class RawStmt(CodeItem):
+    """Lines of code written by the user, emitted as they are"""
+    __slots__ = ('text',)
+
+    def __init__(self, text: str, node: 'Node' = None):
+        super().__init__(node)
+        self.text = text
+
+
+class If(CodeItem):
+    """``if test: body else: orelse``"""
+    __slots__ = ('test', 'body', 'orelse')
+    expr_fields = ('test',)
+
+    def __init__(self, test: CodeItem, body: list, orelse: list, node: 'Node' = None):
+        super().__init__(node)
+        self.test = test
+        self.body = body
+        self.orelse = orelse
+
+
+class For(CodeItem):
+    """``for target in range(start, stop): body``"""
+    __slots__ = ('target', 'start', 'stop', 'body')
+    expr_fields = ('start', 'stop')
+
+    def __init__(self, target: str, start: CodeItem, stop: CodeItem, body: list, node: 'Node' = None):
+        super().__init__(node)
+        self.target = target
+        self.start = start
+        self.stop = stop
+        self.body = body
+
+
+class Flow(CodeItem):
+    """Execution continuing with the block of the `Node` connected to `socket`. Resolved lazily by the emitter"""
+    __slots__ = ('socket',)
+
+    def __init__(self, socket: 'Socket', node: 'Node' = None):
+        super().__init__(node)
+        self.socket = socket
+
+    def getTargetNode(self) -> 'Node':
+        """Return the `Node` where the execution continues or ``None``"""
+        if not self.socket.socketEdges: return None
+        other_socket = self.socket.socketEdges[0].getOtherSocket(self.socket)
+        return other_socket.node if other_socket is not None else None
+
+
+class FunctionDef(CodeItem):
+    """``def name(): body``"""
+    __slots__ = ('name', 'body')
+
+    def __init__(self, name: str, body: list, node: 'Node' = None):
+        super().__init__(node)
+        self.name = name
+        self.body = body
+
+
+def literalCode(value) -> CodeItem:
+    """Wrap a value typed into a socket widget. Text is user written code, everything else is a constant
+
+    :param value: value of the socket widget
+    :return: :class:`Raw` for ``str`` values, :class:`Literal` otherwise
+    """
+    return Raw(value) if isinstance(value, str) else Literal(value)
+
+
+def blockCode(code) -> list:
+    """Return `code` as a block of statements. ``None`` (i.e. nothing connected) is an empty block"""
+    if code is None: return []
+    return code if isinstance(code, list) else [code]
+
+
+def codeRoots(nodes) -> list:
+    """Return the code blocks of the `nodes` which start a piece of the program (i.e. event definitions,
+    chains of statements not connected to any other statement), in the order of `nodes`
+
+    :param nodes: `Nodes` of a `Scene`
+    :return: ``list`` of (`Node`, block) pairs
+    :rtype: ``list``
+    """
+    roots = []
+    for node in nodes:
+        # only changed nodes regenerate their code, see Node.getCachedNodeCode
+        code = node.getCachedNodeCode()
+        if isinstance(code, list) and node.showCode is True:
+            roots.append((node, code))
+    return roots
+
+
+def joinRootCode(emitted: list) -> tuple:
+    """Join the code of the roots the way the program is laid out, with one blank line between two roots. Roots
+    without any line of code are left out. The code view shows the same lines, so line numbers are the same
+
+    :param emitted: ``list`` of (`Node`, text, :class:`SourceMap`) of each root, see
+        :py:meth:`RootCodeCache.emitRoots`
+    :type emitted: ``list``
+    :return: (text, :class:`SourceMap` of the whole text)
+    :rtype: ``tuple``
+    """
+    texts = []
+    source_map = SourceMap()
+    for node, text, root_map in emitted:
+        if not len(root_map): continue
+        # the blank line separating the root from the previous one
+        source_map.extend(root_map, len(source_map) + 1 if texts else 0)
+        texts.append(text)
+    return "\n\n".join(texts), source_map
+
+
+def pythonProgram(roots: list, emitter: 'CodeEmitter' = None) -> tuple:
+    """Return the plain Python program made of the `roots` blocks with its source map
+
+    :param roots: ``list`` of (`Node`, block) pairs, see :func:`codeRoots`
+    :type roots: ``list``
+    :param emitter: emitter to use, :class:`PythonEmitter` without passes if ``None``
+    :type emitter: :class:`CodeEmitter`
+    :return: (Python source code, :class:`SourceMap` of the code)
+    :rtype: ``tuple``
+    """
+    if emitter is None: emitter = PythonEmitter()
+    emitted = []
+    for node, block in roots:
+        text = emitter.emit(block, node)
+        emitted.append((node, text, emitter.source_map))
+    text, source_map = joinRootCode(emitted)
+    return text + "\n", source_map
+
+
+def pythonCode(roots: list, emitter: 'CodeEmitter' = None) -> str:
+    """Return the plain Python program made of the `roots` blocks, see :func:`pythonProgram`
+
+    :param roots: ``list`` of (`Node`, block) pairs, see :func:`codeRoots`
+    :type roots: ``list``
+    :param emitter: emitter to use, :class:`PythonEmitter` without passes if ``None``
+    :type emitter: :class:`CodeEmitter`
+    :return: Python source code
+    :rtype: ``str``
+    """
+    return pythonProgram(roots, emitter)[0]
+
+
+class SourceMap():
+    """Links the emitted code to the `Nodes` which produced it, in both directions. Lines are numbered from ``0``,
+    columns count characters of the plain text, ranges are ``(line, start column, end column)`` with the end
+    column excluded"""
+
+    def __init__(self):
+        """
+        :Instance Attributes:
+
+        - **nodes** - ``dict`` of `Node` id to `Node` for all `Nodes` in the map
+        - **node_ranges** - ``dict`` of `Node` id to ``list`` of its ranges
+        - **line_nodes** - ``list`` with the id of the `Node` of the statement on each line, or ``None``
+        - **line_ranges** - ``list`` with the ``(start column, end column, node id)`` ranges on each line, inner
+          ranges first
+        """
+        self.nodes = {}
+        self.node_ranges = {}
+        self.line_nodes = []
+        self.line_ranges = []
+
+    def __len__(self):
+        return len(self.line_nodes)
+
+    def addLine(self, node: 'Node') -> int:
+        """Start a new line of the statement produced by `node`
+
+        :return: number of the new line
+        :rtype: ``int``
+        """
+        self.line_nodes.append(node.id if node is not None else None)
+        self.line_ranges.append([])
+        if node is not None: self.nodes[node.id] = node
+        return len(self.line_nodes) - 1
+
+    def addRange(self, node: 'Node', line: int, start: int, end: int):
+        """Attribute the columns from `start` to `end` of the `line` to `node`"""
+        if node is None or start == end: return
+        self.nodes[node.id] = node
+        self.node_ranges.setdefault(node.id, []).append((line, start, end))
+        self.line_ranges[line].append((start, end, node.id))
+
+    def getRanges(self, node_id: int) -> list:
+        """Return the ranges of code produced by the `Node` with `node_id`
+
+        :return: ``list`` of ``(line, start column, end column)``
+        :rtype: ``list``
+        """
+        return self.node_ranges.get(node_id, [])
+
+    def getNodeAt(self, line: int, column: int = None) -> 'Node':
+        """Return the `Node` which produced the code at `line`. With a `column`, the `Node` of the innermost
+        expression there, otherwise the `Node` of the statement
+
+        :return: `Node` or ``None`` if nothing is known about the position
+        """
+        if not 0 <= line < len(self.line_nodes): return None
+        if column is not None:
+            for start, end, node_id in self.line_ranges[line]:
+                if start <= column < end: return self.nodes[node_id]
+        node_id = self.line_nodes[line]
+        return self.nodes[node_id] if node_id is not None else None
+
+    def extend(self, other: 'SourceMap', line_offset: int = None):
+        """Append the lines of `other`, by default right after the last line of this map"""
+        if line_offset is None: line_offset = len(self.line_nodes)
+        while len(self.line_nodes) < line_offset:
+            self.addLine(None)
+        self.nodes.update(other.nodes)
+        self.line_nodes.extend(other.line_nodes)
+        self.line_ranges.extend(other.line_ranges)
+        for node_id, ranges in other.node_ranges.items():
+            self.node_ranges.setdefault(node_id, []).extend(
+                (line + line_offset, start, end) for line, start, end in ranges)
+
+
+class CodeEmitter():
+    """Base class turning the IR into text. Child classes decide how the text is decorated.
+
+    The IR is walked with an explicit stack of frames, one per block being emitted and one per compound
+    statement (i.e. `If`) waiting for its nested blocks. Nesting is tracked as an indentation level, emitted
+    text is never re-indented. A :class:`Flow` leading back to a `Node` which is still being emitted is a cycle,
+    it is reported in :py:attr:`cycles` and emitted as a comment instead of being followed.
+
+    Text is written piece by piece into the current line, so the :class:`SourceMap` is built while emitting."""
+    indent_text = "    "
+
+    def __init__(self, passes: list = None):
+        """
+        :param passes: passes from :mod:`~nodeeditor.node_code_passes` applied on every statement before it is
+            emitted
+        :type passes: ``list``
+
+        :Instance Attributes:
+
+        - **lines** - list of emitted lines
+        - **cycles** - list of `Nodes` where the execution looped back during the last :py:meth:`emit`
+        - **source_map** - :class:`SourceMap` of the last :py:meth:`emit`
+        - **dependencies** - list of ``(flow, target node, target block)`` for every :class:`Flow` resolved during
+          the last :py:meth:`emit`, the emitted code is the same as long as they resolve the same way
+        """
+        self.passes = list(passes) if passes is not None else []
+        self.lines = []
+        self.cycles = []
+        self.source_map = SourceMap()
+        self.dependencies = []
+
+        self._line = []
+        self._line_number = 0
+        self._line_node = None
+        self._line_start = 0
+        self._column = 0
+
+    def emit(self, block: list, node: 'Node' = None) -> str:
+        """
+        Emit the block of statements
+
+        :param block: ``list`` of IR statements
+        :type block: ``list``
+        :param node: `Node` which has produced the `block`, used for cycle detection
+        :type node: :class:`~nodeeditor.node_node.Node`
+        :return: emitted code
+        :rtype: ``str``
+        """
+        self.lines = []
+        self.cycles = []
+        self.source_map = SourceMap()
+        self.dependencies = []
+        self.walk(block, node)
+        return self.joinLines(self.lines)
+
+    def walk(self, block: list, node: 'Node' = None):
+        """Emit all statements of the `block` and of all `Nodes` it flows into. Frames on the stack are
+        ``[iterator, level, is_block, required, lines count at start, node]``"""
+        active = set()
+        if node is not None: active.add(node)
+        stack = [[iter(block), 0, True, False, 0, node]]
+
+        while stack:
+            frame = stack[-1]
+            iterator, level, is_block = frame[0], frame[1], frame[2]
+            item = next(iterator, None)
+
+            if item is None:
+                stack.pop()
+                if frame[3] and frame[4] == len(self.lines):
+                    self.addLine(level, "pass", None)
+                if frame[5] is not None: active.discard(frame[5])
+
+            elif not is_block:
+                # compound statement asks for one of its nested blocks
+                nested_block, nested_level = item
+                stack.append([iter(nested_block), nested_level, True, True, len(self.lines), None])
+
+            elif isinstance(item, Flow):
+                target = item.getTargetNode()
+                code = target.getCachedNodeCode() if target is not None else None
+                self.dependencies.append((item, target, code))
+                if target is None: continue
+                if target in active:
+                    self.cycles.append(target)
+                    self.addLine(level, "# execution loops back to %s" % target.name, item.node)
+                    continue
+                active.add(target)
+                stack.append([iter(blockCode(code)), level, True, False, 0, target])
+
+            else:
+                for statement in self.optimize(item):
+                    nested = getattr(self, 'emit' + statement.__class__.__name__)(statement, level)
+                    if nested is not None:
+                        # only the last statement can be compound, the passes put their statements before it
+                        stack.append([nested, level, False, False, 0, None])
+
+    def optimize(self, item: CodeItem) -> list:
+        """Run the passes on the statement `item`
+
+        :return: ``list`` of statements to emit instead of `item`
+        :rtype: ``list``
+        """
+        statements = [item]
+        for code_pass in self.passes:
+            statements = [result for statement in statements for result in code_pass.run(statement)]
+        return statements
+
+    def beginLine(self, level: int, node: 'Node'):
+        """Start a line of the statement produced by `node`"""
+        self._line = [self.indent_text * level]
+        self._line_number = self.source_map.addLine(node)
+        self._line_node = node
+        self._line_start = self._column = len(self._line[0])
+
+    def write(self, text: str):
+        """Write plain `text` into the current line"""
+        self._line.append(self.text(text))
+        self._column += len(text)
+
+    def endLine(self):
+        self.source_map.addRange(self._line_node, self._line_number, self._line_start, self._column)
+        self.lines.append("".join(self._line))
+
+    def addLine(self, level: int, text: str, node: 'Node'):
+        """Add a whole line of plain `text` produced by `node`"""
+        self.beginLine(level, node)
+        self.write(text)
+        self.endLine()
+
+    def joinLines(self, lines: list) -> str:
+        return "\n".join(lines)
+
+    def text(self, text: str) -> str:
+        """Hook to escape plain text"""
+        return text
+
+    def expr(self, item: CodeItem):
+        """Write the expression `item` into the current line"""
+        start = self._column
+        getattr(self, 'expr' + item.__class__.__name__)(item)
+        self.source_map.addRange(item.node, self._line_number, start, self._column)
+
+    def exprLiteral(self, item: Literal):
+        self.write(str(item.value))
+
+    def exprFoldedLiteral(self, item: FoldedLiteral):
+        self.exprLiteral(item)
+
+    def exprRaw(self, item: Raw):
+        self.write(item.text)
+
+    def exprName(self, item: Name):
+        self.write(item.name)
+
+    def exprBinOp(self, item: BinOp):
+        self.write("(")
+        self.expr(item.left)
+        self.write(" %s " % item.op if item.op.isalpha() else item.op)
+        self.expr(item.right)
+        self.write(")")
+
+    def exprCall(self, item: Call):
+        self.write(item.func + "(")
+        for index, arg in enumerate(item.args):
+            if index: self.write(", ")
+            self.expr(arg)
+        self.write(")")
+
+    # Statement emitters write their lines directly. Compound statements are generators yielding
+    # (block, level) for each nested block, the lines after a yield are added once the block is emitted
+
+    def emitExprStmt(self, item: ExprStmt, level: int):
+        self.beginLine(level, item.node)
+        self.expr(item.value)
+        self.endLine()
+
+    def emitAssign(self, item: Assign, level: int):
+        self.beginLine(level, item.node)
+        self.expr(item.target)
+        self.write(" = ")
+        self.expr(item.value)
+        self.endLine()
+
+    def emitRawStmt(self, item: RawStmt, level: int):
+        for line in item.text.splitlines():
+            self.addLine(level, line, item.node)
+
+    def emitIf(self, item: If, level: int):
+        self.beginLine(level, item.node)
+        self.write("if ")
+        self.expr(item.test)
+        self.write(":")
+        self.endLine()
+        yield item.body, level + 1
+        self.addLine(level, "else:", item.node)
+        yield item.orelse, level + 1
+
+    def emitFor(self, item: For, level: int):
+        self.beginLine(level, item.node)
+        self.write("for %s in range(" % item.target)
+        self.expr(item.start)
+        self.write(", ")
+        self.expr(item.stop)
+        self.write("):")
+        self.endLine()
+        yield item.body, level + 1
+
+    def emitFunctionDef(self, item: FunctionDef, level: int):
+        self.addLine(level, "def %s():" % item.name, item.node)
+        yield item.body, level + 1
+
+
+class RootCodeCache():
+    """Keeps the code emitted for each root of the program, see :func:`codeRoots`. A root is emitted again only
+    when its block has been regenerated or when one of its :class:`Flow` items leads to another `Node` or to
+    regenerated code, so a refresh emits the edited roots only"""
+
+    def __init__(self, emitter: 'CodeEmitter'):
+        """
+        :param emitter: emitter used for the roots which are not cached
+        :type emitter: :class:`CodeEmitter`
+
+        :Instance Attributes:
+
+        - **emitter** - the :class:`CodeEmitter`
+        - **entries** - ``dict`` of root `Node` id to ``(block, text, source map, dependencies)``
+        - **emitted_roots** - number of roots emitted by the last :py:meth:`emitRoots`
+        """
+        self.emitter = emitter
+        self.entries = {}
+        self.emitted_roots = 0
+
+    def isValid(self, entry: tuple, block: list) -> bool:
+        """Is the cached `entry` the code of `block`?"""
+        if entry[0] is not block: return False
+        for flow, target, code in entry[3]:
+            if flow.getTargetNode() is not target: return False
+            if target is not None and target.getCachedNodeCode() is not code: return False
+        return True
+
+    def emitRoots(self, roots: list) -> list:
+        """
+        Return the code of the `roots`, emitting only the changed ones. Roots which are not in the list anymore
+        are forgotten
+
+        :param roots: ``list`` of (`Node`, block) pairs, see :func:`codeRoots`
+        :type roots: ``list``
+        :return: ``list`` of (`Node`, text, :class:`SourceMap`) in the order of `roots`
+        :rtype: ``list``
+        """
+        entries = {}
+        results = []
+        self.emitted_roots = 0
+        for node, block in roots:
+            entry = self.entries.get(node.id)
+            if entry is None or not self.isValid(entry, block):
+                text = self.emitter.emit(block, node)
+                entry = (block, text, self.emitter.source_map, self.emitter.dependencies)
+                self.emitted_roots += 1
+            entries[node.id] = entry
+            results.append((node, entry[1], entry[2]))
+        self.entries = entries
+        return results
+
+
+class PythonEmitter(CodeEmitter):
+    """Emits plain Python, used for generated files and execution"""
+    pass
+
+
+class RichTextEmitter(CodeEmitter):
+    """Emits HTML for the code view. Selected `Nodes` are highlighted by the view using the :class:`SourceMap`,
+    so the HTML does not depend on the selection"""
+
+    def __init__(self, font_family: str = "Roboto", font_size: int = 18, passes: list = None):
+        """
+        :param font_family: font family of the code view
+        :type font_family: ``str``
+        :param font_size: font size in pixels of the code view
+        :type font_size: ``int``
+        :param passes: see :class:`CodeEmitter`
+        :type passes: ``list``
+        """
+        super().__init__(passes)
+        self.font_family = font_family
+        self.font_size = font_size
+
+    def joinLines(self, lines: list) -> str:
+        return '<pre style="font-family: %s; font-size: %dpx;">%s</pre>' % (
+            self.font_family, self.font_size, "\n".join(lines))
+
+    def text(self, text: str) -> str:
+        return escape(text, quote=False)
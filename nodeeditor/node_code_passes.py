@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing optimization passes over the code IR of :mod:`~nodeeditor.node_code`.
+
+The IR of a `Node` is cached and shared by all `Nodes` reading its output, so the same expression object appears
+at every use site. Passes never modify items in place, changed items are copied.
+"""
+import math
+import operator
+
+from nodeeditor.node_code import CodeItem, BinOp, Literal, FoldedLiteral, Name, Assign
+
+DEBUG = False
+
+#: operators whose right operand is evaluated only depending on the left one
+SHORT_CIRCUIT_OPERATORS = ("and", "or")
+
+
+def exprChildren(item: CodeItem) -> list:
+    """Return the sub-expressions of `item` in evaluation order"""
+    children = []
+    for field in item.expr_fields:
+        value = getattr(item, field)
+        if isinstance(value, list):
+            children.extend(value)
+        elif value is not None:
+            children.append(value)
+    return children
+
+
+def replaceExprs(item: CodeItem, replace: 'function') -> CodeItem:
+    """Return `item` with every sub-expression replaced by ``replace(sub_expression)``. `item` itself is returned
+    when nothing changes, otherwise a copy"""
+    changes = {}
+    for field in item.expr_fields:
+        value = getattr(item, field)
+        if isinstance(value, list):
+            new_value = [replace(child) for child in value]
+            if any(new is not old for new, old in zip(new_value, value)): changes[field] = new_value
+        elif value is not None:
+            new_value = replace(value)
+            if new_value is not value: changes[field] = new_value
+    if not changes: return item
+    item = item.copy()
+    for field, value in changes.items(): setattr(item, field, value)
+    return item
+
+
+def isPure(item: CodeItem) -> bool:
+    """Can `item` be evaluated once instead of several times without changing the program? Operations on
+    constants and variables are, function calls and code typed by the user may have side effects"""
+    stack = [item]
+    visited = set()
+    while stack:
+        item = stack.pop()
+        if id(item) in visited: continue
+        visited.add(id(item))
+        if isinstance(item, BinOp):
+            stack.append(item.left)
+            stack.append(item.right)
+        elif not isinstance(item, (Literal, Name)):
+            return False
+    return True
+
+
+class CommonSubexpressionPass():
+    """Hoist pure operations used several times by one statement into temporary variables, assigned right before
+    the statement. A diamond-shaped graph of math `Nodes` is then emitted and evaluated once per `Node` instead of
+    once per path. Only one statement is considered at a time, because variables may change between statements.
+
+    Occurrences in the right operand of ``and``/``or`` are not counted, hoisting them would evaluate them even
+    when the operator short-circuits. Operations first evaluated after a call or user code are not hoisted either,
+    their value could depend on the side effects of that code."""
+    temp_prefix = "_cse"
+
+    def __init__(self):
+        """
+        :Instance Attributes:
+
+        - **hoisted** - total number of hoisted expressions
+        """
+        self.hoisted = 0
+
+    def findShared(self, statement: CodeItem) -> list:
+        """Return the pure operations evaluated more than once by the `statement`, inner ones first"""
+        uses = {}
+        items = {}
+        order = []
+        # ids of the items first evaluated after a call or user code, which may change the variables they read
+        after_effects = set()
+        effect = False
+        # explicit post-order walk of the expression DAG, each shared item is entered only once. The post-order is
+        # the evaluation order, an item is complete once its operands are
+        stack = [(child, False) for child in reversed(exprChildren(statement))]
+        while stack:
+            item, expanded = stack.pop()
+            if expanded:
+                order.append(item)
+                if effect: after_effects.add(id(item))
+                if not isinstance(item, (BinOp, Literal, Name)):
+                    effect = True
+                elif isinstance(item, BinOp) and item.op in SHORT_CIRCUIT_OPERATORS and not isPure(item.right):
+                    effect = True
+                continue
+            key = id(item)
+            uses[key] = uses.get(key, 0) + 1
+            if key in items: continue
+            items[key] = item
+            stack.append((item, True))
+            children = exprChildren(item)
+            if isinstance(item, BinOp) and item.op in SHORT_CIRCUIT_OPERATORS: children = children[:1]
+            stack.extend((child, False) for child in reversed(children))
+
+        return [item for item in order if uses[id(item)] > 1 and isinstance(item, BinOp) and isPure(item) and
+                id(item) not in after_effects]
+
+    def run(self, statement: CodeItem) -> list:
+        """
+        Apply the pass on one statement
+
+        :param statement: IR statement, its nested blocks are not visited
+        :type statement: :class:`~nodeeditor.node_code.CodeItem`
+        :return: ``list`` of statements, the assignments of the temporary variables followed by the statement
+        :rtype: ``list``
+        """
+        shared = self.findShared(statement)
+        if not shared: return [statement]
+
+        # temporaries are assigned right before their statement, so names can restart for every statement
+        names = {}
+        rewritten = {}
+
+        def rewrite(item):
+            key = id(item)
+            if key in names: return names[key]
+            if key not in rewritten: rewritten[key] = replaceExprs(item, rewrite)
+            return rewritten[key]
+
+        statements = []
+        for item in shared:
+            temp_name = "%s%d" % (self.temp_prefix, len(statements))
+            statements.append(Assign(Name(temp_name, item.node), rewrite(item), item.node))
+            names[id(item)] = statements[-1].target
+        statements.append(replaceExprs(statement, rewrite))
+
+        self.hoisted += len(shared)
+        if DEBUG: print("CSE: hoisted", len(shared), "expressions from", statement.__class__.__name__)
+        return statements
+
+
+class ConstantFoldingPass():
+    """Replace operations whose operands are all constants by their result, i.e. ``(2.0*3.0)`` by ``6.0``.
+    Operations which would fail at run time (division by zero...) or produce a value without a Python literal
+    (``inf``, ``nan``) are kept, so the generated script behaves the same. The result is a
+    :class:`~nodeeditor.node_code.FoldedLiteral` remembering the `Nodes` it comes from."""
+    operators = {
+        "+": operator.add,
+        "-": operator.sub,
+        "*": operator.mul,
+        "/": operator.truediv,
+        ">": operator.gt,
+        "<": operator.lt,
+        "==": operator.eq,
+        "and": lambda a, b: a and b,
+        "or": lambda a, b: a or b,
+    }
+
+    def __init__(self):
+        """
+        :Instance Attributes:
+
+        - **folded** - total number of folded operations
+        """
+        self.folded = 0
+
+    def fold(self, item: BinOp) -> CodeItem:
+        """Return the constant result of `item` if its operands are constants, `item` otherwise"""
+        if not (isinstance(item.left, Literal) and isinstance(item.right, Literal)): return item
+        function = self.operators.get(item.op)
+        if function is None: return item
+        try:
+            value = function(item.left.value, item.right.value)
+        except (ArithmeticError, TypeError, ValueError):
+            return item
+        if not isinstance(value, (bool, int, float)): return item
+        if isinstance(value, float) and not math.isfinite(value): return item
+
+        origins = [item.node] if item.node is not None else []
+        for operand in (item.left, item.right):
+            if isinstance(operand, FoldedLiteral): origins.extend(operand.origins)
+        self.folded += 1
+        return FoldedLiteral(value, origins, item.node)
+
+    def run(self, statement: CodeItem) -> list:
+        """
+        Apply the pass on one statement
+
+        :param statement: IR statement, its nested blocks are not visited
+        :type statement: :class:`~nodeeditor.node_code.CodeItem`
+        :return: ``list`` with the folded statement
+        :rtype: ``list``
+        """
+        folded = {}
+
+        def rewrite(item):
+            key = id(item)
+            if key not in folded:
+                new_item = replaceExprs(item, rewrite)
+                folded[key] = self.fold(new_item) if isinstance(new_item, BinOp) else new_item
+            return folded[key]
+
+        return [replaceExprs(statement, rewrite)]
+
+
+def defaultPasses(fold_constants: bool = False) -> list:
+    """Return new instances of the passes used for the code view and generated scripts
+
+    :param fold_constants: add the optional :class:`ConstantFoldingPass`, run before hoisting
+    :type fold_constants: ``bool``
+    :return: ``list`` of passes
+    :rtype: ``list``
+    """
+    passes = [ConstantFoldingPass()] if fold_constants else []
+    passes.append(CommonSubexpressionPass())
+    return passes
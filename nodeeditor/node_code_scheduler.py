@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the scheduler which coalesces requests for regenerating the code view
+"""
+from qtpy.QtCore import QTimer
+
+DEBUG = False
+
+
+class CodeRefreshScheduler():
+    """Class marking the code view stale and regenerating it at most once per event loop turn or `interval`"""
+    def __init__(self, callback: 'function', interval: int = 0):
+        """
+        :param callback: function regenerating the code view
+        :type callback: ``function``
+        :param interval: minimal delay in milliseconds between two regenerations. ``0`` means once per event loop turn
+        :type interval: ``int``
+
+        :Instance Attributes:
+
+        - **callback** - function regenerating the code view
+        - **is_stale** - ``True`` if a regeneration has been requested and not run yet
+        - **pending_requests** - number of requests received since the last regeneration
+        - **last_coalesced** - number of requests merged into the last regeneration
+        - **coalesced_requests** - total number of requests which did not cause their own regeneration
+        - **regenerations** - total number of regenerations
+        """
+        self.callback = callback
+
+        self.is_stale = False
+        self.pending_requests = 0
+        self.last_coalesced = 0
+        self.coalesced_requests = 0
+        self.regenerations = 0
+
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+        self.setInterval(interval)
+
+    def __str__(self):
+        return "<CodeRefreshScheduler %d regenerations, %d coalesced requests>" % (
+            self.regenerations, self.coalesced_requests)
+
+    @property
+    def interval(self) -> int:
+        """
+        Minimal delay between two regenerations
+
+        :getter: delay in milliseconds, ``0`` means once per event loop turn
+        :type: ``int``
+        """
+        return self.timer.interval()
+
+    def setInterval(self, interval: int):
+        """Set minimal delay in milliseconds between two regenerations
+
+        :param interval: delay in milliseconds, ``0`` means once per event loop turn
+        :type interval: ``int``
+        """
+        self.timer.setInterval(interval)
+
+    def requestUpdate(self, *args):
+        """Mark the code view stale. Regeneration happens when the control gets back to the event loop
+        and the `interval` elapsed. Accepts any arguments so it can be connected directly to Qt signals"""
+        self.pending_requests += 1
+        if not self.is_stale:
+            self.is_stale = True
+            self.timer.start()
+
+    def flush(self) -> bool:
+        """Regenerate the code view right now if it is stale. Use before reading the generated code,
+        i.e. when saving or copying it
+
+        :return: ``True`` if the code view has been regenerated
+        :rtype: ``bool``
+        """
+        self.timer.stop()
+        if not self.is_stale: return False
+
+        self.last_coalesced = self.pending_requests - 1
+        self.coalesced_requests += self.last_coalesced
+        self.regenerations += 1
+        self.is_stale = False
+        self.pending_requests = 0
+
+        if DEBUG: print("CODE: regenerating, coalesced", self.last_coalesced, "requests")
+        self.callback()
+        return True
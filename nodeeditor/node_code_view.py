@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the read-only text view showing the generated code
+"""
+from qtpy.QtGui import QTextCursor, QColor
+from qtpy.QtWidgets import QTextEdit
+
+DEBUG = False
+
+
+class QDMCodeView(QTextEdit):
+    """Class representing the code view. The document is split into fragments, one range of blocks per root
+    `Node` (event definitions, setter chains...). Only the fragments whose text changed are replaced on update,
+    so the cost of a refresh scales with the edit and the scroll position is kept.
+
+    Each line of a fragment is one block of the document and every fragment is followed by a blank block, like
+    the roots of the generated file. Block numbers are the line numbers of the
+    :class:`~nodeeditor.node_code.SourceMap` made by :func:`~nodeeditor.node_code.joinRootCode` from the fragments
+    in the same order."""
+
+    def __init__(self, parent: 'QWidget' = None):
+        """
+        :param parent: parent widget
+        :type parent: ``QWidget``
+
+        :Instance Attributes:
+
+        - **fragments** - list of ``[key, html, length]`` in document order. `length` is the number of characters
+          of the fragment including its trailing block separator and blank block
+        - **replaced_fragments** - number of fragments inserted or removed by the last :py:meth:`setFragments`
+        """
+        super().__init__(parent)
+        self.setReadOnly(True)
+
+        self.fragments = []
+        self.replaced_fragments = 0
+
+        self._position_clicked_listeners = []
+
+    def addPositionClickedListener(self, callback: 'function'):
+        """Register callback for `Position Clicked` event, called with the line and column of the click"""
+        self._position_clicked_listeners.append(callback)
+
+    def mousePressEvent(self, event):
+        """Overridden event reporting the clicked line and column"""
+        super().mousePressEvent(event)
+        cursor = self.cursorForPosition(event.pos())
+        for callback in self._position_clicked_listeners: callback(cursor.blockNumber(), cursor.positionInBlock())
+
+    def highlightRanges(self, ranges: list):
+        """Highlight the ranges of code without changing the document
+
+        :param ranges: ``list`` of ``(line, start column, end column, color)``
+        :type ranges: ``list``
+        """
+        document = self.document()
+        selections = []
+        for line, start, end, color in ranges:
+            block = document.findBlockByNumber(line)
+            if not block.isValid(): continue
+            selection = QTextEdit.ExtraSelection()
+            selection.format.setBackground(QColor(color))
+            selection.cursor = QTextCursor(block)
+            selection.cursor.setPosition(block.position() + start)
+            selection.cursor.setPosition(block.position() + min(end, block.length() - 1), QTextCursor.KeepAnchor)
+            selections.append(selection)
+        self.setExtraSelections(selections)
+
+    def clear(self):
+        """Remove all fragments"""
+        super().clear()
+        self.fragments = []
+
+    def setFragments(self, fragments: list):
+        """
+        Update the document to show `fragments`. Fragments are matched by key: the ones with the same html which
+        stay in the same order are kept, the others are removed and the new or changed ones inserted.
+
+        :param fragments: ``list`` of (key, html) pairs in document order
+        :type fragments: ``list``
+        """
+        old = self.fragments
+        old_indexes = {fragment[0]: index for index, fragment in enumerate(old)}
+
+        # greedy match in document order, a moved fragment is replaced
+        matches = []
+        last = -1
+        for key, html in fragments:
+            index = old_indexes.get(key)
+            if index is not None and index > last and old[index][1] == html:
+                last = index
+            else:
+                index = None
+            matches.append(index)
+        kept = set(matches)
+        kept.discard(None)
+
+        removed = len(old) - len(kept)
+        inserted = len(fragments) - len(kept)
+        self.replaced_fragments = removed + inserted
+        if DEBUG: print("CODEVIEW: keeping", len(kept), "fragments, removing", removed, "inserting", inserted)
+        if not removed and not inserted: return
+
+        scroll_bar = self.verticalScrollBar()
+        scroll_value = scroll_bar.value()
+
+        cursor = QTextCursor(self.document())
+        cursor.beginEditBlock()
+
+        # from the end, so the positions of the fragments before stay valid
+        end = sum(fragment[2] for fragment in old)
+        for index in range(len(old) - 1, -1, -1):
+            start = end - old[index][2]
+            if index not in kept:
+                cursor.setPosition(start)
+                cursor.setPosition(end, QTextCursor.KeepAnchor)
+                cursor.removeSelectedText()
+            end = start
+
+        new = []
+        position = 0
+        for (key, html), index in zip(fragments, matches):
+            if index is not None:
+                fragment = old[index]
+            else:
+                cursor.setPosition(position)
+                cursor.insertHtml(html)
+                cursor.insertBlock()
+                cursor.insertBlock()
+                fragment = [key, html, cursor.position() - position]
+            new.append(fragment)
+            position += fragment[2]
+
+        cursor.endEditBlock()
+        self.fragments = new
+
+        scroll_bar.setValue(scroll_value)
+
+    def toFragmentText(self, key) -> str:
+        """Return the plain text of the fragment with `key` or ``None``
+
+        :param key: key of the fragment, i.e. id of the root `Node`
+        :return: plain text shown for the fragment
+        :rtype: ``str``
+        """
+        start = 0
+        for fragment in self.fragments:
+            if fragment[0] == key:
+                cursor = QTextCursor(self.document())
+                cursor.setPosition(start)
+                cursor.setPosition(start + fragment[2] - 2, QTextCursor.KeepAnchor)
+                return cursor.selection().toPlainText()
+            start += fragment[2]
+        return None
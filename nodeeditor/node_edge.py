@@ -2,9 +2,8 @@
 """
 A module containing NodeEditor's class for representing Edge and Edge Type Constants.
 """
-from collections import OrderedDict
 from nodeeditor.node_graphics_edge import QDMGraphicsEdge
-from nodeeditor.node_serializable import Serializable
+from nodeeditor.node_model import EdgeModel
 from nodeeditor.utils import dumpException
 from nodeeditor.node_edge_validators import *
 
@@ -16,7 +15,7 @@ EDGE_TYPE_DEFAULT = EDGE_TYPE_BEZIER
 DEBUG = False
 
 
-class Edge(Serializable):
+class Edge(EdgeModel):
     """
     Class for representing Edge in NodeEditor.
     """
@@ -44,16 +43,8 @@ class Edge(Serializable):
             - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
             - **grEdge** - Instance of :class:`~nodeeditor.node_graphics_edge.QDMGraphicsEdge` subclass handling graphical representation in the ``QGraphicsScene``.
         """
-        super().__init__()
         self.scene = scene
-
-        # default init
-        self._start_socket = None
-        self._end_socket = None
-
-        self.start_socket = start_socket
-        self.end_socket = end_socket
-        self._edge_type = edge_type
+        super().__init__(start_socket, end_socket, edge_type)
 
         # create Graphics Edge instance
         self.grEdge = self.createEdgeClassInstance()
@@ -66,52 +57,6 @@ class Edge(Serializable):
             self.start_socket, self.end_socket
         )
 
-    @property
-    def start_socket(self):
-        """
-        Start socket
-
-        :getter: Returns start :class:`~nodeeditor.node_socket.Socket`
-        :setter: Sets start :class:`~nodeeditor.node_socket.Socket` safely
-        :type: :class:`~nodeeditor.node_socket.Socket`
-        """
-        return self._start_socket
-
-    @start_socket.setter
-    def start_socket(self, value):
-        # if we were assigned to some socket before, delete us from the socket
-        if self._start_socket is not None:
-            self._start_socket.removeEdge(self)
-
-        # assign new start socket
-        self._start_socket = value
-        # addEdge to the Socket class
-        if self.start_socket is not None:
-            self.start_socket.addEdge(self)
-
-    @property
-    def end_socket(self):
-        """
-        End socket
-
-        :getter: Returns end :class:`~nodeeditor.node_socket.Socket` or ``None`` if not set
-        :setter: Sets end :class:`~nodeeditor.node_socket.Socket` safely
-        :type: :class:`~nodeeditor.node_socket.Socket` or ``None``
-        """
-        return self._end_socket
-
-    @end_socket.setter
-    def end_socket(self, value):
-        # if we were assigned to some socket before, delete us from the socket
-        if self._end_socket is not None:
-            self._end_socket.removeEdge(self)
-
-        # assign new end socket
-        self._end_socket = value
-        # addEdge to the Socket class
-        if self.end_socket is not None:
-            self.end_socket.addEdge(self)
-
     @property
     def edge_type(self):
         """
@@ -165,13 +110,6 @@ class Edge(Serializable):
                 return False
         return True
 
-    def reconnect(self, from_socket: 'Socket', to_socket: 'Socket'):
-        """Helper function which reconnects edge `from_socket` to `to_socket`"""
-        if self.start_socket == from_socket:
-            self.start_socket = to_socket
-        elif self.end_socket == from_socket:
-            self.end_socket = to_socket
-
     def getGraphicsEdgeClass(self):
         """Returns the class representing Graphics Edge"""
         return QDMGraphicsEdge
@@ -187,17 +125,6 @@ class Edge(Serializable):
             self.updatePositions()
         return self.grEdge
 
-    def getOtherSocket(self, known_socket: 'Socket'):
-        """
-        Returns the opposite socket on this ``Edge``
-
-        :param known_socket: Provide known :class:`~nodeeditor.node_socket.Socket` to be able to determine the opposite one.
-        :type known_socket: :class:`~nodeeditor.node_socket.Socket`
-        :return: The oposite socket on this ``Edge`` or ``None``
-        :rtype: :class:`~nodeeditor.node_socket.Socket` or ``None``
-        """
-        return self.start_socket if known_socket == self.end_socket else self.end_socket
-
     def doSelect(self, new_state: bool = True):
         """
         Provide the safe selecting/deselecting operation. In the background it takes care about the flags, notifications
@@ -230,16 +157,14 @@ class Edge(Serializable):
         """
         Helper function which sets start and end :class:`~nodeeditor.node_socket.Socket` to ``None``
         """
+        # the sockets update the connected state of their Graphics Sockets when the edge leaves them
         if self.start_socket is not None:
-            self.start_socket.isConnected = False
             self.start_socket.grSocket.update()
 
         if self.end_socket is not None:
-            self.end_socket.isConnected = False
             self.end_socket.grSocket.update()
 
-        self.end_socket = None
-        self.start_socket = None
+        self.detach()
 
     def remove(self, silent_for_socket: 'Socket' = None, silent=False):
         """
@@ -271,7 +196,7 @@ class Edge(Serializable):
         self.scene.grScene.removeItem(self.grEdge)
         if DEBUG: print("   grEdge:", self.grEdge)
 
-        self.scene.grScene.update()
+        self.scene.requestRepaint()
 
         if DEBUG: print("# Removing Edge", self)
         if DEBUG: print(" - remove edge from all sockets")
@@ -301,19 +226,9 @@ class Edge(Serializable):
         except Exception as e:
             dumpException(e)
 
-    def serialize(self) -> OrderedDict:
-        return OrderedDict([
-            ('id', self.id),
-            ('edge_type', self.edge_type),
-            ('start', self.start_socket.id if self.start_socket is not None else None),
-            ('end', self.end_socket.id if self.end_socket is not None else None),
-        ])
-
     def deserialize(self, data: dict, hashmap: dict = {}, restore_id: bool = True, *args, **kwargs) -> bool:
-        if restore_id: self.id = data['id']
-        self.start_socket = hashmap[data['start']]
-        self.end_socket = hashmap[data['end']]
-        self.edge_type = data['edge_type']
+        if restore_id: self.scene.changeEdgeID(self, data['id'])
+        return super().deserialize(data, hashmap, restore_id=False)
 
 # Example: using validators for Edge
 # You can register edge validators wherever you want, even here...
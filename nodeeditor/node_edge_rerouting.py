@@ -117,7 +117,7 @@ class EdgeRerouting:
             # reset start socket highlight
             self.start_socket.grSocket.isHighlighted = False
 
-        # collect all affected (node, edge) tuples in the meantime.. if necessary
+        # collect the affected (node, edge) tuples in the meantime.. each node is notified once
         affected_nodes = []
 
         if target is None or target == self.start_socket:
@@ -126,37 +126,40 @@ class EdgeRerouting:
 
         else:
             # validate edges before doing anything else
-            valid_edges, invalid_edges = self.getAffectedEdges(), []
-            for edge in self.getAffectedEdges():
+            affected_edges, invalid_edges = self.getAffectedEdges(), set()
+            for edge in affected_edges:
                 start_sock = edge.getOtherSocket(self.start_socket)
                 if not edge.validateEdge(start_sock, target):
                     # not valid edge
                     self.print("This edge rerouting is not valid!", edge)
-                    invalid_edges.append(edge)
+                    invalid_edges.add(edge)
 
             # remove the invalidated edges from the list
-            for invalid_edge in invalid_edges:
-                valid_edges.remove(invalid_edge)
+            valid_edges = [edge for edge in affected_edges if edge not in invalid_edges]
 
             # reconnect to new socket
             self.print("should reconnect from:", self.start_socket, "-->", target)
 
             self.setAffectedEdgesVisible(visibility=True)
 
-            for edge in valid_edges:
-                for node in [edge.start_socket.node, edge.end_socket.node]:
-                    if node not in affected_nodes:
-                        affected_nodes.append((node, edge))
+            notified_nodes = set()
+            # both sockets refresh their connected state and their node code once, after all edges moved
+            with self.start_socket.batchConnectionUpdates(), target.batchConnectionUpdates():
+                for edge in valid_edges:
+                    for node in (edge.start_socket.node, edge.end_socket.node):
+                        if node not in notified_nodes:
+                            notified_nodes.add(node)
+                            affected_nodes.append((node, edge))
 
-                if target.is_input:
-                    target.removeAllEdges(silent=True)
+                    if target.is_input:
+                        target.removeAllEdges(silent=True)
 
-                if edge.end_socket == self.start_socket:
-                    edge.end_socket = target
-                else:
-                    edge.start_socket = target
+                    if edge.end_socket == self.start_socket:
+                        edge.end_socket = target
+                    else:
+                        edge.start_socket = target
 
-                edge.updatePositions()
+                    edge.updatePositions()
 
 
         # hide rerouting edges
@@ -9,15 +9,27 @@ from qtpy.QtGui import *
 from qtpy.QtWidgets import *
 
 from nodeeditor.node_edge import Edge, EDGE_TYPE_BEZIER
+from nodeeditor.node_code_scheduler import CodeRefreshScheduler
+from nodeeditor.node_code_view import QDMCodeView
+from nodeeditor.node_code import PythonEmitter, RichTextEmitter, RootCodeCache, SourceMap, joinRootCode, pythonProgram
+from nodeeditor.node_code_passes import defaultPasses
 from nodeeditor.graph_graphics import GraphGraphics
 from nodeeditor.node_node import Node
 from nodeeditor.node_scene import NodeScene, InvalidFile
+from nodeeditor.node_scene_binary import isBinaryFilename, loadSceneData
+from nodeeditor.node_scene_journal import SceneJournal, readJournal, replayJournal
+from nodeeditor.node_scene_loader import SceneLoader
+from nodeeditor.node_scene_saver import SceneSaver
+from nodeeditor.node_scene_transaction import TRANSACTION_CODE
 from nodeeditor.utils import dumpException
 
 
 class NodeEditorWidget(QWidget):
     Scene_class = NodeScene
     GraphGraphics_class = GraphGraphics
+    PythonEmitter_class = PythonEmitter
+    RichTextEmitter_class = RichTextEmitter
+    CodeView_class = QDMCodeView
     """The ``NodeEditorWidget`` class"""
 
     def __init__(self, parent: QWidget = None):
@@ -28,10 +40,27 @@ class NodeEditorWidget(QWidget):
         :Instance Attributes:
 
         - **filename** - currently graph's filename or ``None``
+        - **code_scheduler** - :class:`~nodeeditor.node_code_scheduler.CodeRefreshScheduler` coalescing code view updates
+        - **fold_constants** - ``True`` to fold operations on constants in the generated code
+        - **code_source_map** - :class:`~nodeeditor.node_code.SourceMap` of the code view
+        - **code_cache** - :class:`~nodeeditor.node_code.RootCodeCache` of the code view, ``None`` until the code
+          is first shown or when the passes change
+        - **loader** - :class:`~nodeeditor.node_scene_loader.SceneLoader` of the file being loaded or ``None``
+        - **saver** - :class:`~nodeeditor.node_scene_saver.SceneSaver` writing the saved files in the background
+        - **journal** - :class:`~nodeeditor.node_scene_journal.SceneJournal` recording the changes made since the
+          last save
         """
         super().__init__(parent)
 
         self.filename = None
+        self.fold_constants = False
+        self.code_source_map = SourceMap()
+        self.code_cache = None
+        self.code_scheduler = CodeRefreshScheduler(self.regenerateTextCode)
+        self.loader = None
+        self.saver = SceneSaver(self)
+        self.saver.saved.connect(self.onFileSaved)
+        self.saver.failed.connect(self.onFileSaveFailed)
 
         self.initUI()
 
@@ -58,12 +87,14 @@ class NodeEditorWidget(QWidget):
         self.scene.setNodeEditorWidget(self)
         self.graph_graphics_view.setNodeEditorWidget(self)
 
+        self.journal = SceneJournal(self.scene)
+
     def createCodeWnd(self):
         self.editor_wnd = QSplitter(Qt.Horizontal)
 
-        self.TextCodeWnd = QTextEdit()
+        self.TextCodeWnd = self.__class__.CodeView_class()
         self.TextCodeWnd.resize(800, 100)
-        self.TextCodeWnd.setReadOnly(True)
+        self.TextCodeWnd.addPositionClickedListener(self.onCodePositionClicked)
 
         self.editor_wnd.addWidget(self.graph_graphics_view)
         self.editor_wnd.addWidget(self.TextCodeWnd)
@@ -134,6 +165,7 @@ class NodeEditorWidget(QWidget):
 
     def newGraph(self):
         """Empty the scene (create new Graph)"""
+        self.journal.close()
         self.scene.clear()
         self.filename = None
         self.scene.history.clear()
@@ -148,11 +180,11 @@ class NodeEditorWidget(QWidget):
         """
         QApplication.setOverrideCursor(Qt.WaitCursor)
         try:
+            self.journal.close()
             self.scene.loadFromFile(filename)
             self.filename = filename
             self.scene.history.clear()
             self.scene.history.storeInitialHistoryStamp()
-            return True
         except FileNotFoundError as e:
             dumpException(e)
             QMessageBox.warning(self, "Error loading %s" % os.path.basename(filename), str(e).replace('[Errno 2]', ''))
@@ -165,8 +197,103 @@ class NodeEditorWidget(QWidget):
         finally:
             QApplication.restoreOverrideCursor()
 
+        self.openJournal()
+        return True
+
+    def fileLoadAsync(self, filename: str) -> 'SceneLoader':
+        """Load serialized graph progressively. The `Nodes` show up while the file is loading, a progress dialog
+        allows to cancel it. A load still running is cancelled first. See
+        :class:`~nodeeditor.node_scene_loader.SceneLoader`
+
+        :param filename: file to load
+        :type filename: ``str``
+        :return: the running :class:`~nodeeditor.node_scene_loader.SceneLoader` or ``None`` if the file could not
+            be read
+        """
+        # two loads building the same scene would interleave their nodes
+        if self.loader is not None: self.loader.cancel()
+        loader = SceneLoader(self.scene, filename)
+        try:
+            loader.start()
+        except (OSError, InvalidFile) as e:
+            dumpException(e)
+            QMessageBox.warning(self, "Error loading %s" % os.path.basename(filename), str(e).replace('[Errno 2]', ''))
+            return None
+        self.journal.close()
+
+        progress = QProgressDialog("Loading %s" % os.path.basename(filename), "Cancel", 0, 100, self)
+        progress.setMinimumDuration(500)
+        progress.canceled.connect(loader.cancel)
+        loader.addProgressListener(progress.setValue)
+        loader.addFinishedListener(lambda success: self.onFileLoadFinished(loader, success))
+        loader.addFinishedListener(lambda success: progress.close())
+        self.loader = loader
+        return loader
+
+    def onFileLoadFinished(self, loader: 'SceneLoader', success: bool):
+        """Called when the load started by :py:meth:`fileLoadAsync` ends, successfully or not"""
+        self.loader = None
+        if success:
+            self.filename = loader.filename
+            self.scene.history.clear()
+            self.scene.history.storeInitialHistoryStamp()
+            self.openJournal()
+        elif loader.error is not None:
+            QMessageBox.warning(self, "Error loading %s" % os.path.basename(loader.filename), str(loader.error))
+
+    def openJournal(self):
+        """Start journaling the changes of the loaded file. If the journal left by a session which was not closed
+        properly applies to the file, offer to recover its changes. See :mod:`~nodeeditor.node_scene_journal`"""
+        records = readJournal(self.filename)
+        if not records or not self.confirmJournalRecovery(len(records)):
+            # replaces the journal of the previous session
+            self.journal.open(self.filename)
+            return
+
+        try:
+            # the records are the changes made to the data of the saved file
+            with open(self.filename, "rb") as file:
+                saved_data = loadSceneData(file)
+            data = replayJournal(saved_data, records)
+            # a failing recovery rolls back to the loaded file
+            with self.scene.transaction("Recover unsaved changes"):
+                self.scene.clear()
+                self.scene.deserialize(data)
+                # undo goes back to the saved file
+                self.scene.history.storeHistory("Recover unsaved changes", setModified=True)
+        except Exception as e:
+            dumpException(e)
+            # the unrecovered changes are kept and the new ones journaled after them, the recovery can be tried again
+            self.journal.open(self.filename, append=True)
+            QMessageBox.warning(self, "Error recovering %s" % os.path.basename(self.filename),
+                                "%s\n\nThe unsaved changes are kept, their recovery will be offered again the "
+                                "next time the file is opened." % e)
+            return
+
+        # the recovered changes are journaled again, they replace the journal of the previous session
+        self.journal.open(self.filename, saved_data=saved_data)
+        self.UpdateTextCode()
+
+    def confirmJournalRecovery(self, records: int) -> bool:
+        """Ask whether the changes journaled by a previous session should be recovered
+
+        :param records: number of journaled changes
+        :type records: ``int``
+        :return: ``True`` to recover the changes
+        :rtype: ``bool``
+        """
+        res = QMessageBox.question(self, "Recover unsaved changes?",
+                                   "%s has %d unsaved changes from a session which was not closed properly.\n"
+                                   "Do you want to recover them?" % (os.path.basename(self.filename), records))
+        return res == QMessageBox.Yes
+
     def fileSave(self, filename: str = None):
-        """Save serialized graph to JSON file. When called with an empty parameter, we won't store/remember the filename.
+        """Save serialized graph to JSON file, or to a binary file if its extension is
+        :py:data:`~nodeeditor.node_scene_binary.BINARY_EXTENSION`. When called with an empty parameter, we won't
+        store/remember the filename.
+
+        The graph is serialized at once and written in the background by :py:attr:`saver`, which emits
+        ``saved`` or ``failed`` when the file is written.
 
         :param filename: file to store the graph
         :type filename: ``str``
@@ -174,12 +301,32 @@ class NodeEditorWidget(QWidget):
         if filename is not None:
             self.filename = filename
 
-        QApplication.setOverrideCursor(Qt.WaitCursor)
-        self.scene.saveToFile(self.filename)
-        QApplication.restoreOverrideCursor()
+        self.flushTextCode()
+        data = self.scene.serialize()
+        # changes made while the file is written will mark the scene modified again
+        self.scene.has_been_modified = False
+        self.journal.beginSave(data)
+        self.saver.save(data, self.filename, binary=isBinaryFilename(self.filename))
 
         return True
 
+    def waitForSave(self) -> bool:
+        """Block until the file being saved in the background is written
+
+        :return: ``True`` if the last save succeeded
+        :rtype: ``bool``
+        """
+        return self.saver.wait()
+
+    def onFileSaved(self, filename: str):
+        """Called when the file saved by :py:meth:`fileSave` has been written"""
+        self.scene.filename = filename
+        self.journal.compact(filename)
+
+    def onFileSaveFailed(self, filename: str, message: str):
+        """Called when the file saved by :py:meth:`fileSave` could not be written. The `Scene` is modified again"""
+        self.scene.has_been_modified = True
+
     def addNodes(self):
         """Testing method to create 3 `Nodes` with 3 `Edges` connecting them"""
         node1 = Node(self.scene, "My Awesome Node 1", inputs=[0, 0, 0], outputs=[1, 5])
@@ -240,12 +387,90 @@ class NodeEditorWidget(QWidget):
         line.setFlag(QGraphicsItem.ItemIsMovable)
         line.setFlag(QGraphicsItem.ItemIsSelectable)
 
-    def UpdateTextCode(self):
-        self.TextCodeWnd.clear()
-        for node in self.scene.nodes:
+    def UpdateTextCode(self, *args):
+        """Request regeneration of the code view. Requests are coalesced by
+        :class:`~nodeeditor.node_code_scheduler.CodeRefreshScheduler`, call :py:meth:`flushTextCode` when the code
+        is needed right away. Inside a scene transaction the request is made once, on commit"""
+        if self.scene.deferInTransaction(TRANSACTION_CODE): return
+        self.code_scheduler.requestUpdate()
+
+    def flushTextCode(self) -> bool:
+        """Regenerate the code view now if there is a pending request
+
+        :return: ``True`` if the code view has been regenerated
+        :rtype: ``bool``
+        """
+        return self.code_scheduler.flush()
+
+    def getCodeRoots(self) -> list:
+        """Return the code blocks of all `Nodes` which start a piece of the program (i.e. event definitions,
+        chains of statements not connected to any other statement), in the `Scene` order
+
+        :return: ``list`` of (`Node`, block) pairs
+        :rtype: ``list``
+        """
+        return self.scene.getCodeRoots()
+
+    def setFoldConstants(self, fold_constants: bool):
+        """Enable or disable folding of operations on constants in the generated code
 
-            if node.getNodeCode() is None or node.showCode is not True:
-                pass
-            else:
-                self.TextCodeWnd.append(node.getNodeCode())
-                # scrollToAnchor
+        :param fold_constants: ``True`` to fold constants
+        :type fold_constants: ``bool``
+        """
+        if fold_constants == self.fold_constants: return
+        self.fold_constants = fold_constants
+        self.code_cache = None
+        self.UpdateTextCode()
+
+    def getCodePasses(self) -> list:
+        """Return the passes from :mod:`~nodeeditor.node_code_passes` optimizing the generated code. Override to
+        change them
+
+        :return: ``list`` of passes
+        :rtype: ``list``
+        """
+        return defaultPasses(self.fold_constants)
+
+    def getPythonCode(self) -> str:
+        """Return the plain Python code generated from the `Scene`
+
+        :return: Python source code
+        :rtype: ``str``
+        """
+        return self.getPythonProgram()[0]
+
+    def getPythonProgram(self) -> tuple:
+        """Return the plain Python code generated from the `Scene` with the
+        :class:`~nodeeditor.node_code.SourceMap` linking its lines to the `Nodes`
+
+        :return: (Python source code, :class:`~nodeeditor.node_code.SourceMap`)
+        :rtype: ``tuple``
+        """
+        return pythonProgram(self.getCodeRoots(), self.__class__.PythonEmitter_class(passes=self.getCodePasses()))
+
+    def regenerateTextCode(self):
+        """Update the code view. Only the roots whose code changed are emitted again and only their fragments
+        are replaced"""
+        if self.code_cache is None:
+            self.code_cache = RootCodeCache(self.__class__.RichTextEmitter_class(passes=self.getCodePasses()))
+        emitted = [root for root in self.code_cache.emitRoots(self.getCodeRoots()) if len(root[2])]
+        # laid out like the generated file, so lines of the view and of the file are the same
+        self.code_source_map = joinRootCode(emitted)[1]
+        self.TextCodeWnd.setFragments([(node.id, html) for node, html, source_map in emitted])
+        self.updateCodeSelection()
+
+    def updateCodeSelection(self):
+        """Highlight the code of the selected `Nodes` in the code view, using the source map"""
+        ranges = []
+        for node in self.scene.getSelectedNodes():
+            if node.nodeColor is None: continue
+            for line, start, end in self.code_source_map.getRanges(node.id):
+                ranges.append((line, start, end, node.nodeColor))
+        self.TextCodeWnd.highlightRanges(ranges)
+
+    def onCodePositionClicked(self, line: int, column: int):
+        """Select the `Node` which produced the clicked code"""
+        node = self.code_source_map.getNodeAt(line, column)
+        if node is None or node not in self.scene.nodes: return
+        self.scene.doDeselectItems(silent=True)
+        node.doSelect(True)
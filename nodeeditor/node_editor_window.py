@@ -7,6 +7,7 @@ from qtpy.QtCore import *
 from qtpy.QtWidgets import *
 # from nodeeditor.node_editor_widget import NodeEditorWidget
 from nodeeditor.node_editor_widget import NodeEditorWidget
+from nodeeditor.node_scene_binary import BINARY_EXTENSION
 
 
 class NodeEditorWindow(QMainWindow):
@@ -38,6 +39,8 @@ class NodeEditorWindow(QMainWindow):
 
         self.nodeeditor = self.__class__.NodeEditorWidget_class(self)
         self.nodeeditor.scene.addHasBeenModifiedListener(self.setTitle)
+        self.nodeeditor.saver.saved.connect(self.onFileSaved)
+        self.nodeeditor.saver.failed.connect(self.onFileSaveFailed)
         self.setCentralWidget(self.nodeeditor)
 
 
@@ -116,6 +119,8 @@ class NodeEditorWindow(QMainWindow):
     def closeEvent(self, event):
         """Handle close event. Ask before we loose work"""
         if self.maybeSave():
+            # the changes are saved or discarded
+            self.nodeeditor.journal.close()
             event.accept()
         else:
             event.ignore()
@@ -144,6 +149,10 @@ class NodeEditorWindow(QMainWindow):
         :return: ``True`` if we can continue in the `Close Event` and shutdown. ``False`` if we should cancel
         :rtype: ``bool``
         """
+        # a save still being written decides whether the scene is modified
+        current_node_editor = self.CurrentNodeEditor()
+        if current_node_editor is not None: current_node_editor.waitForSave()
+
         if not self.isModified():
             return True
 
@@ -153,7 +162,7 @@ class NodeEditorWindow(QMainWindow):
               )
 
         if res == QMessageBox.Save:
-            return self.onFileSave()
+            return bool(self.onFileSave()) and self.CurrentNodeEditor().waitForSave()
         elif res == QMessageBox.Cancel:
             return False
 
@@ -176,7 +185,7 @@ class NodeEditorWindow(QMainWindow):
 
     def getFileDialogFilter(self):
         """Returns ``str`` standard file open/save filter for ``QFileDialog``"""
-        return 'Graph (*.json);;All files (*)'
+        return 'Graph (*.json);;Binary graph (*%s);;All files (*)' % BINARY_EXTENSION
 
     def onNewGraphTab(self):
         # This is overridden by Master Window Function
@@ -191,7 +200,8 @@ class NodeEditorWindow(QMainWindow):
         if self.maybeSave():
             fname, filter = QFileDialog.getOpenFileName(self, 'Open graph from file', self.getFileDialogDirectory(), self.getFileDialogFilter())
             if fname != '' and os.path.isfile(fname):
-                self.CurrentNodeEditor().fileLoad(fname)
+                loader = self.CurrentNodeEditor().fileLoadAsync(fname)
+                if loader is not None: loader.addFinishedListener(lambda success: self.setTitle())
                 self.setTitle()
 
     def onFileSave(self):
@@ -200,16 +210,13 @@ class NodeEditorWindow(QMainWindow):
         if current_node_editor is not None:
             if not current_node_editor.isFilenameSet() or current_node_editor.filename.__contains__("AutoSave") : return self.onFileSaveAs()
             current_node_editor.fileSave()
-            self.statusBar().showMessage("Successfully saved %s" % current_node_editor.filename, 5000)
-
-            # support for MDI app
-            if hasattr(current_node_editor, "setTitle"): current_node_editor.setTitle()
-            else: self.setTitle()
+            self.statusBar().showMessage("Saving %s..." % current_node_editor.filename)
             return True
 
     def FileAutoSave(self):
         current_node_editor = self.CurrentNodeEditor()
-        if current_node_editor is not None:
+        # the changes of a graph saved to a file are recorded by its journal, see node_scene_journal
+        if current_node_editor is not None and not current_node_editor.journal.isOpen():
             # print(f"""{self.filesWidget.Project_Directory}/{current_node_editor.windowTitle()}.json""")
             if os.path.isfile(f"{self.filesWidget.Project_Directory}/{current_node_editor.windowTitle()}.json") and os.path.isfile(f"{self.filesWidget.Project_Directory}/AutoSave/{current_node_editor.windowTitle()}.json"):
                 self.onFileSave()
@@ -218,13 +225,7 @@ class NodeEditorWindow(QMainWindow):
                 # if fname == '': return False
                 self.onBeforeSaveAs(current_node_editor, fname)
                 current_node_editor.fileSave(fname)
-                self.statusBar().showMessage("Successfully Auto Saved %s" % current_node_editor.filename, 5000)
-
-                # support for MDI app
-                if hasattr(current_node_editor, "setTitle"):
-                    current_node_editor.setTitle()
-                else:
-                    self.setTitle()
+                self.statusBar().showMessage("Auto saving %s..." % current_node_editor.filename)
                 return True
 
     def onFileSaveAs(self):
@@ -237,15 +238,30 @@ class NodeEditorWindow(QMainWindow):
             self.onBeforeSaveAs(current_node_editor, fname)
             current_node_editor.fileSave(fname)
             current_node_editor.setWindowTitle(os.path.splitext(os.path.basename(current_node_editor.filename))[0])
-            self.statusBar().showMessage("Successfully saved as %s" % current_node_editor.filename, 5000)
-
-            # support for MDI app
-            if hasattr(current_node_editor, "setTitle"):
-                current_node_editor.setTitle()
-            else:
-                self.setTitle()
+            self.statusBar().showMessage("Saving %s..." % current_node_editor.filename)
             return True
 
+    def onFileSaved(self, filename: str):
+        """Handle the end of a save written in the background by
+        :class:`~nodeeditor.node_scene_saver.SceneSaver`"""
+        self.statusBar().showMessage("Successfully saved %s" % filename, 5000)
+        self.updateSavedTitle()
+
+    def onFileSaveFailed(self, filename: str, message: str):
+        """Handle a save which could not be written by :class:`~nodeeditor.node_scene_saver.SceneSaver`"""
+        self.statusBar().clearMessage()
+        QMessageBox.warning(self, "Error saving %s" % os.path.basename(filename), message)
+        self.updateSavedTitle()
+
+    def updateSavedTitle(self):
+        """Refresh the title after a save"""
+        current_node_editor = self.CurrentNodeEditor()
+        # support for MDI app
+        if hasattr(current_node_editor, "setTitle"):
+            current_node_editor.setTitle()
+        elif current_node_editor is not None:
+            self.setTitle()
+
     def onBeforeSaveAs(self, current_nodeeditor: 'NodeEditorWidget', filename: str):
         """
         Event triggered after choosing filename and before actual fileSave(). We are passing current_nodeeditor because
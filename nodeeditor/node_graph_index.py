@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the adjacency index of a :class:`~nodeeditor.node_model.SceneModel`, answering graph-level
+queries (successors, upstream/downstream closure, topological order, cycles) without walking the `Sockets`.
+"""
+from collections import deque
+
+DEBUG = False
+
+#: links between execution sockets (socket type 0)
+LINK_EXEC = 1
+#: links between data sockets
+LINK_DATA = 2
+#: both kinds of links
+LINK_ALL = LINK_EXEC | LINK_DATA
+
+
+class GraphIndex():
+    """Class keeping which `Node` is linked to which. A link goes from the `Node` of the output `Socket` of an
+    `Edge` to the `Node` of its input `Socket`, so it follows the execution flow for execution sockets and the
+    data flow for data sockets.
+
+    The index is updated incrementally by :py:meth:`updateEdge` each time an `Edge` connects or disconnects.
+    Results of the graph queries are cached until the next change. Queries take a `kinds` mask made of
+    ``LINK_EXEC`` and ``LINK_DATA``."""
+
+    def __init__(self):
+        """
+        :Instance Attributes:
+
+        - **links** - ``dict`` of connected `Edges` to their (source `Node`, target `Node`, kind)
+        - **version** - number of changes of the index, cached results are valid for one version
+        """
+        self.links = {}
+        self.version = 0
+
+        # nodes in scene order, values are the sets of their linked edges
+        self._nodes = {}
+        # kind -> node -> {linked node: number of edges}
+        self._successors = {LINK_EXEC: {}, LINK_DATA: {}}
+        self._predecessors = {LINK_EXEC: {}, LINK_DATA: {}}
+
+        self._cache = {}
+        self._cache_version = 0
+
+    def __str__(self):
+        return "<GraphIndex %d nodes, %d links>" % (len(self._nodes), len(self.links))
+
+    def addNode(self, node: 'Node'):
+        """Register `node`, it becomes part of the query results"""
+        if node in self._nodes: return
+        self._nodes[node] = set()
+        self._changed()
+
+    def removeNode(self, node: 'Node'):
+        """Unregister `node` together with its links"""
+        edges = self._nodes.pop(node, None)
+        if edges is None: return
+        for edge in list(edges): self._unlink(edge)
+        self._changed()
+
+    def updateEdge(self, edge: 'Edge'):
+        """
+        Update the link of `edge` after one of its sockets changed. An `Edge` missing one of its sockets is not a link
+
+        :param edge: changed `Edge`
+        :type edge: :class:`~nodeeditor.node_model.EdgeModel`
+        """
+        start, end = edge.start_socket, edge.end_socket
+        link = None
+        if start is not None and end is not None:
+            source, target = (start, end) if start.is_output else (end, start)
+            link = (source.node, target.node, LINK_EXEC if source.socket_type == 0 else LINK_DATA)
+
+        if self.links.get(edge) == link: return
+        self._unlink(edge)
+        if link is not None:
+            source_node, target_node, kind = link
+            self.links[edge] = link
+            self._count(self._successors[kind], source_node, target_node, 1)
+            self._count(self._predecessors[kind], target_node, source_node, 1)
+            for node in (source_node, target_node): self._nodes.setdefault(node, set()).add(edge)
+        self._changed()
+
+    def _unlink(self, edge: 'Edge'):
+        link = self.links.pop(edge, None)
+        if link is None: return
+        source_node, target_node, kind = link
+        self._count(self._successors[kind], source_node, target_node, -1)
+        self._count(self._predecessors[kind], target_node, source_node, -1)
+        for node in (source_node, target_node):
+            if node in self._nodes: self._nodes[node].discard(edge)
+        self._changed()
+
+    def _count(self, adjacency: dict, node: 'Node', other: 'Node', delta: int):
+        neighbours = adjacency.setdefault(node, {})
+        count = neighbours.get(other, 0) + delta
+        if count > 0:
+            neighbours[other] = count
+        else:
+            neighbours.pop(other, None)
+            if not neighbours: del adjacency[node]
+
+    def _changed(self):
+        self.version += 1
+
+    def _cached(self, key: tuple, compute: 'function'):
+        if self._cache_version != self.version:
+            self._cache = {}
+            self._cache_version = self.version
+        if key not in self._cache: self._cache[key] = compute()
+        return self._cache[key]
+
+    def _neighbours(self, adjacency: dict, node: 'Node', kinds: int) -> list:
+        result = {}
+        for kind in (LINK_EXEC, LINK_DATA):
+            if kinds & kind: result.update(adjacency[kind].get(node, {}))
+        return list(result)
+
+    def successors(self, node: 'Node', kinds: int = LINK_ALL) -> list:
+        """
+        Return the `Nodes` linked from the outputs of `node`, each once
+
+        :param node: `Node` in the index
+        :param kinds: mask of ``LINK_EXEC`` and ``LINK_DATA``
+        :type kinds: ``int``
+        :rtype: ``list``
+        """
+        return self._neighbours(self._successors, node, kinds)
+
+    def predecessors(self, node: 'Node', kinds: int = LINK_ALL) -> list:
+        """
+        Return the `Nodes` linked to the inputs of `node`, each once
+
+        :param node: `Node` in the index
+        :param kinds: mask of ``LINK_EXEC`` and ``LINK_DATA``
+        :type kinds: ``int``
+        :rtype: ``list``
+        """
+        return self._neighbours(self._predecessors, node, kinds)
+
+    def _closure(self, adjacency: dict, node: 'Node', kinds: int) -> frozenset:
+        reached = set()
+        stack = [node]
+        while stack:
+            for other in self._neighbours(adjacency, stack.pop(), kinds):
+                if other not in reached:
+                    reached.add(other)
+                    stack.append(other)
+        return frozenset(reached)
+
+    def downstream(self, node: 'Node', kinds: int = LINK_ALL) -> frozenset:
+        """
+        Return all `Nodes` reachable from `node` following the links. `node` itself is included only if it is
+        on a cycle
+
+        :rtype: ``frozenset``
+        """
+        return self._cached(('downstream', node, kinds), lambda: self._closure(self._successors, node, kinds))
+
+    def upstream(self, node: 'Node', kinds: int = LINK_ALL) -> frozenset:
+        """
+        Return all `Nodes` from which `node` is reachable (its ancestors). `node` itself is included only if it is
+        on a cycle
+
+        :rtype: ``frozenset``
+        """
+        return self._cached(('upstream', node, kinds), lambda: self._closure(self._predecessors, node, kinds))
+
+    def roots(self, kinds: int = LINK_ALL) -> list:
+        """
+        Return the `Nodes` without incoming links, in the scene order. With ``LINK_EXEC`` these are the starts of
+        the execution flow
+
+        :rtype: ``list``
+        """
+        return self._cached(('roots', kinds), lambda: [
+            node for node in self._nodes if not self.predecessors(node, kinds)])
+
+    def topologicalOrder(self, kinds: int = LINK_ALL) -> list:
+        """
+        Return all `Nodes` ordered so each one comes after the `Nodes` linked to its inputs. Ties keep the scene
+        order. `Nodes` on a cycle or after one cannot be ordered, they come last in the scene order
+
+        :rtype: ``list``
+        """
+        return self._cached(('topological', kinds), lambda: self._topologicalOrder(kinds))
+
+    def _topologicalOrder(self, kinds: int) -> list:
+        pending = {node: len(self.predecessors(node, kinds)) for node in self._nodes}
+        queue = deque(node for node, count in pending.items() if count == 0)
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for other in self.successors(node, kinds):
+                pending[other] -= 1
+                if pending[other] == 0: queue.append(other)
+        if len(order) < len(self._nodes):
+            ordered = set(order)
+            order.extend(node for node in self._nodes if node not in ordered)
+        return order
+
+    def cycles(self, kinds: int = LINK_ALL) -> list:
+        """
+        Return the cycles of the graph. Each cycle is the ``list`` of `Nodes` of one strongly connected component,
+        a `Node` linked to itself is a cycle too
+
+        :rtype: ``list``
+        """
+        return self._cached(('cycles', kinds), lambda: self._cycles(kinds))
+
+    def hasCycle(self, kinds: int = LINK_ALL) -> bool:
+        """Return ``True`` if following the links can lead back to a `Node`"""
+        return len(self.cycles(kinds)) > 0
+
+    def _cycles(self, kinds: int) -> list:
+        # iterative Tarjan's algorithm, deep graphs must not hit the recursion limit
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        cycles = []
+        for start in self._nodes:
+            if start in index: continue
+            work = [(start, iter(self.successors(start, kinds)))]
+            index[start] = lowlink[start] = len(index)
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.successors(child, kinds))))
+                        break
+                    if child in on_stack: lowlink[node] = min(lowlink[node], index[child])
+                else:
+                    work.pop()
+                    if work: lowlink[work[-1][0]] = min(lowlink[work[-1][0]], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            other = stack.pop()
+                            on_stack.discard(other)
+                            component.append(other)
+                            if other is node: break
+                        if len(component) > 1 or node in self.successors(node, kinds):
+                            cycles.append(component[::-1])
+        if DEBUG: print("GRAPH: found", len(cycles), "cycles")
+        return cycles
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the JSON reading and writing used for the scene files. The fastest installed backend is used:
+``orjson``, then ``ujson``, with the standard library ``json`` module as fallback.
+
+Scenes are written compact by default and streamed to the file item by item, so the whole document is never
+built as one string. Reading accepts both compact and indented files, at once with :py:func:`loadJSON` or one
+item at a time with :class:`IncrementalJSONReader`.
+"""
+import json
+from json.decoder import WHITESPACE
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+DEBUG = False
+
+#: name of the JSON backend in use
+JSON_BACKEND = "orjson" if orjson is not None else "ujson" if ujson is not None else "json"
+
+
+def dumpsJSON(data, indent: int = None) -> bytes:
+    """
+    Encode `data` to UTF-8 JSON with the fastest installed backend
+
+    :param data: ``dict``, ``list`` or scalar to encode
+    :param indent: number of spaces of indentation, ``None`` for compact output
+    :type indent: ``int``
+    :return: encoded JSON
+    :rtype: ``bytes``
+    """
+    if indent is None:
+        if orjson is not None: return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        if ujson is not None: return ujson.dumps(data, ensure_ascii=False).encode('utf-8')
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    # only the standard library keeps the layout of the files saved by the former versions
+    return json.dumps(data, indent=indent).encode('utf-8')
+
+
+def loadsJSON(raw_data: bytes):
+    """
+    Decode JSON `raw_data`, compact or indented
+
+    :param raw_data: UTF-8 encoded JSON
+    :type raw_data: ``bytes`` or ``str``
+    :raises: ``ValueError`` (``json.JSONDecodeError`` with the standard library) if `raw_data` is not valid JSON
+    """
+    if orjson is not None: return orjson.loads(raw_data)
+    if ujson is not None: return ujson.loads(raw_data)
+    return json.loads(raw_data)
+
+
+def dumpJSON(data: dict, file: 'BinaryIO', indent: int = None):
+    """
+    Write `data` as JSON to the binary `file`. In compact mode the items of the top-level lists (`Nodes`,
+    `Edges`...) are encoded and written one by one
+
+    :param data: serialized scene
+    :type data: ``dict``
+    :param file: file opened for writing in binary mode
+    :param indent: number of spaces of indentation, ``None`` for compact output
+    :type indent: ``int``
+    """
+    if indent is not None:
+        file.write(dumpsJSON(data, indent))
+        return
+
+    file.write(b'{')
+    for position, (key, value) in enumerate(data.items()):
+        if position: file.write(b',')
+        file.write(dumpsJSON(key))
+        file.write(b':')
+        if isinstance(value, list):
+            file.write(b'[')
+            for index, item in enumerate(value):
+                if index: file.write(b',')
+                file.write(dumpsJSON(item))
+            file.write(b']')
+        else:
+            file.write(dumpsJSON(value))
+    file.write(b'}')
+    if DEBUG: print("JSON: written with", JSON_BACKEND)
+
+
+def loadJSON(file: 'BinaryIO'):
+    """
+    Read JSON from the binary `file`
+
+    :param file: file opened for reading in binary mode
+    :raises: ``ValueError`` if the file is not valid JSON
+    """
+    return loadsJSON(file.read())
+
+
+class IncrementalJSONReader():
+    """Class decoding the top-level JSON object of a document one value at a time, and the items of its ``list``
+    values one by one, so the decoding of a large scene can be spread over time::
+
+        reader = IncrementalJSONReader(raw_data)
+        for key, value in reader.items():
+            if key == 'nodes':
+                for node_data in value: ...
+    """
+
+    def __init__(self, raw_data: bytes):
+        """
+        :param raw_data: UTF-8 encoded JSON document, its top-level value must be an object
+        :type raw_data: ``bytes`` or ``str``
+
+        :Instance Attributes:
+
+        - **text** - decoded document
+        - **position** - index in **text** of the end of the last decoded value
+        """
+        self.text = raw_data.decode('utf-8') if isinstance(raw_data, (bytes, bytearray)) else raw_data
+        self.position = 0
+        self._decoder = json.JSONDecoder()
+
+    def __str__(self):
+        return "<IncrementalJSONReader %d/%d>" % (self.position, len(self.text))
+
+    @property
+    def progress(self) -> float:
+        """Part of the document decoded so far, from ``0.0`` to ``1.0``"""
+        return self.position / len(self.text) if self.text else 1.0
+
+    def _skip(self, position: int) -> int:
+        return WHITESPACE.match(self.text, position).end()
+
+    def _expect(self, position: int, characters: str) -> (str, int):
+        if position >= len(self.text) or self.text[position] not in characters:
+            raise ValueError("expected %s at position %d of the JSON document" % (" or ".join(characters), position))
+        return self.text[position], self._skip(position + 1)
+
+    def items(self):
+        """
+        Generator of the ``(key, value)`` pairs of the top-level object, in the document order. ``list`` values are
+        given as generators decoding one item per step, any items left unread are skipped before the next pair
+
+        :raises: ``ValueError`` if the document is not a valid JSON object
+        """
+        character, position = self._expect(self._skip(0), '{')
+        if self.text.startswith('}', position):
+            self.position = position + 1
+            return
+        while True:
+            key, position = self._decoder.raw_decode(self.text, position)
+            character, position = self._expect(self._skip(position), ':')
+            if self.text.startswith('[', position):
+                self.position = position + 1
+                values = self._listItems()
+                yield key, values
+                for value in values: pass
+            else:
+                value, self.position = self._decoder.raw_decode(self.text, position)
+                yield key, value
+            character, position = self._expect(self._skip(self.position), ',}')
+            if character == '}': return
+
+    def _listItems(self):
+        position = self._skip(self.position)
+        if self.text.startswith(']', position):
+            self.position = position + 1
+            return
+        while True:
+            item, self.position = self._decoder.raw_decode(self.text, position)
+            yield item
+            character, position = self._expect(self._skip(self.position), ',]')
+            if character == ']':
+                self.position = position
+                return
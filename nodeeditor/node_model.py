@@ -0,0 +1,851 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the plain Python model of a graph: scene, nodes, sockets, edges, literal values of inputs and
+user variables/events, with their serialization. Nothing here creates a ``QGraphicsItem`` or a widget, so graphs can
+be loaded, analysed and compiled by tools running without a display.
+
+The model classes use ``__slots__``, so a graph with many nodes does not pay for one instance dictionary per
+object. Their Qt subclasses keep a ``__dict__`` for the graphics, widgets and attributes of node implementations.
+
+The Qt classes :class:`~nodeeditor.node_scene.NodeScene`, :class:`~nodeeditor.node_node.Node`,
+:class:`~nodeeditor.node_socket.Socket` and :class:`~nodeeditor.node_edge.Edge` derive from these classes and add
+the graphics on top, so everything written against the model API works on both.
+"""
+import os
+from collections import OrderedDict
+
+from nodeeditor.node_code import Flow, literalCode, codeRoots
+from nodeeditor.node_graph_index import GraphIndex, LINK_DATA
+from nodeeditor.node_ordered_set import OrderedSet
+from nodeeditor.node_scene_binary import loadSceneData
+from nodeeditor.node_serializable import Serializable, newID, reserveID
+
+DEBUG = False
+DEBUG_REMOVE_WARNINGS = False
+
+#: value of an unconnected input of each socket type, same as a freshly created input widget
+SOCKET_DEFAULT_VALUES = {0: None, 1: 0.0, 2: 0, 3: False, 4: ""}
+
+#: ``socketEdges`` shared by all `Sockets` without any `Edge`, a `Socket` gets its own container on the first
+#: connection. Most `Sockets` of a large graph are not connected, so this saves one container per `Socket`
+NO_EDGES = OrderedSet()
+#: number of `Edges` from which a `Socket` keeps them in an :class:`~nodeeditor.node_ordered_set.OrderedSet`.
+#: Fewer `Edges` are kept in a ``list``, smaller and as fast at that size
+EDGE_SET_THRESHOLD = 8
+
+#: ``RIGHT_TOP`` and ``RIGHT_BOTTOM`` socket positions, multi edged in files saved without 'multi_edges'.
+#: See :ref:`socket-position-constants`
+OLD_MULTI_EDGED_POSITIONS = (4, 6)
+
+
+class InvalidFile(Exception): pass
+
+
+def socketDataKey(socket_data: dict) -> tuple:
+    """Return the ``(position, index)`` key identifying serialized `Socket` data on one side of a `Node`"""
+    return socket_data['position'], socket_data['index']
+
+
+def sortSocketsData(sockets_data: list) -> list:
+    """
+    Sort serialized `Sockets` in place by position and index. Data saved by NodeEditor is already ordered,
+    it is then only checked in one pass
+
+    :param sockets_data: ``list`` of serialized `Sockets` of one side of a `Node`
+    :type sockets_data: ``list``
+    :return: `sockets_data`
+    :rtype: ``list``
+    """
+    keys = [socketDataKey(socket_data) for socket_data in sockets_data]
+    if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)): sockets_data.sort(key=socketDataKey)
+    return sockets_data
+
+
+class SocketModel(Serializable):
+    """Class representing a `Socket` of a :class:`NodeModel`"""
+    __slots__ = ('id', 'node', 'index', 'position', 'socket_type', 'is_multi_edges', 'is_input', 'socketEdges',
+                 'value')
+
+    def __init__(self, node: 'NodeModel', index: int = 0, position: int = 1, socket_type: int = 1,
+                 multi_edges: bool = True, is_input: bool = False):
+        """
+        :param node: reference to the :class:`NodeModel` containing this `Socket`
+        :type node: :class:`NodeModel`
+        :param index: Current index of this socket in the position
+        :type index: ``int``
+        :param position: Socket position. See :ref:`socket-position-constants`
+        :param socket_type: Constant defining type(color) of this socket
+        :param multi_edges: Can this socket have multiple `Edges` connected?
+        :type multi_edges: ``bool``
+        :param is_input: Is this an input `Socket`?
+        :type is_input: ``bool``
+
+        :Instance Attributes:
+
+        - **node** - :class:`NodeModel` this socket belongs to
+        - **socketEdges** - :class:`EdgeModel` connected to this socket, in the order of connection. It is the
+          shared empty :data:`NO_EDGES` while nothing is connected, a ``list`` for a few `Edges` and an
+          :class:`~nodeeditor.node_ordered_set.OrderedSet` from :data:`EDGE_SET_THRESHOLD` `Edges` on. Change it
+          through :py:meth:`addEdge` and :py:meth:`removeEdge` only
+        - **value** - literal value used when the input is not connected
+        """
+        super().__init__()
+        self.node = node
+        self.index = index
+        self.position = position
+        self.socket_type = socket_type
+        self.is_multi_edges = multi_edges
+        self.is_input = is_input
+        self.socketEdges = NO_EDGES
+        self.value = SOCKET_DEFAULT_VALUES.get(socket_type)
+
+    @property
+    def is_output(self) -> bool:
+        """``True`` if this socket serves for Output"""
+        return not self.is_input
+
+    def __str__(self):
+        return "<SocketModel #%d %s %s>" % (self.index, "ME" if self.is_multi_edges else "SE", self.node)
+
+    def hasAnyEdge(self) -> bool:
+        """
+        Returns ``True`` if any `Edge` is connected to this socket
+
+        :rtype: ``bool``
+        """
+        return len(self.socketEdges) > 0
+
+    def isConnected(self, edge: 'EdgeModel') -> bool:
+        """
+        Returns ``True`` if `edge` is connected to this `Socket`
+
+        :rtype: ``bool``
+        """
+        return edge in self.socketEdges
+
+    def addEdge(self, edge: 'EdgeModel'):
+        """Append an `Edge` to the list of connected `Edges`"""
+        edges = self.socketEdges
+        if edges is NO_EDGES:
+            self.socketEdges = [edge]
+        elif isinstance(edges, list):
+            if edge in edges: return
+            if len(edges) + 1 < EDGE_SET_THRESHOLD:
+                edges.append(edge)
+            else:
+                self.socketEdges = OrderedSet(edges + [edge])
+        else:
+            edges.append(edge)
+        self.onEdgesChanged()
+
+    def removeEdge(self, edge: 'EdgeModel'):
+        """Disconnect passed `Edge` from this `Socket`"""
+        if edge in self.socketEdges:
+            self.socketEdges.remove(edge)
+            if not self.socketEdges: self.socketEdges = NO_EDGES
+            self.onEdgesChanged()
+        elif DEBUG_REMOVE_WARNINGS:
+            print("!W:", "SocketModel::removeEdge", "wanna remove edge", edge,
+                  "from self.edges but it's not in the list!")
+
+    def onEdgesChanged(self):
+        """Called when an `Edge` has been connected to or disconnected from this `Socket`. The code of our `Node`
+        reads its inputs through the `Edges`, so it is invalidated"""
+        self.node.markCodeDirty()
+
+    def changeSocketType(self, new_socket_type: int) -> bool:
+        """
+        Change the Socket Type
+
+        :param new_socket_type: new socket type
+        :type new_socket_type: ``int``
+        :return: Returns ``True`` if the socket type was actually changed
+        :rtype: ``bool``
+        """
+        if self.socket_type != new_socket_type:
+            self.socket_type = new_socket_type
+            self.value = SOCKET_DEFAULT_VALUES.get(new_socket_type)
+            # execution and data links are indexed separately
+            for edge in self.socketEdges: self.node.scene.graph.updateEdge(edge)
+            self.node.markCodeDirty()
+            return True
+        return False
+
+    def setValue(self, value):
+        """
+        Set the literal value used when this input is not connected
+
+        :param value: ``float``, ``int``, ``bool`` or ``str`` according to the socket type
+        """
+        self.value = value
+        self.node.markCodeDirty()
+
+    def determineMultiEdges(self, data: dict) -> bool:
+        """
+        Deserialization helper function. In our tutorials we created a new version of graph data format.
+        This function is here to help solve the issue of opening older files in the newer format.
+        If the 'multi_edges' param is missing in the dictionary, we determine if this `Socket`
+        should support multiple `Edges`.
+
+        :param data: `Socket` data in ``dict`` format for deserialization
+        :type data: ``dict``
+        :return: ``True`` if this `Socket` should support multi_edges
+        """
+        if 'multi_edges' in data:
+            return data['multi_edges']
+        else:
+            # probably older version of file, make RIGHT socket multi edged by default
+            return data['position'] in OLD_MULTI_EDGED_POSITIONS
+
+    def serialize(self) -> OrderedDict:
+        return OrderedDict([
+            ('id', self.id),
+            ('index', self.index),
+            ('multi_edges', self.is_multi_edges),
+            ('position', self.position),
+            ('socket_type', self.socket_type),
+        ] + ([('value', self.value)] if self.is_input and self.value is not None else []))
+
+    def deserialize(self, data: dict, hashmap: dict = {}, restore_id: bool = True) -> bool:
+        if restore_id: self.id = data['id']
+        self.is_multi_edges = self.determineMultiEdges(data)
+        self.changeSocketType(data['socket_type'])
+        # files saved before the literal values were stored keep the defaults
+        self.value = data.get('value', SOCKET_DEFAULT_VALUES.get(self.socket_type))
+        hashmap[data['id']] = self
+        return True
+
+
+class EdgeModel(Serializable):
+    """Class representing an `Edge` between two :class:`SocketModel`"""
+    __slots__ = ('id', '_start_socket', '_end_socket', '_edge_type')
+
+    def __init__(self, start_socket: SocketModel = None, end_socket: SocketModel = None, edge_type: int = 1):
+        """
+        :param start_socket: Reference to the starting socket
+        :type start_socket: :class:`SocketModel`
+        :param end_socket: Reference to the End socket or ``None``
+        :type end_socket: :class:`SocketModel` or ``None``
+        :param edge_type: Constant determining type of edge. See :ref:`edge-type-constants`
+        """
+        super().__init__()
+        self._start_socket = None
+        self._end_socket = None
+
+        self.start_socket = start_socket
+        self.end_socket = end_socket
+        self._edge_type = edge_type
+
+    @property
+    def start_socket(self):
+        """
+        Start socket
+
+        :getter: Returns start `Socket`
+        :setter: Sets start `Socket` safely, moving this `Edge` from the previous one
+        :type: :class:`SocketModel`
+        """
+        return self._start_socket
+
+    @start_socket.setter
+    def start_socket(self, value):
+        old_socket = self._start_socket
+        # if we were assigned to some socket before, delete us from the socket
+        if self._start_socket is not None:
+            self._start_socket.removeEdge(self)
+
+        # assign new start socket
+        self._start_socket = value
+        # addEdge to the Socket class
+        if self.start_socket is not None:
+            self.start_socket.addEdge(self)
+        self.updateGraphIndex(old_socket, value)
+
+    @property
+    def end_socket(self):
+        """
+        End socket
+
+        :getter: Returns end `Socket` or ``None`` if not set
+        :setter: Sets end `Socket` safely, moving this `Edge` from the previous one
+        :type: :class:`SocketModel` or ``None``
+        """
+        return self._end_socket
+
+    @end_socket.setter
+    def end_socket(self, value):
+        old_socket = self._end_socket
+        # if we were assigned to some socket before, delete us from the socket
+        if self._end_socket is not None:
+            self._end_socket.removeEdge(self)
+
+        # assign new end socket
+        self._end_socket = value
+        # addEdge to the Socket class
+        if self.end_socket is not None:
+            self.end_socket.addEdge(self)
+        self.updateGraphIndex(old_socket, value)
+
+    @property
+    def edge_type(self):
+        """
+        Edge type
+
+        :getter: get edge type constant for current ``Edge``. See :ref:`edge-type-constants`
+        :setter: sets new edge type
+        """
+        return self._edge_type
+
+    @edge_type.setter
+    def edge_type(self, value):
+        self._edge_type = value
+
+    def updateGraphIndex(self, *sockets):
+        """Update the link of this `Edge` in the :class:`~nodeeditor.node_graph_index.GraphIndex` of the scenes
+        of `sockets`"""
+        updated = None
+        for socket in sockets:
+            if socket is None: continue
+            graph = socket.node.scene.graph
+            if graph is not updated:
+                graph.updateEdge(self)
+                updated = graph
+
+    def getOtherSocket(self, known_socket: SocketModel) -> SocketModel:
+        """Return the opposite socket on this `Edge`"""
+        return self.start_socket if known_socket == self.end_socket else self.end_socket
+
+    def detach(self):
+        """Disconnect this `Edge` from both its `Sockets`, its link leaves the
+        :class:`~nodeeditor.node_graph_index.GraphIndex`"""
+        self.end_socket = None
+        self.start_socket = None
+
+    def reconnect(self, from_socket: SocketModel, to_socket: SocketModel):
+        """Helper function which reconnects edge `from_socket` to `to_socket`"""
+        if self.start_socket == from_socket:
+            self.start_socket = to_socket
+        elif self.end_socket == from_socket:
+            self.end_socket = to_socket
+
+    def serialize(self) -> OrderedDict:
+        return OrderedDict([
+            ('id', self.id),
+            ('edge_type', self.edge_type),
+            ('start', self.start_socket.id if self.start_socket is not None else None),
+            ('end', self.end_socket.id if self.end_socket is not None else None),
+        ])
+
+    def deserialize(self, data: dict, hashmap: dict = {}, restore_id: bool = True) -> bool:
+        if restore_id: self.id = data['id']
+        self.start_socket = hashmap[data['start']]
+        self.end_socket = hashmap[data['end']]
+        self.edge_type = data['edge_type']
+        return True
+
+
+class NodeModel(Serializable):
+    """Class representing a `Node` in a :class:`SceneModel`. It offers the part of the
+    :class:`~nodeeditor.node_node.Node` API used by ``getNodeCode``, so code functions of registered `Node`
+    classes can be called with it"""
+    __slots__ = ('id', 'scene', 'code_function', 'data', '_title', '_pos_x', '_pos_y', 'isVar', 'isEvent',
+                 'isSetter', 'showCode', 'nodeColor', 'inputs', 'outputs',
+                 '_code_version', '_code_cache', '_code_cache_version')
+
+    def __init__(self, scene: 'SceneModel', code_function: 'function' = None):
+        """
+        :param scene: reference to the :class:`SceneModel`
+        :type scene: :class:`SceneModel`
+        :param code_function: function generating the code, called with this node as ``self``. Usually
+            ``getNodeCode``, ``getterCode`` or ``setterCode`` of a registered `Node` class
+        :type code_function: ``function``
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`SceneModel`
+        - **data** - serialized data this node has been loaded from or ``None``
+        - **inputs** - list of input :class:`SocketModel`
+        - **outputs** - list of output :class:`SocketModel`
+        """
+        super().__init__()
+        self.scene = scene
+        self.code_function = code_function
+        self.data = None
+
+        self._title = "Undefined Node"
+        self._pos_x = 0.0
+        self._pos_y = 0.0
+
+        self.isVar = False
+        self.isEvent = False
+        self.isSetter = None
+        self.showCode = True
+        self.nodeColor = None
+        self.inputs = []
+        self.outputs = []
+
+        # generated code cache, see getCachedNodeCode
+        self._code_version = 0
+        self._code_cache = None
+        self._code_cache_version = -1
+
+    def __str__(self):
+        return "<%s:NodeModel %d>" % (self.name, self.id)
+
+    @property
+    def node_type(self):
+        """Type of the registered `Node` class, read from the serialized data. Registered `Node` classes
+        override it with a class attribute"""
+        return self.data.get('node_type') if self.data else None
+
+    @property
+    def name(self):
+        """
+        Title of the node
+
+        :type: ``str``
+        """
+        return self._title
+
+    @name.setter
+    def name(self, value):
+        self._title = value
+        self.markCodeDirty()
+
+    @property
+    def pos_x(self) -> float:
+        """X position in the scene"""
+        return self._pos_x
+
+    @property
+    def pos_y(self) -> float:
+        """Y position in the scene"""
+        return self._pos_y
+
+    def setPos(self, x: float, y: float):
+        """
+        Sets position of the node
+
+        :param x: X `Scene` position
+        :param y: Y `Scene` position
+        """
+        self._pos_x = x
+        self._pos_y = y
+
+    def isSelected(self) -> bool:
+        return False
+
+    def getNodeCode(self):
+        if self.code_function is None: return None
+        return self.code_function(self)
+
+    def getChildrenNodes(self) -> list:
+        """
+        Retreive all first-level children connected to this `Node` `Outputs`
+
+        :return: list of `Nodes` connected to this `Node` from all `Outputs`, each once
+        :rtype: ``list``
+        """
+        return self.scene.graph.successors(self)
+
+    def getCodeConsumers(self) -> list:
+        """
+        Retrieve all `Nodes` which embed the code of this `Node` into their own code. These are the `Nodes`
+        connected to our data outputs (they read our value). `Nodes` executed before us only keep a
+        :class:`~nodeeditor.node_code.Flow` to us, so they do not need to be regenerated
+
+        :return: list of `Nodes` consuming the code of this `Node`
+        :rtype: ``list``
+        """
+        return self.scene.graph.successors(self, LINK_DATA)
+
+    def markCodeDirty(self):
+        """Bump the code version of this `Node` and of all `Nodes` consuming its code, so the cached code
+        gets regenerated on the next :py:meth:`getCachedNodeCode` call. `Nodes` which are already dirty are
+        skipped, because their consumers have been marked when they became dirty"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node._code_version += 1
+            for consumer in node.getCodeConsumers():
+                if consumer._code_cache_version == consumer._code_version:
+                    stack.append(consumer)
+
+    def getCachedNodeCode(self):
+        """
+        Return the code of this `Node`, calling :py:meth:`getNodeCode` only if the `Node` has changed
+        since the last call
+
+        :return: generated code of this `Node`
+        """
+        if self._code_cache_version != self._code_version:
+            version = self._code_version
+            self._code_cache = self.getNodeCode()
+            self._code_cache_version = version
+        return self._code_cache
+
+    def NodeCodeAtInput(self, index: int = 0):
+        """
+        Get the code expression of the `Node` connected to the Input specified by `index`, or the literal value
+        of the Input when nothing is connected
+
+        :param index: Order number of the `Input Socket`
+        :type index: ``int``
+        :return: expression from :mod:`~nodeeditor.node_code`
+        """
+        if not self.inputs or index > len(self.inputs)-1:
+            print("Trying to call from Node Input socket while Node has no input socket")
+            return None
+
+        input_socket = self.inputs[index]
+        if len(input_socket.socketEdges) == 0: return literalCode(self.getSocketWdgValue(input_socket))
+        connecting_edge = input_socket.socketEdges[0]
+        other_socket = connecting_edge.getOtherSocket(self.inputs[index])
+        if other_socket is None: return literalCode(self.getSocketWdgValue(input_socket))
+        return other_socket.node.getCachedNodeCode()
+
+    def NodeCodeAtOutput(self, index: int = 0) -> list:
+        """
+        Get the code executed after this `Node` from the output specified by `index`. The code of the connected
+        `Node` is not embedded, a :class:`~nodeeditor.node_code.Flow` is resolved by the emitter instead
+
+        :param index: Order number of the `Output Socket`
+        :type index: ``int``
+        :return: ``list`` with a :class:`~nodeeditor.node_code.Flow` statement. Empty if there is no connection or
+            the index is out of range
+        :rtype: ``list``
+        """
+        try:
+            socket = self.outputs[index]
+            return [Flow(socket, self)] if socket.socketEdges else []
+        except IndexError:
+            return []
+
+    def getSocketWdgValue(self, input_socket: SocketModel):
+        """Return the literal value of the `input_socket`"""
+        return input_socket.value
+
+    def getConnectedInputNode(self, index: int = 0):
+        input_socket = self.inputs[index]
+        if len(input_socket.socketEdges) == 0: return None
+        connecting_edge = input_socket.socketEdges[0]
+        other_socket = connecting_edge.getOtherSocket(self.inputs[index])
+        return other_socket.node
+
+    def isInputConnected(self, index: int = 0):
+        if not self.inputs:
+            print("Trying to call from Node Input socket while Node has no input socket")
+            return
+
+        input_socket = self.inputs[index]
+        if len(input_socket.socketEdges) == 0:
+            return False
+        else:
+            return True
+
+    def getInputs(self, index: int = 0) -> list:
+        """
+        Get **all** `Nodes` connected to the Input specified by `index`
+
+        :param index: Order number of the `Input Socket`
+        :type index: ``int``
+        :return: all `Nodes` which are connected to the specified `Input` or ``[]`` if there is no connection
+        :rtype: ``list``
+        """
+        ins = []
+        for edge in self.inputs[index].socketEdges:
+            other_socket = edge.getOtherSocket(self.inputs[index])
+            ins.append(other_socket.node)
+        return ins
+
+    def getOutputs(self, index: int = 0) -> list:
+        """
+        Get **all** `Nodes` connected to the Output specified by `index`
+
+        :param index: Order number of the `Output Socket`
+        :type index: ``int``
+        :return: all `Nodes` which are connected to the specified `Output` or ``[]`` if there is no connection
+        :rtype: ``list``
+        """
+        outs = []
+        for edge in self.outputs[index].socketEdges:
+            other_socket = edge.getOtherSocket(self.outputs[index])
+            outs.append(other_socket.node)
+        return outs
+
+    def serialize(self) -> OrderedDict:
+        data = OrderedDict(self.data or ())
+        data.update([
+            ('id', self.id),
+            ('name', self.name),
+            ('pos_x', self.pos_x),
+            ('pos_y', self.pos_y),
+            ('inputs', [socket.serialize() for socket in self.inputs]),
+            ('outputs', [socket.serialize() for socket in self.outputs]),
+            ('is_var', self.isVar),
+            ('is_setter', self.isSetter),
+        ])
+        return data
+
+    def deserialize(self, data: dict, hashmap: dict = {}, restore_id: bool = True) -> bool:
+        if restore_id: self.id = data['id']
+        hashmap[data['id']] = self
+        self.data = data
+
+        self.name = data['name']
+        self.setPos(data['pos_x'], data['pos_y'])
+        self.isVar = data['is_var']
+        self.isSetter = data['is_setter']
+
+        for sockets, sockets_data, is_input in ((self.inputs, data['inputs'], True),
+                                                (self.outputs, data['outputs'], False)):
+            for socket_data in sortSocketsData(sockets_data):
+                socket = SocketModel(self, socket_data['index'], socket_data['position'], socket_data['socket_type'],
+                                     is_input=is_input)
+                # files saved without 'multi_edges' are handled by determineMultiEdges
+                socket.deserialize(socket_data, hashmap, restore_id)
+                sockets.append(socket)
+                self.scene.addSocket(socket)
+        self.markCodeDirty()
+        return True
+
+
+class SceneModel(Serializable):
+    """Class representing a graph loaded without Qt. It keeps the `Nodes` and `Edges` in insertion order, with
+    indexes by id"""
+
+    def __init__(self, code_function_selector: 'function' = None):
+        """
+        :param code_function_selector: function returning the code function for serialized node data, see
+            :class:`NodeModel`. Nodes produce no code if it is ``None``
+        :type code_function_selector: ``function``
+
+        :Instance Attributes:
+
+        - **nodes** - :class:`~nodeeditor.node_ordered_set.OrderedSet` of `Nodes` in the scene
+        - **edges** - :class:`~nodeeditor.node_ordered_set.OrderedSet` of `Edges` in the scene
+        - **nodes_by_id** - ``dict`` of `Nodes` in the scene by their id
+        - **edges_by_id** - ``dict`` of `Edges` in the scene by their id
+        - **sockets_by_id** - ``dict`` of `Sockets` of the `Nodes` in the scene by their id
+        - **graph** - :class:`~nodeeditor.node_graph_index.GraphIndex` of the links between the `Nodes`
+        - **user_vars** - list of serialized user variables
+        - **user_events** - list of serialized user events
+        - **scene_width** - width of the scene in pixels
+        - **scene_height** - height of the scene in pixels
+        """
+        super().__init__()
+        self.code_function_selector = code_function_selector
+        self.filename = None
+        self.scene_width = 8000
+        self.scene_height = 8000
+        self.nodes = OrderedSet()
+        self.edges = OrderedSet()
+        self.nodes_by_id = {}
+        self.edges_by_id = {}
+        self.sockets_by_id = {}
+        self.graph = GraphIndex()
+        self.user_vars = []
+        self.user_events = []
+
+    def getNodeByID(self, node_type: int):
+        """
+        Find node in the scene according to provided `node_type`
+
+        :param node_type: ID of the node we are looking for
+        :type node_type: ``int``
+        :return: Found ``Node`` or ``None``
+        """
+        return self.nodes_by_id.get(node_type)
+
+    def getEdgeByID(self, edge_id: int):
+        """
+        Find edge in the scene according to provided `edge_id`
+
+        :param edge_id: ID of the edge we are looking for
+        :type edge_id: ``int``
+        :return: Found ``Edge`` or ``None``
+        """
+        return self.edges_by_id.get(edge_id)
+
+    def getSocketByID(self, socket_id: int):
+        """
+        Find socket of a node in the scene according to provided `socket_id`
+
+        :param socket_id: ID of the socket we are looking for
+        :type socket_id: ``int``
+        :return: Found ``Socket`` or ``None``
+        """
+        return self.sockets_by_id.get(socket_id)
+
+    def addNode(self, node: NodeModel):
+        """Add `Node` to this `Scene`
+
+        :param node: `Node` to be added to this `Scene`
+        :type node: :class:`NodeModel`
+        """
+        self.nodes.append(node)
+        self._register(self.nodes_by_id, node)
+        self.graph.addNode(node)
+
+    def addEdge(self, edge: EdgeModel):
+        """Add `Edge` to this `Scene`
+
+        :param edge: `Edge` to be added to this `Scene`
+        :type edge: :class:`EdgeModel`
+        """
+        self.edges.append(edge)
+        self._register(self.edges_by_id, edge)
+
+    def addSocket(self, socket: SocketModel):
+        """Register `Socket` of a `Node` in this `Scene`
+
+        :param socket: `Socket` to be registered
+        :type socket: :class:`SocketModel`
+        """
+        self._register(self.sockets_by_id, socket)
+
+    def removeSocket(self, socket: SocketModel):
+        """Unregister `Socket` of a `Node` from this `Scene`
+
+        :param socket: `Socket` to be unregistered
+        :type socket: :class:`SocketModel`
+        """
+        self._unindex(self.sockets_by_id, socket)
+
+    def _unindex(self, index: dict, item: Serializable):
+        # only drop the entry if it still points to this item, another one may have taken over the id
+        if index.get(item.id) is item: del index[item.id]
+
+    def _register(self, index: dict, item: Serializable):
+        # an id restored from data can be out of range or held by another live item (e.g. duplicated in a
+        # hand-edited file), the item is then remapped to a new id. References inside the loaded data are
+        # resolved through the hashmap keyed by the serialized ids, so they are not affected
+        if not reserveID(item.id) or index.get(item.id, item) is not item:
+            if DEBUG: print("MODEL: id", item.id, "of", item, "collides, remapping")
+            item.id = newID()
+        index[item.id] = item
+
+    def _reindex(self, index: dict, item: Serializable, new_id: int):
+        if item.id == new_id: return
+        self._unindex(index, item)
+        item.id = new_id
+        self._register(index, item)
+
+    def changeNodeID(self, node: NodeModel, new_id: int):
+        """Change the id of the `Node` and keep it findable by :py:meth:`getNodeByID`
+
+        :param node: `Node` in this `Scene`
+        :type node: :class:`NodeModel`
+        :param new_id: new id of the `node`
+        :type new_id: ``int``
+        """
+        self._reindex(self.nodes_by_id, node, new_id)
+
+    def changeEdgeID(self, edge: EdgeModel, new_id: int):
+        """Change the id of the `Edge` and keep it findable by :py:meth:`getEdgeByID`
+
+        :param edge: `Edge` in this `Scene`
+        :type edge: :class:`EdgeModel`
+        :param new_id: new id of the `edge`
+        :type new_id: ``int``
+        """
+        self._reindex(self.edges_by_id, edge, new_id)
+
+    def changeSocketID(self, socket: SocketModel, new_id: int):
+        """Change the id of the `Socket` and keep it findable by :py:meth:`getSocketByID`
+
+        :param socket: `Socket` of a `Node` in this `Scene`
+        :type socket: :class:`SocketModel`
+        :param new_id: new id of the `socket`
+        :type new_id: ``int``
+        """
+        self._reindex(self.sockets_by_id, socket, new_id)
+
+    def removeNode(self, node: NodeModel):
+        """Remove `Node` from this `Scene`
+
+        :param node: `Node` to be removed from this `Scene`
+        :type node: :class:`NodeModel`
+        """
+        if node in self.nodes:
+            self.nodes.remove(node)
+            self._unindex(self.nodes_by_id, node)
+            for socket in (node.inputs + node.outputs): self.removeSocket(socket)
+            self.graph.removeNode(node)
+        else:
+            if DEBUG_REMOVE_WARNINGS: print("!W:", "Scene::removeNode", "wanna remove nodeeditor", node,
+                                            "from self.nodes but it's not in the list!")
+
+    def removeEdge(self, edge: EdgeModel):
+        """Remove `Edge` from this `Scene`, disconnecting it from its `Sockets`
+
+        :param edge: `Edge` to be remove from this `Scene`
+        :type edge: :class:`EdgeModel`
+        """
+        if edge in self.edges:
+            edge.detach()
+            self.edges.remove(edge)
+            self._unindex(self.edges_by_id, edge)
+        else:
+            if DEBUG_REMOVE_WARNINGS: print("!W:", "Scene::removeEdge", "wanna remove edge", edge,
+                                            "from self.edges but it's not in the list!")
+
+    def loadFromFile(self, filename: str):
+        """
+        Load the graph from a file on disk
+
+        :param filename: from what file to load the graph
+        :type filename: ``str``
+        :raises: :class:`InvalidFile` if there was an error decoding the JSON or binary file
+        """
+        with open(filename, "rb") as file:
+            try:
+                data = loadSceneData(file)
+            except ValueError:
+                raise InvalidFile("%s is not a valid scene file" % os.path.basename(filename))
+        self.filename = filename
+        self.deserialize(data)
+
+    def getCodeRoots(self) -> list:
+        """Return the code blocks of all nodes starting a piece of the program, in the scene order
+
+        :return: ``list`` of (`Node`, block) pairs
+        :rtype: ``list``
+        """
+        return codeRoots(self.nodes)
+
+    def serialize(self) -> OrderedDict:
+        return OrderedDict([
+            ('id', self.id),
+            ('scene_width', self.scene_width),
+            ('scene_height', self.scene_height),
+            ('user_vars', self.user_vars),
+            ('user_events', self.user_events),
+            ('nodes', [node.serialize() for node in self.nodes]),
+            ('edges', [edge.serialize() for edge in self.edges]),
+        ])
+
+    def deserialize(self, data: dict, hashmap: dict = {}, restore_id: bool = True) -> bool:
+        hashmap = {}
+        if restore_id and reserveID(data['id']): self.id = data['id']
+        self.scene_width = data.get('scene_width', self.scene_width)
+        self.scene_height = data.get('scene_height', self.scene_height)
+        self.user_vars = list(data.get('user_vars', []))
+        self.user_events = list(data.get('user_events', []))
+
+        for node in self.nodes.copy(): self.removeNode(node)
+        for node_data in data['nodes']:
+            code_function = None
+            if self.code_function_selector is not None: code_function = self.code_function_selector(node_data)
+            node = NodeModel(self, code_function)
+            node.deserialize(node_data, hashmap, restore_id)
+            self.addNode(node)
+
+        for edge in self.edges.copy(): self.removeEdge(edge)
+        for edge_data in data['edges']:
+            edge = EdgeModel()
+            edge.deserialize(edge_data, hashmap, restore_id)
+            self.addEdge(edge)
+
+        if DEBUG: print("MODEL: loaded", len(self.nodes), "nodes and", len(self.edges), "edges")
+        return True
@@ -10,6 +10,7 @@ from PyQt5.QtWidgets import *
 from nodeeditor.node_graphics_node import QDMGraphicsNode
 from PyQt5.QtGui import QColor
 from nodeeditor.node_content_widget import QDMNodeContentWidget
+from nodeeditor.node_model import NodeModel, socketDataKey, sortSocketsData
 from nodeeditor.node_serializable import Serializable
 from nodeeditor.node_socket import Socket, LEFT_BOTTOM, LEFT_CENTER, LEFT_TOP, RIGHT_BOTTOM, RIGHT_CENTER, RIGHT_TOP
 from nodeeditor.utils import dumpException, pp
@@ -17,7 +18,7 @@ from nodeeditor.utils import dumpException, pp
 DEBUG = False
 
 
-class Node(Serializable):
+class Node(NodeModel):
     """
     Class representing `Node` in the `Scene`.
     """
@@ -44,20 +45,17 @@ class Node(Serializable):
             - **outputs** - list containin Output :class:`~nodeeditor.node_socket.Socket` instances
 
         """
-        super().__init__()
+        super().__init__(scene)
         self._title = title
-        self.scene = scene
 
         # Additional Uni Code
-        self.isVar = False
-        self.isEvent = False
-        self.isSetter = None
-        self.showCode = True
         self.nodeID = None
 
         # just to be sure, init these variables
         self.content = None
         self.grNode = None
+        self.inputs = []
+        self.outputs = []
 
         self.initInnerClasses()
         self.initSettings()
@@ -100,6 +98,7 @@ class Node(Serializable):
     def name(self, value):
         self._title = value
         self.grNode.name = self._title
+        self.markCodeDirty()
 
     @property
     def pos(self):
@@ -111,6 +110,16 @@ class Node(Serializable):
         """
         return self.grNode.pos()  # QPointF
 
+    @property
+    def pos_x(self) -> float:
+        """X position of the Graphics Node in the Scene"""
+        return self.grNode.scenePos().x()
+
+    @property
+    def pos_y(self) -> float:
+        """Y position of the Graphics Node in the Scene"""
+        return self.grNode.scenePos().y()
+
     def setPos(self, x: float, y: float):
         """
         Sets position of the Graphics Node
@@ -170,6 +179,7 @@ class Node(Serializable):
                 # remove grSockets from scene
                 for socket in (self.inputs + self.outputs):
                     self.scene.grScene.removeItem(socket.grSocket)
+                    self.scene.removeSocket(socket)
                 self.inputs = []
                 self.outputs = []
 
@@ -199,6 +209,7 @@ class Node(Serializable):
             self.outputs.append(socket)
 
         self.grNode.AutoResizeGrNode()
+        self.markCodeDirty()
 
     def updateSockets(self):
         pass
@@ -246,10 +257,7 @@ class Node(Serializable):
 
     def hasConnectedEdge(self, edge: 'Edge'):
         """Returns ``True`` if edge is connected to any :class:`~nodeeditor.node_socket.Socket` of this `Node`"""
-        for socket in (self.inputs + self.outputs):
-            if socket.hasAnyEdge(edge):
-                return True
-        return False
+        return any(socket.isConnected(edge) for socket in (self.inputs + self.outputs))
 
     def getSocketPosition(self, index: int, position: int, num_out_of: int = 1) -> '(x, y)':
         """
@@ -322,10 +330,7 @@ class Node(Serializable):
         if DEBUG: print("> Removing Node", self)
         if DEBUG: print(" - remove all edges from sockets")
         for socket in (self.inputs + self.outputs):
-            # if socket.hasEdge():
-            for edge in socket.socketEdges.copy():
-                if DEBUG: print("    - removing from socket:", socket, "edge:", edge)
-                edge.remove()
+            socket.removeAllEdges()
         if DEBUG: print(" - remove grNode")
         self.scene.grScene.removeItem(self.grNode)
         self.grNode = None
@@ -344,61 +349,6 @@ class Node(Serializable):
     #         other_node.markDescendantsDirty(new_value)
     #
 
-    def getChildrenNodes(self) -> 'List[Node]':
-        """
-        Retreive all first-level children connected to this `Node` `Outputs`
-
-        :return: list of `Nodes` connected to this `Node` from all `Outputs`
-        :rtype: List[:class:`~nodeeditor.node_node.Node`]
-        """
-        if self.outputs == []: return []
-        other_nodes = []
-        for ix in range(len(self.outputs)):
-            for edge in self.outputs[ix].socketEdges:
-                other_node = edge.getOtherSocket(self.outputs[ix]).node
-                other_nodes.append(other_node)
-        return other_nodes
-
-    def NodeCodeAtInput(self, index: int = 0):
-        if not self.inputs or index > len(self.inputs)-1:
-            print("Trying to call from Node Input socket while Node has no input socket")
-            return None
-
-        input_socket = self.inputs[index]
-        if len(input_socket.socketEdges) == 0: return self.getSocketWdgValue(input_socket)
-        connecting_edge = input_socket.socketEdges[0]
-        other_socket = connecting_edge.getOtherSocket(self.inputs[index])
-        if other_socket is None: return self.getSocketWdgValue(input_socket)
-        return other_socket.node.getNodeCode()
-
-    def getSocketWdgValue(self, input_socket):
-        if input_socket.socket_type == 1 or input_socket.socket_type == 2:
-            return input_socket.userInputWdg.value()
-
-        elif input_socket.socket_type == 3:
-            return input_socket.userInputWdg.isChecked()
-
-        elif input_socket.socket_type == 4:
-            return input_socket.userInputWdg.text()
-
-    def getConnectedInputNode(self, index: int = 0):
-        input_socket = self.inputs[index]
-        if len(input_socket.socketEdges) == 0: return None
-        connecting_edge = input_socket.socketEdges[0]
-        other_socket = connecting_edge.getOtherSocket(self.inputs[index])
-        return other_socket.node
-
-    def isInputConnected(self, index: int = 0):
-        if not self.inputs:
-            print("Trying to call from Node Input socket while Node has no input socket")
-            return
-
-        input_socket = self.inputs[index]
-        if len(input_socket.socketEdges) == 0:
-            return False
-        else:
-            return True
-
     # def InputSocketCodeAt(self, index: int = 0):
     #     input_socket = self.inputs[index]
     #     if len(input_socket.socketEdges) == 0: return ""
@@ -514,62 +464,6 @@ class Node(Serializable):
             dumpException(e)
             return None
 
-    def NodeCodeAtOutput(self, index: int = 0):
-        """
-        Get the **first**  `Node` connected to the output specified by `index` and the connection `Socket`
-
-        :param index: Order number of the `Input Socket`
-        :type index: ``int``
-        :return: Tuple containing :class:`~nodeeditor.node_node.Node` and :class:`~nodeeditor.node_socket.Socket` which
-            is connected to the specified `Input` or ``None`` if there is no connection or the index is out of range
-        :rtype: (:class:`~nodeeditor.node_node.Node`, int)
-        """
-        try:
-            edge = self.outputs[index].socketEdges[0]
-            socket = edge.getOtherSocket(self.outputs[index])
-            if socket is None:
-                return ""
-            else:
-                return socket.node.getNodeCode()
-        except IndexError:
-            # print("EXC: Trying to get input with socket index %d, but none is attached to" % index, self)
-            return ""
-        except Exception as e:
-            dumpException(e)
-            return ""
-
-    def getInputs(self, index: int = 0) -> 'List[Node]':
-        """
-        Get **all** `Nodes` connected to the Input specified by `index`
-
-        :param index: Order number of the `Input Socket`
-        :type index: ``int``
-        :return: all :class:`~nodeeditor.node_node.Node` instances which are connected to the
-            specified `Input` or ``[]`` if there is no connection or the index is out of range
-        :rtype: List[:class:`~nodeeditor.node_node.Node`]
-        """
-        ins = []
-        for edge in self.inputs[index].socketEdges:
-            other_socket = edge.getOtherSocket(self.inputs[index])
-            ins.append(other_socket.node)
-        return ins
-
-    def getOutputs(self, index: int = 0) -> 'List[Node]':
-        """
-        Get **all** `Nodes` connected to the Output specified by `index`
-
-        :param index: Order number of the `Output Socket`
-        :type index: ``int``
-        :return: all :class:`~nodeeditor.node_node.Node` instances which are connected to the
-            specified `Output` or ``[]`` if there is no connection or the index is out of range
-        :rtype: List[:class:`~nodeeditor.node_node.Node`]
-        """
-        outs = []
-        for edge in self.outputs[index].socketEdges:
-            other_socket = edge.getOtherSocket(self.outputs[index])
-            outs.append(other_socket.node)
-        return outs
-
     # serialization functions
 
     def serialize(self) -> OrderedDict:
@@ -580,8 +474,8 @@ class Node(Serializable):
         return OrderedDict([
             ('id', self.id),
             ('name', self.name),
-            ('pos_x', self.grNode.scenePos().x()),
-            ('pos_y', self.grNode.scenePos().y()),
+            ('pos_x', self.pos_x),
+            ('pos_y', self.pos_y),
             ('inputs', inputs),
             ('outputs', outputs),
             ('is_var', self.isVar),
@@ -591,7 +485,7 @@ class Node(Serializable):
 
     def deserialize(self, data: dict, hashmap: dict = {}, restore_id: bool = True, *args, **kwargs) -> bool:
         try:
-            if restore_id: self.id = data['id']
+            if restore_id: self.scene.changeNodeID(self, data['id'])
             hashmap[data['id']] = self
 
             self.setPos(data['pos_x'], data['pos_y'])
@@ -599,55 +493,29 @@ class Node(Serializable):
             self.grNode.name = self.name
 
 
-            data['inputs'].sort(key=lambda socket: socket['index'] + socket['position'] * 10000)
-            data['outputs'].sort(key=lambda socket: socket['index'] + socket['position'] * 10000)
-            num_inputs = len(data['inputs'])
-            num_outputs = len(data['outputs'])
-
-            # print("> deserialize node,   num inputs:", num_inputs, "num outputs:", num_outputs)
-            # pp(data)
-
-            # possible way to do it is reuse existing sockets...
-            # dont create new ones if not necessary
-
-            for socket_data in data['inputs']:
-                found = None
-                for socket in self.inputs:
-                    # print("\t", socket, socket.index, "=?", socket_data['index'])
-                    if socket.index == socket_data['index']:
-                        found = socket
-                        break
-                if found is None:
-                    # print("deserialization of socket data has not found input socket with index:", socket_data['index'])
-                    # print("actual socket data:", socket_data)
-                    # we can create new socket for this
-                    found = self.__class__.Socket_class(
-                        node=self, index=socket_data['index'], position=socket_data['position'],
-                        socket_type=socket_data['socket_type'], count_on_this_node_side=num_inputs,
-                        is_input=True
-                    )
-                    self.inputs.append(found)  # append newly created input to the list
-                found.deserialize(socket_data, hashmap, restore_id)
-
-            for socket_data in data['outputs']:
-                found = None
-                for socket in self.outputs:
-                    # print("\t", socket, socket.index, "=?", socket_data['index'])
-                    if socket.index == socket_data['index']:
-                        found = socket
-                        break
-                if found is None:
-                    # print("deserialization of socket data has not found output socket with index:", socket_data['index'])
-                    # print("actual socket data:", socket_data)
-                    # we can create new socket for this
-                    found = self.__class__.Socket_class(
-                        node=self, index=socket_data['index'], position=socket_data['position'],
-                        socket_type=socket_data['socket_type'], count_on_this_node_side=num_outputs,
-                        is_input=False
-                    )
-                    self.outputs.append(found)  # append newly created output to the list
-                found.deserialize(socket_data, hashmap, restore_id)
-
+            # reuse the existing sockets, matched by (position, index) or by index alone if the position changed.
+            # Sockets missing on this node are created
+            for sockets, sockets_data, is_input in ((self.inputs, sortSocketsData(data['inputs']), True),
+                                                    (self.outputs, sortSocketsData(data['outputs']), False)):
+                by_key = {}
+                by_index = {}
+                for socket in sockets:
+                    by_key.setdefault((socket.position, socket.index), socket)
+                    by_index.setdefault(socket.index, socket)
+
+                for socket_data in sockets_data:
+                    found = by_key.get(socketDataKey(socket_data))
+                    if found is None: found = by_index.get(socket_data['index'])
+                    if found is None:
+                        found = self.__class__.Socket_class(
+                            node=self, index=socket_data['index'], position=socket_data['position'],
+                            socket_type=socket_data['socket_type'], count_on_this_node_side=len(sockets_data),
+                            is_input=is_input
+                        )
+                        sockets.append(found)  # append newly created socket to the list
+                        by_key[socketDataKey(socket_data)] = found
+                        by_index.setdefault(found.index, found)
+                    found.deserialize(socket_data, hashmap, restore_id)
 
             self.isVar = data['is_var']
             self.isSetter = data['is_setter']
@@ -661,7 +529,7 @@ class Node(Serializable):
                     self.getNodeCode = self.getterCode
                     self.grNode.AutoResizeGrNode()
 
-
+            self.markCodeDirty()
 
         except Exception as e:
             dumpException(e)
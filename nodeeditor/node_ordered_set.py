@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the insertion-ordered container used for the `Nodes` and `Edges` of a
+:class:`~nodeeditor.node_scene.NodeScene`
+"""
+
+
+class OrderedSet():
+    """Container keeping items in insertion order, with O(1) :py:meth:`append`, :py:meth:`remove` and membership
+    test. It offers the read API of a ``list`` (iteration, ``len``, ``in``, indexing, :py:meth:`index`,
+    :py:meth:`copy`), so code written for the former lists keeps working. Positional access is O(n).
+
+    Items are compared by identity, each item is stored only once."""
+    __slots__ = ('_items',)
+
+    def __init__(self, items: 'iterable' = ()):
+        # dict keeps insertion order, values are unused
+        self._items = dict.fromkeys(items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return len(self._items) > 0
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __reversed__(self):
+        return reversed(self._items)
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __getitem__(self, index):
+        if isinstance(index, slice): return list(self._items)[index]
+        if index < 0: index += len(self._items)
+        if not 0 <= index < len(self._items): raise IndexError("OrderedSet index out of range")
+        for position, item in enumerate(self._items):
+            if position == index: return item
+
+    def __eq__(self, other):
+        if isinstance(other, OrderedSet): other = list(other)
+        return list(self._items) == other
+
+    def __repr__(self):
+        return "OrderedSet(%r)" % list(self._items)
+
+    def append(self, item):
+        """Add `item` at the end, if it is not in the container yet"""
+        self._items[item] = None
+
+    def remove(self, item):
+        """Remove `item`
+
+        :raises: ``ValueError`` if `item` is not in the container
+        """
+        try:
+            del self._items[item]
+        except KeyError:
+            raise ValueError("%s is not in OrderedSet" % item)
+
+    def discard(self, item):
+        """Remove `item` if it is in the container"""
+        self._items.pop(item, None)
+
+    def clear(self):
+        self._items.clear()
+
+    def index(self, item) -> int:
+        """Return position of `item` in the insertion order
+
+        :raises: ``ValueError`` if `item` is not in the container
+        """
+        if item in self._items:
+            for position, other in enumerate(self._items):
+                if other is item: return position
+        raise ValueError("%s is not in OrderedSet" % item)
+
+    def swap(self, first: int, second: int):
+        """Exchange the items at positions `first` and `second`"""
+        items = list(self._items)
+        items[first], items[second] = items[second], items[first]
+        self._items = dict.fromkeys(items)
+
+    def copy(self) -> list:
+        """Return the items as a new ``list``, safe to iterate while removing items from this container"""
+        return list(self._items)
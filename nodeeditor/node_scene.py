@@ -8,42 +8,35 @@ from collections import OrderedDict
 
 from nodeeditor.node_graphics_node import QDMGraphicsNode
 from nodeeditor.utils import dumpException, pp
-from nodeeditor.node_serializable import Serializable
 from nodeeditor.node_graphics_scene import NodeGraphicsScene
 from nodeeditor.node_node import Node
 from nodeeditor.node_edge import Edge
+from nodeeditor.node_model import SceneModel, InvalidFile
+from nodeeditor.node_serializable import reserveID
+from nodeeditor.node_scene_binary import dumpSceneData, loadSceneData
+from nodeeditor.node_scene_saver import writeFileAtomically
 from nodeeditor.node_scene_history import SceneHistory
 from nodeeditor.node_scene_clipboard import SceneClipboard
+from nodeeditor.node_scene_transaction import SceneTransaction, TRANSACTION_REPAINT, TRANSACTION_MODIFIED, \
+    TRANSACTION_SELECTION
 
 DEBUG_REMOVE_WARNINGS = False
 
 
-class InvalidFile(Exception): pass
-
-
-class NodeScene(Serializable):
-    """Class representing NodeEditor's `Scene`"""
+class NodeScene(SceneModel):
+    """Class representing NodeEditor's `Scene`. The `Nodes`, `Edges` and their indexes are kept by
+    :class:`~nodeeditor.node_model.SceneModel`"""
     def __init__(self):
         """
         :Instance Attributes:
 
-            - **nodes** - list of `Nodes` in this `Scene`
-            - **edges** - list of `Edges` in this `Scene`
+            - **nodes**, **edges**, **nodes_by_id**... - see :class:`~nodeeditor.node_model.SceneModel`
             - **history** - Instance of :class:`~nodeeditor.node_scene_history.SceneHistory`
             - **clipboard** - Instance of :class:`~nodeeditor.node_scene_clipboard.SceneClipboard`
-            - **scene_width** - width of this `Scene` in pixels
-            - **scene_height** - height of this `Scene` in pixels
         """
         super().__init__()
         self.VEListWdg = None
-        self.nodes = []
-        self.edges = []
         self.masterRef = None
-        # current filename assigned to this scene
-        self.filename = None
-
-        self.scene_width = 8000
-        self.scene_height = 8000
 
         # custom flag used to suppress triggering onItemSelected which does a bunch of stuff
         self._silent_selection_events = False
@@ -51,6 +44,9 @@ class NodeScene(Serializable):
         self._has_been_modified = False
         self._last_selected_items = None
 
+        # open transactions, the outermost first
+        self._transactions = []
+
         # initialize all listeners
         self._has_been_modified_listeners = []
         self._item_selected_listeners = []
@@ -85,30 +81,58 @@ class NodeScene(Serializable):
         if not self._has_been_modified and value:
             # set it now, because we will be reading it soon
             self._has_been_modified = value
+            if self.deferInTransaction(TRANSACTION_MODIFIED): return
 
             # call all registered listeners
             for callback in self._has_been_modified_listeners: callback()
 
         self._has_been_modified = value
 
-    def initUI(self):
-        """Set up Graphics Scene Instance"""
-        self.grScene = NodeGraphicsScene(self)
-        self.grScene.setGrScene(self.scene_width, self.scene_height)
+    def transaction(self, name: str) -> SceneTransaction:
+        """
+        Group modifications into one step. Selection events, `Has Been Modified` callbacks, History Stamps,
+        code regeneration and repaints of the whole scene are run once when the outermost transaction commits.
+        On exception the `Scene` is restored
 
-    def getNodeByID(self, node_type: int):
+        :param name: description of the History Stamp stored on commit
+        :type name: ``str``
+        :return: context manager for the ``with`` statement
+        :rtype: :class:`~nodeeditor.node_scene_transaction.SceneTransaction`
+        :raises: :class:`~nodeeditor.node_scene_transaction.TransactionAborted` when the outermost transaction ends
+            after a nested one has been left by an exception
         """
-        Find node in the scene according to provided `node_type`
+        return SceneTransaction(self, name)
 
-        :param node_type: ID of the node we are looking for
-        :type node_type: ``int``
-        :return: Found ``Node`` or ``None``
+    def isInTransaction(self) -> bool:
+        """Is a transaction open?
+
+        :rtype: ``bool``
         """
-        for node in self.nodes:
-            if node.id == node_type:
-                return node
-        return None
+        return len(self._transactions) > 0
+
+    def deferInTransaction(self, effect: int) -> bool:
+        """
+        Defer a side effect until the outermost transaction commits
+
+        :param effect: one of the `TRANSACTION_*` constants of :mod:`~nodeeditor.node_scene_transaction`
+        :type effect: ``int``
+        :return: ``True`` if the effect has been deferred, ``False`` if no transaction is open and the caller
+            should run it now
+        :rtype: ``bool``
+        """
+        if not self._transactions: return False
+        self._transactions[0].defer(effect)
+        return True
 
+    def requestRepaint(self):
+        """Repaint the whole graphics scene, once at the end of a transaction"""
+        if self.deferInTransaction(TRANSACTION_REPAINT): return
+        self.grScene.update()
+
+    def initUI(self):
+        """Set up Graphics Scene Instance"""
+        self.grScene = NodeGraphicsScene(self)
+        self.grScene.setGrScene(self.scene_width, self.scene_height)
 
     def setSilentSelectionEvents(self, value: bool=True):
         """Calling this can suppress onItemSelected events to be triggered. This is useful when working with clipboard"""
@@ -122,6 +146,7 @@ class NodeScene(Serializable):
         :type silent: ``bool``
         """
         if self._silent_selection_events: return
+        if self.deferInTransaction(TRANSACTION_SELECTION): return
 
         selected_items = self.getSelectedItems()
         if selected_items != self._last_selected_items:
@@ -133,7 +158,7 @@ class NodeScene(Serializable):
                 # and store history as a last step always
                 self.history.storeHistory("Selection Changed")
 
-        self.NodeEditor.UpdateTextCode()
+        self.NodeEditor.updateCodeSelection()
         self.VEListWdg.findListItem(self.getSelectedNodes())
 
     def getSelectedNodes(self):
@@ -155,6 +180,7 @@ class NodeScene(Serializable):
         # somehow this event is being triggered when we start dragging file outside of our application
         # or we just loose focus on our app? -- which does not mean we've deselected item in the scene!
         # double check if the selection has actually changed, since
+        if self.deferInTransaction(TRANSACTION_SELECTION): return
         current_selected_items = self.getSelectedItems()
         if current_selected_items == self._last_selected_items:
             # print("Qt itemsDeselected Invalid Event! Ignoring")
@@ -166,7 +192,22 @@ class NodeScene(Serializable):
             if not silent:
                 self.history.storeHistory("Deselected Everything")
                 for callback in self._items_deselected_listeners: callback()
-        self.NodeEditor.UpdateTextCode()
+        self.NodeEditor.updateCodeSelection()
+
+    def onSelectionChanged(self):
+        """Trigger `Item Selected` or `Items Deselected` event once for all selection changes made during
+        a transaction. No History Stamp is stored, the transaction stores its own"""
+        selected_items = self.getSelectedItems()
+        if selected_items != self._last_selected_items:
+            self._last_selected_items = selected_items
+            if selected_items:
+                for callback in self._item_selected_listeners: callback()
+            else:
+                self.resetLastSelectedStates()
+                for callback in self._items_deselected_listeners: callback()
+
+        self.NodeEditor.updateCodeSelection()
+        if self.VEListWdg is not None: self.VEListWdg.findListItem(self.getSelectedNodes())
 
     def isModified(self) -> bool:
         """Is this `Scene` dirty aka `has been modified` ?
@@ -264,66 +305,32 @@ class NodeScene(Serializable):
         """
         return self.getView().itemAt(pos)
 
-    def addNode(self, node: Node):
-        """Add :class:`~nodeeditor.node_node.Node` to this `Scene`
-
-        :param node: :class:`~nodeeditor.node_node.Node` to be added to this `Scene`
-        :type node: :class:`~nodeeditor.node_node.Node`
-        """
-        self.nodes.append(node)
-
-    def addEdge(self, edge: Edge):
-        """Add :class:`~nodeeditor.node_edge.Edge` to this `Scene`
-
-        :param edge: :class:`~nodeeditor.node_edge.Edge` to be added to this `Scene`
-        :return: :class:`~nodeeditor.node_edge.Edge`
-        """
-        self.edges.append(edge)
-
-    def removeNode(self, node: Node):
-        """Remove :class:`~nodeeditor.node_node.Node` from this `Scene`
-
-        :param node: :class:`~nodeeditor.node_node.Node` to be removed from this `Scene`
-        :type node: :class:`~nodeeditor.node_node.Node`
-        """
-        if node in self.nodes:
-            self.nodes.remove(node)
-        else:
-            if DEBUG_REMOVE_WARNINGS: print("!W:", "Scene::removeNode", "wanna remove nodeeditor", node,
-                                            "from self.nodes but it's not in the list!")
-
-    def removeEdge(self, edge: Edge):
-        """Remove :class:`~nodeeditor.node_edge.Edge` from this `Scene`
-
-        :param edge: :class:`~nodeeditor.node_edge.Edge` to be remove from this `Scene`
-        :return: :class:`~nodeeditor.node_edge.Edge`
-        """
-        if edge in self.edges:
-            self.edges.remove(edge)
-        else:
-            if DEBUG_REMOVE_WARNINGS: print("!W:", "Scene::removeEdge", "wanna remove edge", edge,
-                                            "from self.edges but it's not in the list!")
-
     def clear(self):
         """Remove all `Nodes` from this `Scene`. This causes also to remove all `Edges`"""
-        while len(self.nodes) > 0:
-            self.nodes[0].remove()
+        for node in self.nodes.copy():
+            node.remove()
 
         self.has_been_modified = False
 
-    def saveToFile(self, filename: str):
+    def saveToFile(self, filename: str, indent: int = None, binary: bool = False):
         """
-        Save this `Scene` to the file on disk.
+        Save this `Scene` to the file on disk. The JSON is compact and streamed to the file, see
+        :mod:`~nodeeditor.node_json`. The file is replaced atomically, see
+        :func:`~nodeeditor.node_scene_saver.writeFileAtomically`
 
         :param filename: where to save this scene
         :type filename: ``str``
+        :param indent: number of spaces of indentation for a human readable file, ``None`` for compact output
+        :type indent: ``int``
+        :param binary: ``True`` to save in the binary format of :mod:`~nodeeditor.node_scene_binary` instead of JSON
+        :type binary: ``bool``
         """
-        with open(filename, "w") as file:
-            file.write(json.dumps(self.serialize(), indent=4))
-            print("saving to", filename, "was successful.")
+        data = self.serialize()
+        writeFileAtomically(filename, lambda file: dumpSceneData(data, file, indent, binary))
+        print("saving to", filename, "was successful.")
 
-            self.has_been_modified = False
-            self.filename = filename
+        self.has_been_modified = False
+        self.filename = filename
 
     def loadFromFile(self, filename: str):
         """
@@ -331,26 +338,23 @@ class NodeScene(Serializable):
 
         :param filename: from what file to load the `Scene`
         :type filename: ``str``
-        :raises: :class:`~nodeeditor.node_scene.InvalidFile` if there was an error decoding JSON file
+        :raises: :class:`~nodeeditor.node_scene.InvalidFile` if there was an error decoding the JSON or binary file
         """
 
-        with open(filename, "r") as file:
-            raw_data = file.read()
+        with open(filename, "rb") as file:
             try:
-                if sys.version_info >= (3, 9):
-                    data = json.loads(raw_data)
-                else:
-                    data = json.loads(raw_data, encoding='utf-8')
+                data = loadSceneData(file)
+            except ValueError:
+                raise InvalidFile("%s is not a valid scene file" % os.path.basename(filename))
 
-                self.filename = filename
+        try:
+            self.filename = filename
 
-                self.deserialize(data)
-                self.has_been_modified = False
+            self.deserialize(data)
+            self.has_been_modified = False
 
-            except json.JSONDecodeError:
-                raise InvalidFile("%s is not a valid JSON file" % os.path.basename(filename))
-            except Exception as e:
-                dumpException(e)
+        except Exception as e:
+            dumpException(e)
 
     def getEdgeClass(self):
         """Return the class representing Edge. Override me if needed"""
@@ -383,7 +387,7 @@ class NodeScene(Serializable):
     def UVSerialize(self):
 
         # Serialize all item in UserVarsData
-        self.userVars = []
+        self.user_vars = []
         if self.VEListWdg:
             for item in self.VEListWdg.user_vars_data:
                 userVar = OrderedDict([
@@ -392,12 +396,12 @@ class NodeScene(Serializable):
                     ('type', item[2]),
                 ])
 
-                self.userVars.append(userVar)
+                self.user_vars.append(userVar)
 
     def UESerialize(self):
 
         # Serialize all item in UserEventsData
-        self.userEvents = []
+        self.user_events = []
         if self.VEListWdg:
             for item in self.VEListWdg.user_events_data:
                 userEvent = OrderedDict([
@@ -406,7 +410,7 @@ class NodeScene(Serializable):
                     ('type', item[2]),
                 ])
 
-                self.userEvents.append(userEvent)
+                self.user_events.append(userEvent)
 
     def serialize(self) -> OrderedDict:
         nodes, edges = [], []
@@ -419,47 +423,90 @@ class NodeScene(Serializable):
             ('id', self.id),
             ('scene_width', self.scene_width),
             ('scene_height', self.scene_height),
-            ('user_vars', self.userVars),
-            ('user_events', self.userEvents),
+            ('user_vars', self.user_vars),
+            ('user_events', self.user_events),
             ('nodes', nodes),
             ('edges', edges),
         ])
 
+    def deserializeUserVars(self, user_vars: list):
+        """Replace the user variables of this `Scene` with the serialized `user_vars` and list them. Nothing is
+        reloaded when they are the listed ones, i.e. when a History Stamp is restored"""
+        user_vars = list(user_vars)
+        self.UVSerialize()
+        if user_vars == self.user_vars: return
+        self.VEListWdg.ClearVars()
+        self.user_vars = user_vars
+        for var_data in self.user_vars:
+            self.VEListWdg.LoadVar(type=var_data['type'], name=var_data['title'], id=var_data['id'])
+
+    def deserializeUserEvents(self, user_events: list):
+        """Replace the user events of this `Scene` with the serialized `user_events` and list them. Nothing is
+        reloaded when they are the listed ones, i.e. when a History Stamp is restored"""
+        user_events = list(user_events)
+        self.UESerialize()
+        if user_events == self.user_events: return
+        self.VEListWdg.ClearEvents()
+        self.user_events = user_events
+        for event_data in self.user_events:
+            self.VEListWdg.LoadEvent(type=event_data['type'], name=event_data['title'], id=event_data['id'])
+
+    def deserializeNode(self, node_data: dict, hashmap: dict, restore_id: bool = True, *args, **kwargs) -> Node:
+        """
+        Create a new `Node` of the class chosen by :py:meth:`getNodeClassFromData` and deserialize `node_data`
+        into it
+
+        :param node_data: serialized `Node`
+        :type node_data: ``dict``
+        :param hashmap: helper dictionary of the deserialized objects by their serialized id
+        :type hashmap: ``dict``
+        :return: new `Node` added to this `Scene`
+        :rtype: :class:`~nodeeditor.node_node.Node`
+        """
+        new_node = self.getNodeClassFromData(node_data)(self)
+        new_node.deserialize(node_data, hashmap, restore_id, *args, **kwargs)
+        new_node.onDeserialized(node_data)
+        return new_node
+
+    def deserializeEdge(self, edge_data: dict, hashmap: dict, restore_id: bool = True, *args, **kwargs) -> Edge:
+        """
+        Create a new `Edge` connecting the `Sockets` found in `hashmap`
+
+        :param edge_data: serialized `Edge`
+        :type edge_data: ``dict``
+        :param hashmap: helper dictionary of the deserialized objects by their serialized id
+        :type hashmap: ``dict``
+        :return: new `Edge` added to this `Scene`
+        :rtype: :class:`~nodeeditor.node_edge.Edge`
+        """
+        new_edge = Edge(self)
+        new_edge.deserialize(edge_data, hashmap, restore_id, *args, **kwargs)
+        return new_edge
+
     def deserialize(self, data: dict, hashmap: dict = {}, restore_id: bool = True, *args, **kwargs) -> bool:
         # Start with the scene ID
 
         hashmap = {}
-        if restore_id:
+        if restore_id and reserveID(data['id']):
             self.id = data['id']
 
-        # Deserialize the User Vars
-        for var_data in data['user_vars']:
-            self.VEListWdg.LoadVar(type=var_data['type'], name=var_data['title'], id=var_data['id'])
-
-        # Deserialize the User Events
-        for event_data in data['user_events']:
-            self.VEListWdg.LoadEvent(type=event_data['type'], name=event_data['title'], id=event_data['id'])
+        self.deserializeUserVars(data['user_vars'])
+        self.deserializeUserEvents(data['user_events'])
 
 
         # -- deserialize NODES
         # Instead of recreating all the nodes, reuse existing ones...
-        # get list of all current nodes:
-        all_nodes = self.nodes.copy()
+        # get all current nodes by id, new nodes registered while deserializing are not matched:
+        all_nodes = self.nodes_by_id.copy()
 
         # go through deserialized nodes:
         for node_data in data['nodes']:
             # can we find this node in the scene?
-            found = False
-            for node in all_nodes:
-                if node.id == node_data['id']:
-                    found = node
-                    break
+            found = all_nodes.pop(node_data['id'], None)
 
-            if not found:
+            if found is None:
                 try:
-                    new_node = self.getNodeClassFromData(node_data)(self)
-                    new_node.deserialize(node_data, hashmap, restore_id, *args, **kwargs)
-                    new_node.onDeserialized(node_data)
+                    self.deserializeNode(node_data, hashmap, restore_id, *args, **kwargs)
                     # print("New node for", node_data['title'])
                 except:
                     dumpException()
@@ -467,43 +514,35 @@ class NodeScene(Serializable):
                 try:
                     found.deserialize(node_data, hashmap, restore_id, *args, **kwargs)
                     found.onDeserialized(node_data)
-                    all_nodes.remove(found)
                     # print("Reused", node_data['title'])
                 except:
                     dumpException()
 
         # remove nodes which are left in the scene and were NOT in the serialized data!
         # that means they were not in the graph before...
-        while all_nodes != []:
-            node = all_nodes.pop()
+        for node in all_nodes.values():
             node.remove()
 
         # -- deserialize EDGES
 
         # Instead of recreating all the edges, reuse existing ones...
-        # get list of all current edges:
-        all_edges = self.edges.copy()
+        # get all current edges by id:
+        all_edges = self.edges_by_id.copy()
 
         # go through deserialized edges:
         for edge_data in data['edges']:
-            # can we find this node in the scene?
-            found = False
-            for edge in all_edges:
-                if edge.id == edge_data['id']:
-                    found = edge
-                    break
-
-            if not found:
-                new_edge = Edge(self).deserialize(edge_data, hashmap, restore_id, *args, **kwargs)
+            # can we find this edge in the scene?
+            found = all_edges.pop(edge_data['id'], None)
+
+            if found is None:
+                self.deserializeEdge(edge_data, hashmap, restore_id, *args, **kwargs)
                 # print("New edge for", edge_data)
             else:
                 found.deserialize(edge_data, hashmap, restore_id, *args, **kwargs)
-                all_edges.remove(found)
 
-        # remove nodes which are left in the scene and were NOT in the serialized data!
+        # remove edges which are left in the scene and were NOT in the serialized data!
         # that means they were not in the graph before...
-        while all_edges != []:
-            edge = all_edges.pop()
+        for edge in all_edges.values():
             edge.remove()
 
         self.NodeEditor.UpdateTextCode()
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the binary scene file format. It stores the same data as the JSON files, but the `Nodes`,
+`Sockets` and `Edges` are written as typed columns instead of one dictionary per object::
+
+    magic, version, counts                      header
+    scene                                       compact JSON of the scene keys (size, user variables...)
+    strings                                     string table: lengths, then the UTF-8 bytes
+    node columns                                id, pos_x, pos_y, name, flags, extra, inputs, outputs
+    socket columns                              id, index, position, socket_type, flags, value
+    edge columns                                id, edge_type, start, end
+
+The `Sockets` of all `Nodes` follow each other, inputs then outputs of each `Node`. Names, literal values and the
+keys a `Node` class adds to its data (``content``, ``node_type``...) go through the string table, so repeated ones
+are stored once. Loading gives back the serialized ``dict``, which is deserialized by the `Scene` as usual.
+"""
+import struct
+import sys
+from array import array
+
+from nodeeditor.node_json import dumpJSON, dumpsJSON, loadsJSON
+
+DEBUG = False
+
+#: first bytes of a binary scene file
+MAGIC = b'NEDSCENE'
+#: version of the binary format
+FORMAT_VERSION = 1
+#: extension of the scene files saved in the binary format, the other ones are saved as JSON
+BINARY_EXTENSION = '.bin'
+
+# version, numbers of nodes, sockets, edges and strings, size of the scene json
+_HEADER = struct.Struct('<HIIIII')
+
+_NODE_COLUMNS = (('id', 'q'), ('pos_x', 'd'), ('pos_y', 'd'), ('name', 'I'), ('flags', 'B'), ('extra', 'I'),
+                 ('inputs', 'I'), ('outputs', 'I'))
+_SOCKET_COLUMNS = (('id', 'q'), ('index', 'i'), ('position', 'B'), ('socket_type', 'i'), ('flags', 'B'),
+                   ('value', 'I'))
+_EDGE_COLUMNS = (('id', 'q'), ('edge_type', 'i'), ('start', 'q'), ('end', 'q'))
+
+# keys stored as node columns, the other keys of a node go to its 'extra' json
+_NODE_KEYS = ('id', 'name', 'pos_x', 'pos_y', 'inputs', 'outputs', 'is_var', 'is_setter')
+
+_FLAG_IS_VAR = 1
+_FLAG_IS_SETTER = 2
+_FLAG_MULTI_EDGES = 1
+
+
+def isBinaryScene(head: bytes) -> bool:
+    """Return ``True`` if `head`, the first bytes of a file, starts a binary scene"""
+    return head[:len(MAGIC)] == MAGIC
+
+
+def isBinaryFilename(filename: str) -> bool:
+    """Return ``True`` if the scene file `filename` is saved in the binary format, according to its extension"""
+    return filename is not None and filename.lower().endswith(BINARY_EXTENSION)
+
+
+class _Strings():
+    """String table collecting each distinct string once. Index 0 is reserved for 'no string'"""
+
+    def __init__(self):
+        self.indexes = {}
+        self.strings = []
+
+    def add(self, string: str) -> int:
+        index = self.indexes.get(string)
+        if index is None:
+            self.strings.append(string)
+            index = self.indexes[string] = len(self.strings)
+        return index
+
+
+def _column(typecode: str, values) -> bytes:
+    column = array(typecode, values)
+    if sys.byteorder == 'big': column.byteswap()
+    return column.tobytes()
+
+
+def dumpsBinary(data: dict) -> bytes:
+    """
+    Encode a serialized `Scene` to the binary format
+
+    :param data: serialized `Scene`, as returned by ``serialize()``
+    :type data: ``dict``
+    :return: content of the binary file
+    :rtype: ``bytes``
+    """
+    strings = _Strings()
+    empty_extra = strings.add('{}')
+    nodes = {name: [] for name, typecode in _NODE_COLUMNS}
+    sockets = {name: [] for name, typecode in _SOCKET_COLUMNS}
+
+    for node_data in data['nodes']:
+        nodes['id'].append(node_data['id'])
+        nodes['pos_x'].append(node_data['pos_x'])
+        nodes['pos_y'].append(node_data['pos_y'])
+        nodes['name'].append(strings.add(node_data['name']))
+        nodes['flags'].append((_FLAG_IS_VAR if node_data['is_var'] else 0) |
+                              (_FLAG_IS_SETTER if node_data['is_setter'] else 0))
+        # flags which are not booleans (e.g. 'is_setter': null in older files) are kept as they are
+        extra = {key: value for key, value in node_data.items()
+                 if key not in _NODE_KEYS or (key in ('is_var', 'is_setter') and not isinstance(value, bool))}
+        nodes['extra'].append(strings.add(dumpsJSON(extra).decode('utf-8')) if extra else empty_extra)
+        nodes['inputs'].append(len(node_data['inputs']))
+        nodes['outputs'].append(len(node_data['outputs']))
+
+        for socket_data in node_data['inputs'] + node_data['outputs']:
+            sockets['id'].append(socket_data['id'])
+            sockets['index'].append(socket_data['index'])
+            sockets['position'].append(socket_data['position'])
+            sockets['socket_type'].append(socket_data['socket_type'])
+            sockets['flags'].append(_FLAG_MULTI_EDGES if socket_data['multi_edges'] else 0)
+            value = socket_data.get('value')
+            sockets['value'].append(0 if value is None else strings.add(dumpsJSON(value).decode('utf-8')))
+
+    edges = data['edges']
+    scene = dumpsJSON({key: value for key, value in data.items() if key not in ('nodes', 'edges')})
+    encoded = [string.encode('utf-8') for string in strings.strings]
+
+    parts = [MAGIC, _HEADER.pack(FORMAT_VERSION, len(data['nodes']), len(sockets['id']), len(edges),
+                                 len(encoded), len(scene)), scene,
+             _column('I', [len(string) for string in encoded]), b''.join(encoded)]
+    parts.extend(_column(typecode, nodes[name]) for name, typecode in _NODE_COLUMNS)
+    parts.extend(_column(typecode, sockets[name]) for name, typecode in _SOCKET_COLUMNS)
+    parts.append(_column('q', [edge['id'] for edge in edges]))
+    parts.append(_column('i', [edge['edge_type'] for edge in edges]))
+    # edges missing a socket are stored with 0, ids are always positive
+    parts.append(_column('q', [edge['start'] or 0 for edge in edges]))
+    parts.append(_column('q', [edge['end'] or 0 for edge in edges]))
+    if DEBUG: print("BINARY: encoded", len(data['nodes']), "nodes and", len(strings.strings), "strings")
+    return b''.join(parts)
+
+
+class _Reader():
+    """Reads the columns following each other in the binary data"""
+
+    def __init__(self, raw_data: bytes, offset: int):
+        self.raw_data = memoryview(raw_data)
+        self.offset = offset
+
+    def bytes(self, size: int) -> bytes:
+        if self.offset + size > len(self.raw_data): raise ValueError("binary scene file is truncated")
+        chunk = self.raw_data[self.offset:self.offset + size]
+        self.offset += size
+        return chunk
+
+    def column(self, typecode: str, count: int) -> list:
+        column = array(typecode)
+        column.frombytes(self.bytes(column.itemsize * count))
+        if sys.byteorder == 'big': column.byteswap()
+        return column.tolist()
+
+
+def loadsBinary(raw_data: bytes) -> dict:
+    """
+    Decode the binary format back to a serialized `Scene`
+
+    :param raw_data: content of a binary scene file
+    :type raw_data: ``bytes``
+    :return: serialized `Scene`, as read from a JSON file
+    :rtype: ``dict``
+    :raises: ``ValueError`` if `raw_data` is not a valid binary scene
+    """
+    if not isBinaryScene(raw_data): raise ValueError("missing the binary scene magic bytes")
+    reader = _Reader(raw_data, len(MAGIC))
+    try:
+        version, node_count, socket_count, edge_count, string_count, scene_size = _HEADER.unpack(
+            reader.bytes(_HEADER.size))
+    except struct.error as e:
+        raise ValueError("binary scene header is truncated") from e
+    if version > FORMAT_VERSION: raise ValueError("binary scene version %d is not supported" % version)
+
+    data = loadsJSON(bytes(reader.bytes(scene_size)))
+    strings = [None]
+    for length in reader.column('I', string_count):
+        strings.append(str(reader.bytes(length), 'utf-8'))
+    nodes = {name: reader.column(typecode, node_count) for name, typecode in _NODE_COLUMNS}
+    sockets = {name: reader.column(typecode, socket_count) for name, typecode in _SOCKET_COLUMNS}
+    edges = {name: reader.column(typecode, edge_count) for name, typecode in _EDGE_COLUMNS}
+
+    # indexes out of the tables would fail while building the lists, or worse pick the wrong items
+    if any(not 0 < index <= string_count for index in nodes['name'] + nodes['extra']):
+        raise ValueError("binary scene node refers to a missing string")
+    if any(index > string_count for index in sockets['value']):
+        raise ValueError("binary scene socket refers to a missing string")
+    if sum(nodes['inputs']) + sum(nodes['outputs']) != socket_count:
+        raise ValueError("binary scene nodes do not have %d sockets" % socket_count)
+
+    # each distinct value or extra json is decoded once
+    decoded = {}
+    def decode(index: int):
+        if index not in decoded: decoded[index] = loadsJSON(strings[index])
+        return decoded[index]
+
+    socket_list = []
+    for socket_id, index, position, socket_type, flags, value in zip(
+            sockets['id'], sockets['index'], sockets['position'], sockets['socket_type'], sockets['flags'],
+            sockets['value']):
+        socket_data = {'id': socket_id, 'index': index, 'multi_edges': bool(flags & _FLAG_MULTI_EDGES),
+                       'position': position, 'socket_type': socket_type}
+        if value: socket_data['value'] = decode(value)
+        socket_list.append(socket_data)
+
+    node_list = []
+    first = 0
+    for node_id, pos_x, pos_y, name, flags, extra, inputs, outputs in zip(*nodes.values()):
+        node_data = {'id': node_id, 'name': strings[name], 'pos_x': pos_x, 'pos_y': pos_y,
+                     'inputs': socket_list[first:first + inputs],
+                     'outputs': socket_list[first + inputs:first + inputs + outputs],
+                     'is_var': bool(flags & _FLAG_IS_VAR), 'is_setter': bool(flags & _FLAG_IS_SETTER)}
+        # every node gets its own copy of the extra keys, nodes may modify their data while deserializing
+        if strings[extra] != '{}': node_data.update(loadsJSON(strings[extra]))
+        node_list.append(node_data)
+        first += inputs + outputs
+
+    data['nodes'] = node_list
+    data['edges'] = [{'id': edge_id, 'edge_type': edge_type, 'start': start or None, 'end': end or None}
+                     for edge_id, edge_type, start, end in zip(*edges.values())]
+    return data
+
+
+def dumpBinary(data: dict, file: 'BinaryIO'):
+    """
+    Write a serialized `Scene` in the binary format to `file`
+
+    :param data: serialized `Scene`
+    :type data: ``dict``
+    :param file: file opened for writing in binary mode
+    """
+    file.write(dumpsBinary(data))
+
+
+def loadBinary(file: 'BinaryIO') -> dict:
+    """
+    Read a serialized `Scene` from the binary `file`
+
+    :param file: file opened for reading in binary mode
+    :raises: ``ValueError`` if the file is not a valid binary scene
+    """
+    return loadsBinary(file.read())
+
+
+def loadSceneData(file: 'BinaryIO') -> dict:
+    """
+    Read a serialized `Scene` from `file`, binary or JSON according to its first bytes
+
+    :param file: file opened for reading in binary mode
+    :return: serialized `Scene`
+    :rtype: ``dict``
+    :raises: ``ValueError`` if the file is neither a valid binary scene nor valid JSON
+    """
+    raw_data = file.read()
+    if isBinaryScene(raw_data): return loadsBinary(raw_data)
+    return loadsJSON(raw_data)
+
+
+def dumpSceneData(data: dict, file: 'BinaryIO', indent: int = None, binary: bool = False):
+    """
+    Write a serialized `Scene` to `file`, binary or JSON
+
+    :param data: serialized `Scene`
+    :type data: ``dict``
+    :param file: file opened for writing in binary mode
+    :param indent: number of spaces of indentation of the JSON, ``None`` for compact output
+    :type indent: ``int``
+    :param binary: ``True`` to write the binary format instead of JSON
+    :type binary: ``bool``
+    """
+    if binary:
+        dumpBinary(data, file)
+    else:
+        dumpJSON(data, file, indent)
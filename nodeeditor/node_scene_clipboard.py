@@ -81,11 +81,12 @@ class SceneClipboard():
         ])
 
 
-        # if CUT (aka delete) remove selected items
+        # if CUT (aka delete) remove selected items, in one transaction storing one History Stamp
         if delete:
-            self.scene.getView().deleteSelected()
-            # store our history
-            self.scene.history.storeHistory("Cut out elements from scene", setModified=True)
+            with self.scene.transaction("Cut out elements from scene"):
+                self.scene.getView().deleteSelected()
+                # store our history
+                self.scene.history.storeHistory("Cut out elements from scene", setModified=True)
 
         return data
 
@@ -127,44 +128,45 @@ class SceneClipboard():
         # calculate the offset of the newly creating nodes
         mousex, mousey = mouse_scene_pos.x(), mouse_scene_pos.y()
 
-        # create each node
-        created_nodes = []
+        # everything is created in one transaction, a failing item restores the scene as it was
+        with self.scene.transaction("Pasted elements in scene"):
+            # create each node
+            created_nodes = []
 
-        self.scene.setSilentSelectionEvents()
+            self.scene.setSilentSelectionEvents()
+            try:
+                self.scene.doDeselectItems()
 
-        self.scene.doDeselectItems()
+                for node_data in data['nodes']:
+                    new_node = self.scene.getNodeClassFromData(node_data)(self.scene)
+                    new_node.deserialize(node_data, hashmap, restore_id=False, *args, **kwargs)
+                    created_nodes.append(new_node)
 
-        for node_data in data['nodes']:
-            new_node = self.scene.getNodeClassFromData(node_data)(self.scene)
-            new_node.deserialize(node_data, hashmap, restore_id=False, *args, **kwargs)
-            created_nodes.append(new_node)
-
-            # readjust the new nodeeditor's position
-
-            # new node's current position
-            posx, posy = new_node.pos.x(), new_node.pos.y()
-            newx, newy = mousex + posx - minx, mousey + posy - miny
-
-            new_node.setPos(newx, newy)
+                    # readjust the new nodeeditor's position
 
-            new_node.doSelect()
+                    # new node's current position
+                    posx, posy = new_node.pos.x(), new_node.pos.y()
+                    newx, newy = mousex + posx - minx, mousey + posy - miny
 
-            if DEBUG_PASTING:
-                print("** PASTA SUM:")
-                print("\tMouse pos:", mousex, mousey)
-                print("\tnew node pos:", posx, posy)
-                print("\tFINAL:", newx, newy)
+                    new_node.setPos(newx, newy)
 
-        # create each edge
-        if 'edges' in data:
-            for edge_data in data['edges']:
-                new_edge = Edge(self.scene)
-                new_edge.deserialize(edge_data, hashmap, restore_id=False, *args, **kwargs)
+                    new_node.doSelect()
 
+                    if DEBUG_PASTING:
+                        print("** PASTA SUM:")
+                        print("\tMouse pos:", mousex, mousey)
+                        print("\tnew node pos:", posx, posy)
+                        print("\tFINAL:", newx, newy)
 
-        self.scene.setSilentSelectionEvents(False)
+                # create each edge
+                if 'edges' in data:
+                    for edge_data in data['edges']:
+                        new_edge = Edge(self.scene)
+                        new_edge.deserialize(edge_data, hashmap, restore_id=False, *args, **kwargs)
+            finally:
+                self.scene.setSilentSelectionEvents(False)
 
-        # store history
-        self.scene.history.storeHistory("Pasted elements in scene", setModified=True)
+            # store history
+            self.scene.history.storeHistory("Pasted elements in scene", setModified=True)
 
         return created_nodes
\ No newline at end of file
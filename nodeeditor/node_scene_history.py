@@ -3,6 +3,7 @@
 A module containing all code for working with History (Undo/Redo)
 """
 from nodeeditor.utils import dumpException
+from nodeeditor.node_scene_transaction import TRANSACTION_HISTORY
 
 DEBUG = False
 DEBUG_SELECTION = False
@@ -135,6 +136,9 @@ class SceneHistory():
         if setModified:
             self.scene.has_been_modified = True
 
+        # a transaction stores one History Stamp for all its operations when it commits
+        if self.scene.deferInTransaction(TRANSACTION_HISTORY): return
+
         if DEBUG: print("Storing history", '"%s"' % desc,
                         ".... current_step: @%d" % self.history_current_step,
                         "(%d)" % len(self.history_stack))
@@ -219,19 +223,15 @@ class SceneHistory():
             for edge in self.scene.edges: edge.grEdge.setSelected(False)
             # now restore selected edges from history_stamp
             for edge_id in history_stamp['selection']['edges']:
-                for edge in self.scene.edges:
-                    if edge.id == edge_id:
-                        edge.grEdge.setSelected(True)
-                        break
+                edge = self.scene.getEdgeByID(edge_id)
+                if edge is not None: edge.grEdge.setSelected(True)
 
             # first clear all selection on nodes
             for node in self.scene.nodes: node.grNode.setSelected(False)
             # now restore selected nodes from history_stamp
             for node_type in history_stamp['selection']['nodes']:
-                for node in self.scene.nodes:
-                    if node.id == node_type:
-                        node.grNode.setSelected(True)
-                        break
+                node = self.scene.getNodeByID(node_type)
+                if node is not None: node.grNode.setSelected(True)
 
             current_selection = self.captureCurrentSelection()
             if DEBUG_SELECTION: print("selected nodes after restore:", current_selection['nodes'])
@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the journal of the changes made to a `Scene` since its file was saved. Each `History Stamp`
+stored or restored appends one small delta record to a journal file next to the scene file, so the work done
+between two saves can be recovered after a crash by replaying the journal over the saved file::
+
+    records = readJournal(filename)
+    if records: data = replayJournal(saved_data, records)
+
+The journal is a hidden file of JSON lines, ``.<scene file>.journal``. Its first line identifies the saved file
+it applies to, by size and modification time, the following ones are the delta records. The file is created with
+the first record, so opening a scene writes nothing. Records are flushed to the file at once and synced to the disk
+in batches. The journal is compacted every time the scene is saved.
+"""
+import os
+from collections import OrderedDict
+
+from qtpy.QtCore import QTimer
+
+from nodeeditor.node_json import dumpsJSON, loadsJSON
+from nodeeditor.node_scene_saver import writeFileAtomically
+from nodeeditor.utils import dumpException
+
+DEBUG = False
+
+#: version of the journal files
+JOURNAL_VERSION = 1
+#: default delay in milliseconds between the writing of a record and the syncing of the journal to the disk
+SYNC_INTERVAL = 1000
+
+# (list key, key of removed ids, key of the order) of the serialized scene items recorded by id
+_ITEM_KEYS = (('nodes', 'removed_nodes', 'node_order'), ('edges', 'removed_edges', 'edge_order'))
+
+
+def journalFilename(filename: str) -> str:
+    """
+    Return the journal file of the scene file `filename`
+
+    :param filename: scene file
+    :type filename: ``str``
+    :rtype: ``str``
+    """
+    directory, name = os.path.split(os.path.abspath(filename))
+    return os.path.join(directory, "." + name + ".journal")
+
+
+def _fileHeader(filename: str) -> dict:
+    stat = os.stat(filename)
+    return OrderedDict([('journal', JOURNAL_VERSION), ('size', stat.st_size), ('mtime_ns', stat.st_mtime_ns)])
+
+
+def diffSceneData(old: dict, new: dict) -> dict:
+    """
+    Return the delta record turning the serialized `Scene` `old` into `new`. `Nodes` and `Edges` are recorded
+    by id: the changed and added ones whole, the removed ones by their id. The order of the items is recorded
+    only if it is not the one :func:`applyJournalRecord` gives
+
+    :param old: serialized `Scene` before the change
+    :type old: ``dict``
+    :param new: serialized `Scene` after the change
+    :type new: ``dict``
+    :return: delta record, empty if the scenes are equal
+    :rtype: ``dict``
+    """
+    record = OrderedDict()
+    scene = OrderedDict((key, value) for key, value in new.items()
+                        if key not in ('nodes', 'edges') and old.get(key) != value)
+    if scene: record['scene'] = scene
+
+    for items_key, removed_key, order_key in _ITEM_KEYS:
+        old_items = OrderedDict((item['id'], item) for item in old[items_key])
+        new_ids = [item['id'] for item in new[items_key]]
+        new_id_set = set(new_ids)
+
+        changed = [item for item in new[items_key] if old_items.get(item['id']) != item]
+        removed = [item_id for item_id in old_items if item_id not in new_id_set]
+        if changed: record[items_key] = changed
+        if removed: record[removed_key] = removed
+
+        replayed_ids = [item_id for item_id in old_items if item_id in new_id_set] + \
+                       [item['id'] for item in changed if item['id'] not in old_items]
+        if replayed_ids != new_ids: record[order_key] = new_ids
+    return record
+
+
+def applyJournalRecord(data: dict, record: dict) -> dict:
+    """
+    Apply the delta `record` to the serialized `Scene` `data`. The records set the state of the items they
+    name, so replaying a record over a state which already contains it changes nothing
+
+    :param data: serialized `Scene`, its lists are replaced and not modified
+    :type data: ``dict``
+    :param record: delta record made by :func:`diffSceneData`
+    :type record: ``dict``
+    :return: `data`
+    :rtype: ``dict``
+    """
+    for key, value in record.get('scene', {}).items(): data[key] = value
+
+    for items_key, removed_key, order_key in _ITEM_KEYS:
+        items = OrderedDict((item['id'], item) for item in data[items_key])
+        for item_id in record.get(removed_key, ()): items.pop(item_id, None)
+        for item in record.get(items_key, ()): items[item['id']] = item
+        if order_key in record:
+            data[items_key] = [items[item_id] for item_id in record[order_key] if item_id in items]
+        else:
+            data[items_key] = list(items.values())
+    return data
+
+
+def replayJournal(data: dict, records: list) -> dict:
+    """
+    Apply the journal `records` to a copy of the serialized `Scene` `data`
+
+    :param data: serialized `Scene` of the saved file
+    :type data: ``dict``
+    :param records: delta records read by :func:`readJournal`
+    :type records: ``list``
+    :return: serialized `Scene` with the journaled changes
+    :rtype: ``dict``
+    """
+    data = OrderedDict(data)
+    for record in records: applyJournalRecord(data, record)
+    return data
+
+
+def readJournal(filename: str) -> list:
+    """
+    Read the journal of the scene file `filename`
+
+    :param filename: scene file
+    :type filename: ``str``
+    :return: delta records, ``None`` if there is no journal or if it does not apply to the current `filename`
+    :rtype: ``list``
+    """
+    try:
+        with open(journalFilename(filename), "rb") as file:
+            lines = file.read().split(b'\n')
+        header = loadsJSON(lines[0])
+        if header != _fileHeader(filename):
+            if DEBUG: print("JOURNAL: journal of an other version of", filename, header)
+            return None
+    except (OSError, ValueError):
+        return None
+
+    records = []
+    for line in lines[1:]:
+        if not line: continue
+        try:
+            records.append(loadsJSON(line))
+        except ValueError:
+            # the last record was being written when the application stopped
+            break
+    return records
+
+
+class SceneJournal():
+    """Class journaling the changes of a :class:`~nodeeditor.node_scene.NodeScene` to the journal file of its scene
+    file. It follows the `History Stamps` of the `Scene` while it is open"""
+
+    def __init__(self, scene: 'NodeScene', sync_interval: int = SYNC_INTERVAL):
+        """
+        :param scene: reference to the :class:`~nodeeditor.node_scene.NodeScene`
+        :type scene: :class:`~nodeeditor.node_scene.NodeScene`
+        :param sync_interval: delay in milliseconds between the writing of a record and the syncing to the disk
+        :type sync_interval: ``int``
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.NodeScene`
+        - **filename** - scene file whose changes are journaled, ``None`` when the journal is closed
+        - **records** - number of records in the journal file
+        """
+        self.scene = scene
+        self.filename = None
+        self.records = 0
+
+        # journal file, opened when the first record is written
+        self._file = None
+        self._header = None
+        self._base = None
+        self._save_marks = []
+        self._saved_data = None
+
+        self.sync_timer = QTimer()
+        self.sync_timer.setSingleShot(True)
+        self.sync_timer.setInterval(sync_interval)
+        self.sync_timer.timeout.connect(self.sync)
+
+        self.scene.history.addHistoryStoredListener(self.onHistoryChanged)
+        self.scene.history.addHistoryRestoredListener(self.onHistoryChanged)
+
+    def __str__(self):
+        return "<SceneJournal %s %d records>" % (self.filename, self.records)
+
+    def isOpen(self) -> bool:
+        """Are the changes of the `Scene` being journaled?
+
+        :rtype: ``bool``
+        """
+        return self.filename is not None
+
+    def open(self, filename: str, saved_data: dict = None, append: bool = False):
+        """
+        Start journaling the changes of the `Scene` made since it was loaded from or saved to the scene file
+        `filename`. Any previous journal of `filename` is replaced, by the changes made since `saved_data` if there
+        are some, else it is removed
+
+        :param filename: scene file the `Scene` has been loaded from or saved to
+        :type filename: ``str``
+        :param saved_data: serialized `Scene` held by `filename`, ``None`` if it is the current `Scene`
+        :type saved_data: ``dict``
+        :param append: ``True`` to keep the records of the previous journal of `filename` and append to them, when
+            they could not be recovered
+        :type append: ``bool``
+        """
+        self.close()
+        try:
+            self._base = self._currentSnapshot() if saved_data is None else saved_data
+            # the kept records are written again, without a torn last record the new ones would be appended to
+            records = readJournal(filename) if append else None
+            self._restart(filename, b''.join(dumpsJSON(record) + b'\n' for record in records or ()))
+        except OSError as e:
+            # the scene is still usable, only without recovery
+            dumpException(e)
+            self.filename = None
+            return
+        # changes made while the file was being written, their record replaces the previous journal
+        if saved_data is not None: self.onHistoryChanged()
+        if self._file is None: self._removeJournal(filename)
+
+    def close(self, remove: bool = True):
+        """
+        Stop journaling
+
+        :param remove: ``True`` to remove the journal file, when the changes have been saved or discarded
+        :type remove: ``bool``
+        """
+        if self.filename is None: return
+        self.sync_timer.stop()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            if remove: self._removeJournal(self.filename)
+        if DEBUG: print("JOURNAL: closed", self.filename)
+        self.filename = None
+        self._header = None
+        self._base = None
+        self._save_marks = []
+
+    def sync(self):
+        """Sync the records written so far to the disk. Called by the timer"""
+        if self._file is None: return
+        try:
+            os.fsync(self._file.fileno())
+        except OSError as e: dumpException(e)
+
+    def beginSave(self, data: dict):
+        """
+        Called when the `Scene` is serialized to be saved. The records written from now on are kept when the
+        journal is compacted by :py:meth:`compact`
+
+        :param data: serialized `Scene` being saved
+        :type data: ``dict``
+        """
+        if self.filename is None:
+            # the journal of a new graph begins when it is first saved
+            self._saved_data = data
+        else:
+            self._save_marks.append(self._size())
+
+    def compact(self, filename: str):
+        """
+        Called when the save begun by :py:meth:`beginSave` has been written to `filename`. The journal is replaced
+        by the journal of `filename` holding only the records written since the save began
+
+        :param filename: saved scene file
+        :type filename: ``str``
+        """
+        if self.filename is None:
+            if self._saved_data is not None: self.open(filename, self._saved_data)
+            self._saved_data = None
+            return
+        if not self._save_marks: return
+        # saves are written in order, a save replaced by a newer one before being written is never reported, so
+        # the oldest mark is used: its extra records are already in the file and replaying them changes nothing
+        position, self._save_marks = self._save_marks[0], self._save_marks[1:]
+        try:
+            tail = b''
+            if self._file is not None:
+                self._file.flush()
+                with open(journalFilename(self.filename), "rb") as file:
+                    file.seek(position)
+                    tail = file.read()
+            previous = self.filename if self._file is not None else None
+            self._restart(filename, tail)
+            self._save_marks = [mark - position + len(self._header) for mark in self._save_marks]
+            if previous is not None and (self._file is None or journalFilename(previous) != journalFilename(filename)):
+                self._removeJournal(previous)
+        except OSError as e:
+            dumpException(e)
+        if DEBUG: print("JOURNAL: compacted to", self.records, "records")
+
+    def onHistoryChanged(self):
+        """Append the change of the `Scene` to the journal. Called when a `History Stamp` is stored or restored"""
+        if self.filename is None: return
+        snapshot = self._currentSnapshot()
+        record = diffSceneData(self._base, snapshot)
+        self._base = snapshot
+        if not record: return
+
+        try:
+            if self._file is None:
+                self._create(dumpsJSON(record) + b'\n')
+            else:
+                self._file.write(dumpsJSON(record) + b'\n')
+                self._file.flush()
+        except OSError as e:
+            dumpException(e)
+            self.close(remove=False)
+            return
+        self.records += 1
+        if not self.sync_timer.isActive(): self.sync_timer.start()
+
+    def _currentSnapshot(self) -> dict:
+        history = self.scene.history
+        if history.history_current_step >= 0: return history.history_stack[history.history_current_step]['snapshot']
+        return self.scene.serialize()
+
+    def _size(self) -> int:
+        # size of the journal file, or the size it will have when the first record is written
+        return self._file.tell() if self._file is not None else len(self._header)
+
+    def _restart(self, filename: str, records_data: bytes = b''):
+        # journal the changes of filename from now on, starting with records_data
+        if self._file is not None: self._file.close()
+        self._file = None
+        self._header = dumpsJSON(_fileHeader(filename)) + b'\n'
+        self.filename = filename
+        self.records = records_data.count(b'\n')
+        if records_data: self._create(records_data)
+        if DEBUG: print("JOURNAL: journaling", filename)
+
+    def _create(self, records_data: bytes):
+        # replaces any previous journal of the file at once, a crash leaves either of them whole
+        writeFileAtomically(journalFilename(self.filename), lambda file: file.write(self._header + records_data))
+        self._file = open(journalFilename(self.filename), "ab")
+
+    def _removeJournal(self, filename: str):
+        try:
+            os.remove(journalFilename(filename))
+        except FileNotFoundError:
+            pass
+        except OSError as e: dumpException(e)
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the progressive loader of scene files. The `Nodes` and `Edges` are decoded and built in
+short time slices run by the Qt event loop, so the first `Nodes` show up at once and the application stays
+responsive while a large file is loading::
+
+    loader = SceneLoader(scene, filename)
+    loader.addProgressListener(progress_bar.setValue)
+    loader.addFinishedListener(onLoaded)
+    loader.start()
+"""
+import os
+import time
+
+from qtpy.QtCore import QTimer
+
+from nodeeditor.node_json import IncrementalJSONReader
+from nodeeditor.node_model import InvalidFile
+from nodeeditor.node_scene_binary import isBinaryScene, loadsBinary
+from nodeeditor.node_serializable import reserveID
+from nodeeditor.utils import dumpException
+
+DEBUG = False
+
+#: default duration in milliseconds of one building slice
+TIME_SLICE = 20
+
+
+class SceneLoader():
+    """Class loading a scene file into a :class:`~nodeeditor.node_scene.NodeScene` progressively.
+
+    The load runs inside a :class:`~nodeeditor.node_scene_transaction.SceneTransaction`, so the code view and the
+    `modified` notifications are refreshed once at the end. Interaction with the view is disabled until then.
+    Cancelling, or an invalid file, rolls the `Scene` back to its empty state."""
+
+    def __init__(self, scene: 'NodeScene', filename: str, time_slice: int = TIME_SLICE):
+        """
+        :param scene: reference to the :class:`~nodeeditor.node_scene.NodeScene` to load into
+        :type scene: :class:`~nodeeditor.node_scene.NodeScene`
+        :param filename: JSON or binary scene file
+        :type filename: ``str``
+        :param time_slice: duration in milliseconds of one building slice
+        :type time_slice: ``int``
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.NodeScene`
+        - **filename** - file being loaded
+        - **time_slice** - duration in milliseconds of one building slice
+        - **progress** - loaded part of the file in percents
+        - **is_running** - ``True`` between :py:meth:`start` and the end of the load
+        - **error** - :class:`~nodeeditor.node_model.InvalidFile` if the file could not be decoded, else ``None``
+        """
+        self.scene = scene
+        self.filename = filename
+        self.time_slice = time_slice
+        self.progress = 0
+        self.is_running = False
+        self.error = None
+
+        self._progress_listeners = []
+        self._finished_listeners = []
+        self._steps = None
+        self._transaction = None
+        self._progress = None
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.step)
+
+    def __str__(self):
+        return "<SceneLoader %s %d%%>" % (os.path.basename(self.filename), self.progress)
+
+    def addProgressListener(self, callback: 'function'):
+        """
+        Register callback for the progress of the load
+
+        :param callback: function called with the loaded part of the file in percents
+        """
+        self._progress_listeners.append(callback)
+
+    def addFinishedListener(self, callback: 'function'):
+        """
+        Register callback for the end of the load
+
+        :param callback: function called with ``True`` if the whole file has been loaded, ``False`` if the load
+            has been cancelled or the file is invalid
+        """
+        self._finished_listeners.append(callback)
+
+    def start(self):
+        """
+        Read the file, clear the `Scene` and start building it from the event loop
+
+        :raises: ``OSError`` if the file cannot be read, :class:`~nodeeditor.node_model.InvalidFile` if it is a
+            corrupted binary scene
+        """
+        with open(self.filename, "rb") as file:
+            raw_data = file.read()
+
+        if isBinaryScene(raw_data):
+            # the columns are decoded at once, they are much faster to decode than the scene to build
+            try:
+                data = loadsBinary(raw_data)
+            except ValueError as e:
+                raise InvalidFile("%s is not a valid scene file" % os.path.basename(self.filename)) from e
+            count = max(len(data['nodes']) + len(data['edges']), 1)
+            self._progress = lambda done: done / count
+            self._steps = self._build(iter(data.items()))
+        else:
+            reader = IncrementalJSONReader(raw_data)
+            self._progress = lambda done: reader.progress
+            self._steps = self._build(reader.items())
+
+        self.scene.clear()
+        self.scene.filename = self.filename
+        self._transaction = self.scene.transaction("Load %s" % os.path.basename(self.filename))
+        self._transaction.__enter__()
+        self._setInteractive(False)
+        self.is_running = True
+        self.error = None
+        if DEBUG: print("LOADER: started", self.filename)
+        self.timer.start(0)
+
+    def step(self):
+        """Build the `Scene` for one time slice. Called by the timer"""
+        if not self.is_running: return
+        deadline = time.perf_counter() + self.time_slice / 1000
+        done = 0
+        try:
+            while time.perf_counter() < deadline:
+                done = next(self._steps)
+        except StopIteration:
+            self._finish(True)
+            return
+        except ValueError as e:
+            self.error = InvalidFile("%s is not a valid scene file" % os.path.basename(self.filename))
+            dumpException(e)
+            self._finish(False)
+            return
+        self._setProgress(int(self._progress(done) * 100))
+
+    def cancel(self):
+        """Stop the load. The `Scene` is rolled back to its empty state"""
+        if self.is_running:
+            if DEBUG: print("LOADER: cancelled", self.filename)
+            self._finish(False)
+
+    def _build(self, items: 'iterator'):
+        # generator building the scene, yields the number of nodes and edges built so far after each of them
+        hashmap = {}
+        done = 0
+        pending_edges = []
+        for key, value in items:
+            if key == 'id':
+                if reserveID(value): self.scene.id = value
+            elif key == 'user_vars':
+                self.scene.deserializeUserVars(list(value))
+            elif key == 'user_events':
+                self.scene.deserializeUserEvents(list(value))
+            elif key == 'nodes':
+                for node_data in value:
+                    try:
+                        self.scene.deserializeNode(node_data, hashmap)
+                    except Exception as e: dumpException(e)
+                    done += 1
+                    yield done
+            elif key == 'edges':
+                for edge_data in value:
+                    # edges saved before their nodes are built at the end
+                    if edge_data['start'] not in hashmap or edge_data['end'] not in hashmap:
+                        pending_edges.append(edge_data)
+                        continue
+                    self._buildEdge(edge_data, hashmap)
+                    done += 1
+                    yield done
+
+        for edge_data in pending_edges:
+            if edge_data['start'] in hashmap and edge_data['end'] in hashmap: self._buildEdge(edge_data, hashmap)
+            done += 1
+            yield done
+
+    def _buildEdge(self, edge_data: dict, hashmap: dict):
+        try:
+            self.scene.deserializeEdge(edge_data, hashmap)
+        except Exception as e: dumpException(e)
+
+    def _finish(self, success: bool):
+        self.timer.stop()
+        self.is_running = False
+        self._steps = None
+        if success:
+            self._transaction.__exit__(None, None, None)
+            self.scene.has_been_modified = False
+            self.scene.NodeEditor.UpdateTextCode()
+            self._setProgress(100)
+        else:
+            # leaving the transaction with an error restores the empty scene it began with
+            self._transaction.__exit__(InvalidFile, self.error, None)
+            self.scene.filename = None
+        self._transaction = None
+        self._setInteractive(True)
+        if DEBUG: print("LOADER: finished", self.filename, "success", success)
+        for callback in self._finished_listeners: callback(success)
+
+    def _setProgress(self, progress: int):
+        if progress == self.progress: return
+        self.progress = progress
+        for callback in self._progress_listeners: callback(progress)
+
+    def _setInteractive(self, interactive: bool):
+        for view in self.scene.grScene.views(): view.setInteractive(interactive)
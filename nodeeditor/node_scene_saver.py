@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the background saving of scene files. The `Scene` is serialized on the GUI thread, which is
+the only cost the user waits for, then the snapshot is encoded and written on a worker thread::
+
+    saver = SceneSaver()
+    saver.saved.connect(onSaved)
+    saver.failed.connect(onSaveFailed)
+    saver.save(scene.serialize(), filename)
+
+Files are replaced atomically: the data goes to a temporary file in the same directory, which is flushed to the
+disk and renamed over the target, so a crash in the middle of a save leaves the previous file intact.
+"""
+import os
+import shutil
+import tempfile
+import threading
+
+from qtpy.QtCore import QObject, Signal, QCoreApplication, QEvent
+
+from nodeeditor.node_scene_binary import dumpSceneData
+from nodeeditor.utils import dumpException
+
+DEBUG = False
+
+# read once, the umask can only be queried by changing it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def writeFileAtomically(filename: str, write: 'function'):
+    """
+    Write a file through a temporary file renamed over `filename` once its content is on the disk
+
+    :param filename: file to write
+    :type filename: ``str``
+    :param write: function called with the temporary file opened for writing in binary mode
+    :type write: ``function``
+    :raises: ``OSError`` if the file cannot be written, any exception raised by `write`. `filename` is left
+        untouched in both cases
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    handle, temp_filename = tempfile.mkstemp(prefix="." + os.path.basename(filename) + ".", suffix=".tmp",
+                                             dir=directory)
+    try:
+        with os.fdopen(handle, "wb") as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+
+        # the temporary file is private, give it the permissions of the file it replaces
+        if os.path.exists(filename):
+            shutil.copymode(filename, temp_filename)
+        else:
+            os.chmod(temp_filename, 0o666 & ~_UMASK)
+
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename): os.remove(temp_filename)
+        raise
+
+    # make the rename itself durable, directories cannot be opened on Windows
+    if hasattr(os, 'O_DIRECTORY'):
+        directory_handle = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory_handle)
+        finally:
+            os.close(directory_handle)
+
+
+class SceneSaver(QObject):
+    """Class writing serialized `Scenes` to their files on a worker thread.
+
+    Saves are written in the order they were requested. A save requested while another one is being written waits
+    for it, and is replaced by any newer save requested meanwhile."""
+
+    #: pyqtSignal emitted on the GUI thread with the filename when a save has been written
+    saved = Signal(str)
+    #: pyqtSignal emitted on the GUI thread with the filename and the error message when a save has failed
+    failed = Signal(str, str)
+
+    def __init__(self, parent: QObject = None):
+        """
+        :param parent: parent ``QObject``
+        :type parent: ``QObject``
+
+        :Instance Attributes:
+
+        - **last_error** - message of the error of the last written save, ``None`` if it succeeded
+        """
+        super().__init__(parent)
+        self.last_error = None
+
+        self._lock = threading.Lock()
+        self._pending = None
+        self._thread = None
+
+    def __str__(self):
+        return "<SceneSaver %s>" % ("saving" if self.isSaving() else "idle")
+
+    def isSaving(self) -> bool:
+        """Is a save being written or waiting to be written?
+
+        :return: ``True`` if the worker thread is running
+        :rtype: ``bool``
+        """
+        with self._lock:
+            return self._thread is not None
+
+    def save(self, data: dict, filename: str, indent: int = None, binary: bool = False):
+        """
+        Write `data` to `filename` on the worker thread. `data` must not be changed afterwards, pass a new
+        serialization of the `Scene`
+
+        :param data: serialized `Scene`
+        :type data: ``dict``
+        :param filename: where to save the `Scene`
+        :type filename: ``str``
+        :param indent: number of spaces of indentation for a human readable JSON file, ``None`` for compact output
+        :type indent: ``int``
+        :param binary: ``True`` to save in the binary format of :mod:`~nodeeditor.node_scene_binary` instead of JSON
+        :type binary: ``bool``
+        """
+        with self._lock:
+            if DEBUG and self._pending is not None: print("SAVER: replacing the pending save of", self._pending[1])
+            self._pending = (data, filename, indent, binary)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="SceneSaver")
+                self._thread.start()
+
+    def wait(self) -> bool:
+        """
+        Block until the requested saves are written, then deliver their ``saved`` and ``failed`` signals
+
+        :return: ``True`` if the last save succeeded
+        :rtype: ``bool``
+        """
+        with self._lock:
+            thread = self._thread
+        if thread is not None: thread.join()
+        QCoreApplication.sendPostedEvents(None, QEvent.MetaCall)
+        return self.last_error is None
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if self._pending is None:
+                    self._thread = None
+                    return
+                data, filename, indent, binary = self._pending
+                self._pending = None
+
+            try:
+                writeFileAtomically(filename, lambda file: dumpSceneData(data, file, indent, binary))
+            except Exception as e:
+                dumpException(e)
+                self.last_error = str(e)
+                self._emit(self.failed, filename, self.last_error)
+            else:
+                if DEBUG: print("SAVER: saved", filename)
+                self.last_error = None
+                self._emit(self.saved, filename)
+
+    def _emit(self, signal: 'Signal', *args):
+        # the receivers live on the GUI thread, the signal is queued to them
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            # the saver has been deleted with its widget while the file was being written
+            pass
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the transactions grouping many modifications of a :class:`~nodeeditor.node_scene.NodeScene`
+into one step. Usage::
+
+    with scene.transaction("Paste 400 nodes"):
+        for data in nodes_data:
+            ...
+
+While a transaction is open, the side effects of the primitive operations are only recorded. They are run once
+when the outermost transaction commits.
+"""
+DEBUG = False
+
+#: side effects deferred while a transaction is open
+TRANSACTION_REPAINT = 1
+TRANSACTION_MODIFIED = 2
+TRANSACTION_SELECTION = 3
+TRANSACTION_HISTORY = 4
+TRANSACTION_CODE = 5
+
+
+class TransactionAborted(Exception):
+    """Raised when the outermost transaction ends normally although a nested one failed"""
+
+
+class SceneTransaction():
+    """Context manager for one level of transaction. Transactions can be nested, the inner ones commit together
+    with the outermost one.
+
+    Only the outermost level takes a snapshot of the `Scene`, so the cost of a transaction does not depend on the
+    number of operations or levels inside it. If an exception leaves the outermost level, the `Scene` is restored
+    to the snapshot (nodes, edges, user variables and selection) and the exception is propagated. An exception
+    leaving an inner level aborts the whole transaction: if it is caught inside the outermost level, the `Scene`
+    is restored when the outermost level ends and :class:`TransactionAborted` is raised, because the partial
+    changes of the inner level cannot be restored alone."""
+
+    def __init__(self, scene: 'NodeScene', name: str):
+        """
+        :param scene: reference to the :class:`~nodeeditor.node_scene.NodeScene`
+        :type scene: :class:`~nodeeditor.node_scene.NodeScene`
+        :param name: description of the History Stamp stored on commit, if the operations inside store history
+        :type name: ``str``
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.NodeScene`
+        - **name** - description of the History Stamp stored on commit
+        - **deferred** - ``set`` of `TRANSACTION_*` side effects requested inside the outermost transaction
+        - **failure** - (name, exception) of the first inner transaction left by an exception, ``None`` if none
+        """
+        self.scene = scene
+        self.name = name
+        self.deferred = set()
+        self.failure = None
+
+        self._history_stamp = None
+        self._was_modified = False
+
+    def __str__(self):
+        return "<SceneTransaction %s>" % self.name
+
+    def __enter__(self) -> 'SceneTransaction':
+        if not self.scene._transactions:
+            self._history_stamp = self.scene.history.createHistoryStamp(self.name)
+            self._was_modified = self.scene.has_been_modified
+        self.scene._transactions.append(self)
+        if DEBUG: print("TRANSACTION: begin", self.name, "level", len(self.scene._transactions))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        outermost = self.scene._transactions[0]
+        if outermost is not self:
+            if exc_type is not None and outermost.failure is None: outermost.failure = (self.name, exc_value)
+            self.scene._transactions.remove(self)
+            return False
+
+        aborted = None
+        if exc_type is None and self.failure is not None:
+            aborted = TransactionAborted("%s: nested transaction %s failed: %s" % (self.name, *self.failure))
+        try:
+            if exc_type is not None or aborted is not None:
+                # restored while still open, so the side effects of the restoration are deferred too
+                self.rollback()
+                # the scene is as before the transaction, only refresh what the restoration touched
+                self.scene._has_been_modified = self._was_modified
+                self.deferred.discard(TRANSACTION_MODIFIED)
+                self.deferred.discard(TRANSACTION_HISTORY)
+        finally:
+            self.scene._transactions.remove(self)
+            self.commit()
+        if aborted is not None: raise aborted from self.failure[1]
+        return False
+
+    def defer(self, effect: int):
+        """Record `effect` to be run when the outermost transaction commits"""
+        self.deferred.add(effect)
+
+    def rollback(self):
+        """Restore the `Scene` to the snapshot taken when the outermost transaction began"""
+        if DEBUG: print("TRANSACTION: rollback", self.name)
+        self.scene.history.restoreHistoryStamp(self._history_stamp)
+
+    def commit(self):
+        """Run once each side effect deferred by the outermost transaction"""
+        if DEBUG: print("TRANSACTION: commit", self.name, "deferred", self.deferred)
+        scene = self.scene
+        if TRANSACTION_REPAINT in self.deferred:
+            scene.grScene.update()
+        if TRANSACTION_MODIFIED in self.deferred and scene.has_been_modified:
+            for callback in scene._has_been_modified_listeners: callback()
+        if TRANSACTION_SELECTION in self.deferred:
+            scene.onSelectionChanged()
+        if TRANSACTION_HISTORY in self.deferred:
+            scene.history.storeHistory(self.name)
+        if TRANSACTION_CODE in self.deferred:
+            scene.NodeEditor.UpdateTextCode()
@@ -1,17 +1,63 @@
 # -*- coding: utf-8 -*-
 """
 A module containing Serializable "Interface". We pretend its an abstract class
+
+It also contains the allocator of the ids of serializable objects. Ids are allocated from a process-wide counter,
+so an id is never given twice, even after the object holding it has been garbage collected.
 """
+import threading
 from collections import OrderedDict
 
+#: largest id, ids are 64-bit signed integers
+MAX_ID = 2 ** 63 - 1
+
+_id_lock = threading.Lock()
+_next_id = 1
+
+
+def newID() -> int:
+    """
+    Allocate a new id, greater than every id allocated or reserved before
+
+    :return: new unique id
+    :rtype: ``int``
+    """
+    global _next_id
+    with _id_lock:
+        value = _next_id
+        _next_id += 1
+    return value
+
+
+def reserveID(value: int) -> bool:
+    """
+    Mark `value` as used, so :py:func:`newID` never returns it. Called for ids restored from serialized data
+
+    :param value: id restored from serialized data
+    :type value: ``int``
+    :return: ``True`` if `value` is a valid id, ``False`` if it is out of the 64-bit range and must be replaced
+    :rtype: ``bool``
+    """
+    global _next_id
+    if not isinstance(value, int) or not 0 < value <= MAX_ID: return False
+    # ids below the counter are already safe, the lock is only taken to move it
+    if value >= _next_id:
+        with _id_lock:
+            if value >= _next_id: _next_id = value + 1
+    return True
+
 
 class Serializable():
+    # no instance dictionary is forced on slotted subclasses, see :mod:`~nodeeditor.node_model`
+    __slots__ = ()
+
     def __init__(self):
         """
         Default constructor automatically creates data which are common to any serializable object.
-        In our case we create ``self.id`` which we use in every object in NodeEditor.
+        In our case we create ``self.id`` which we use in every object in NodeEditor. It is allocated
+        by :py:func:`newID`, so it is unique for the whole lifetime of the process.
         """
-        self.id = id(self)
+        self.id = newID()
 
     def serialize(self) -> OrderedDict:
         """
@@ -3,6 +3,7 @@
 A module containing NodeEditor's class for representing Socket and Socket Position Constants.
 """
 import math
+from contextlib import contextmanager
 
 from qtpy.QtGui import *
 from qtpy.QtCore import *
@@ -175,8 +176,7 @@ class QDMGraphicsSocket(QGraphicsItem):
 """
 A module containing NodeEditor's class for representing Socket and Socket Position Constants.
 """
-from collections import OrderedDict
-from nodeeditor.node_serializable import Serializable
+from nodeeditor.node_model import SocketModel
 
 LEFT_TOP = 1
 LEFT_CENTER = 2
@@ -189,9 +189,14 @@ DEBUG = False
 DEBUG_REMOVE_WARNINGS = False
 
 
-class Socket(Serializable):
+class Socket(SocketModel):
     Socket_GR_Class = QDMGraphicsSocket
 
+    #: value used by :py:attr:`socketCode` until :py:meth:`setSocketCode` is called
+    socketValue = True
+    _socket_code = None
+    _batch_depth = 0
+
     """Class representing Socket."""
 
     def __init__(self, node: 'Node', index: int = 0, position: int = LEFT_TOP, socket_type: int = 1,
@@ -224,32 +229,20 @@ class Socket(Serializable):
             - **is_input** - ``True`` if this socket serves for Input
             - **is_output** - ``True`` if this socket serves for Output
         """
-        super().__init__()
+        super().__init__(node, index, position, socket_type, multi_edges, is_input)
 
-        self.node = node
-        self.position = position
-        self.index = index
-        self.socket_type = socket_type
         self.count_on_this_node_side = count_on_this_node_side
-        self.is_multi_edges = multi_edges
-        self.is_input = is_input
-        self.is_output = not self.is_input
-        self.socketName = self.node.name
-        self.socketValue = True
-
-        self.socketCode = "{}={}".format(self.socketName, self.socketValue)
 
         if DEBUG: print("Socket -- creating with", self.index, self.position, "for nodeeditor", self.node)
 
         self.grSocket = self.__class__.Socket_GR_Class(self)
-        self.SocketColor = self.grSocket._current_color
 
         self.setSocketPosition()
 
-        self.socketEdges = []
-
         self.userInputWdg = self.SocketInputs()
 
+        self.node.scene.addSocket(self)
+
 
 
 
@@ -259,7 +252,7 @@ class Socket(Serializable):
             Spos = self.grSocket.pos()
             if self.socket_type == 1:
                 userInputWdg = QDoubleSpinBox()
-                userInputWdg.valueChanged.connect(self.node.scene.NodeEditor.UpdateTextCode)
+                userInputWdg.valueChanged.connect(self.onUserInputChanged)
                 userInputWdg.setButtonSymbols(QAbstractSpinBox.NoButtons)
                 userInputWdg.setDecimals(6)
                 userInputWdg.setMinimum(float("-inf"))
@@ -272,7 +265,7 @@ class Socket(Serializable):
 
             elif self.socket_type == 2:
                 userInputWdg = QSpinBox()
-                userInputWdg.valueChanged.connect(self.node.scene.NodeEditor.UpdateTextCode)
+                userInputWdg.valueChanged.connect(self.onUserInputChanged)
                 userInputWdg.setButtonSymbols(QAbstractSpinBox.NoButtons)
                 userInputWdg.setRange(-1000000000, 1000000000)
                 sceneProxy = self.node.scene.grScene.addWidget(userInputWdg)
@@ -281,7 +274,7 @@ class Socket(Serializable):
 
             elif self.socket_type == 3:
                 userInputWdg = QCheckBox()
-                userInputWdg.stateChanged.connect(self.node.scene.NodeEditor.UpdateTextCode)
+                userInputWdg.stateChanged.connect(self.onUserInputChanged)
 
                 userInputWdg.setFixedSize(16,16)
                 sceneProxy = self.node.scene.grScene.addWidget(userInputWdg)
@@ -291,7 +284,7 @@ class Socket(Serializable):
 
             elif self.socket_type == 4:
                 userInputWdg = QLineEdit()
-                userInputWdg.textChanged.connect(self.node.scene.NodeEditor.UpdateTextCode)
+                userInputWdg.textChanged.connect(self.onUserInputChanged)
                 userInputWdg.setMaximumWidth(100)
                 sceneProxy = self.node.scene.grScene.addWidget(userInputWdg)
                 sceneProxy.setParentItem(self.node.grNode)
@@ -302,12 +295,69 @@ class Socket(Serializable):
 
             return userInputWdg
 
+    def onUserInputChanged(self, *args):
+        """Literal value typed into ``userInputWdg`` has changed. Store it and invalidate the code of our `Node`"""
+        super().setValue(self.getInputWidgetValue())
+        self.node.scene.has_been_modified = True
+        self.node.scene.NodeEditor.UpdateTextCode()
+
+    def getInputWidgetValue(self):
+        """
+        :return: literal value shown by ``userInputWdg`` or ``None`` if this `Socket` has no input widget
+        """
+        widget = self.userInputWdg
+        if isinstance(widget, (QDoubleSpinBox, QSpinBox)): return widget.value()
+        if isinstance(widget, QCheckBox): return widget.isChecked()
+        if isinstance(widget, QLineEdit): return widget.text()
+        return None
+
+    def updateInputWidget(self):
+        """Show the literal :py:attr:`value` in ``userInputWdg``, without reporting it back as a user change"""
+        widget = self.userInputWdg
+        if widget is None or self.value is None: return
+        blocker = QSignalBlocker(widget)
+        if isinstance(widget, QDoubleSpinBox): widget.setValue(float(self.value))
+        elif isinstance(widget, QSpinBox): widget.setValue(int(self.value))
+        elif isinstance(widget, QCheckBox): widget.setChecked(bool(self.value))
+        elif isinstance(widget, QLineEdit): widget.setText(str(self.value))
+        blocker.unblock()
+
+    def setValue(self, value):
+        """
+        Set the literal value used when this input is not connected and show it in ``userInputWdg``
+
+        :param value: ``float``, ``int``, ``bool`` or ``str`` according to the socket type
+        """
+        super().setValue(value)
+        self.updateInputWidget()
+
     def updateSocketCode(self):
         if len(self.socketEdges) == 0: return ""
         connecting_edge = self.socketEdges[0]
         other_socket = connecting_edge.getOtherSocket(self)
         return other_socket.socketName
 
+    @property
+    def socketName(self) -> str:
+        """Name of the `Node` of this `Socket`"""
+        return self.node.name
+
+    @property
+    def socketCode(self) -> str:
+        """
+        Assignment code of this `Socket`
+
+        :getter: ``name=value`` set by :py:meth:`setSocketCode`, ``socketName=socketValue`` by default
+        :type: ``str``
+        """
+        if self._socket_code is None: return "{}={}".format(self.socketName, self.socketValue)
+        return self._socket_code
+
+    @property
+    def SocketColor(self) -> 'QColor':
+        """Current color of the `Graphics Socket`"""
+        return self.grSocket._current_color
+
     def __str__(self):
         return "<Socket #%d %s %s..%s>" % (
             self.index, "ME" if self.is_multi_edges else "SE", hex(id(self))[2:5], hex(id(self))[-3:]
@@ -328,8 +378,7 @@ class Socket(Serializable):
         :return: Returns ``True`` if the socket type was actually changed
         :rtype: ``bool``
         """
-        if self.socket_type != new_socket_type:
-            self.socket_type = new_socket_type
+        if super().changeSocketType(new_socket_type):
             self.grSocket.changeSocketType()
             return True
         return False
@@ -357,24 +406,38 @@ class Socket(Serializable):
         :return: ``True`` if any :class:`~nodeeditor.node_edge.Edge` is connected to this socket
         :rtype: ``bool``
         """
-        hasAnyEdges = len(self.socketEdges) > 0
+        hasAnyEdges = super().hasAnyEdge()
         if hasAnyEdges:
             if self.userInputWdg is not None : self.userInputWdg.hide()
         else:
             if self.userInputWdg is not None :self.userInputWdg.show()
         return hasAnyEdges
 
-    def isConnected(self, edge: 'Edge') -> bool:
+    @contextmanager
+    def batchConnectionUpdates(self):
         """
-        Returns ``True`` if :class:`~nodeeditor.node_edge.Edge` is connected to this `Socket`
+        Context manager connecting or disconnecting many `Edges` of this `Socket` with a single
+        :py:meth:`updateConnectionState` at the end of the outermost block::
 
-        :param edge: :class:`~nodeeditor.node_edge.Edge` to check if it is connected to this `Socket`
-        :type edge: :class:`~nodeeditor.node_edge.Edge`
-        :return: ``True`` if `Edge` is connected to this socket
-        :rtype: ``bool``
+            with socket.batchConnectionUpdates():
+                for edge in edges: edge.remove()
         """
-
-        return edge in self.socketEdges
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0: self.updateConnectionState()
+
+    def onEdgesChanged(self):
+        """Refresh the connection state, once at the end of a :py:meth:`batchConnectionUpdates` block"""
+        if not self._batch_depth: self.updateConnectionState()
+
+    def updateConnectionState(self):
+        """Refresh the connected state of the `Graphics Socket` and the input widget, and invalidate the code of
+        our `Node`"""
+        self.grSocket.isConnected = self.hasAnyEdge()
+        self.node.markCodeDirty()
 
     def addEdge(self, edge: 'Edge'):
         """
@@ -383,8 +446,7 @@ class Socket(Serializable):
         :param edge: :class:`~nodeeditor.node_edge.Edge` to connect to this `Socket`
         :type edge: :class:`~nodeeditor.node_edge.Edge`
         """
-        self.socketEdges.append(edge)
-        self.grSocket.isConnected = self.hasAnyEdge()
+        super().addEdge(edge)
 
     def removeEdge(self, edge: 'Edge'):
         """
@@ -393,56 +455,27 @@ class Socket(Serializable):
         :type edge: :class:`~nodeeditor.node_edge.Edge`
         """
         if edge in self.socketEdges:
-            self.socketEdges.remove(edge)
-            self.grSocket.isConnected = self.hasAnyEdge()
+            super().removeEdge(edge)
         else:
             if DEBUG_REMOVE_WARNINGS:
                 print("!W:", "Socket::removeEdge", "wanna remove edge", edge,
                       "from self.edges but it's not in the list!")
-            self.grSocket.isConnected = self.hasAnyEdge()
+            if not self._batch_depth: self.grSocket.isConnected = self.hasAnyEdge()
 
     def removeAllEdges(self, silent: bool = False):
         """Disconnect all `Edges` from this `Socket`"""
-        while self.socketEdges:
-            edge = self.socketEdges.pop(0)
-            if silent:
-                edge.remove(silent_for_socket=self)
-            else:
-                edge.remove()  # just remove all with notifications
-        self.grSocket.isConnected = self.hasAnyEdge()
-
-    def determineMultiEdges(self, data: dict) -> bool:
-        """
-        Deserialization helper function. In our tutorials we created a new version of graph data format.
-        This function is here to help solve the issue of opening older files in the newer format.
-        If the 'multi_edges' param is missing in the dictionary, we determine if this `Socket`
-        should support multiple `Edges`.
-
-        :param data: `Socket` data in ``dict`` format for deserialization
-        :type data: ``dict``
-        :return: ``True`` if this `Socket` should support multi_edges
-        """
-        if 'multi_edges' in data:
-            return data['multi_edges']
-        else:
-            # probably older version of file, make RIGHT socket multi edged by default
-            return data['position'] in (RIGHT_BOTTOM, RIGHT_TOP)
+        with self.batchConnectionUpdates():
+            for edge in self.socketEdges.copy():
+                if silent:
+                    edge.remove(silent_for_socket=self)
+                else:
+                    edge.remove()  # just remove all with notifications
 
     def setSocketCode(self, name: str, code: str):
-        self.socketCode = "{}={}".format(name, code)
-
-    def serialize(self) -> OrderedDict:
-        return OrderedDict([
-            ('id', self.id),
-            ('index', self.index),
-            ('multi_edges', self.is_multi_edges),
-            ('position', self.position),
-            ('socket_type', self.socket_type),
-        ])
+        self._socket_code = "{}={}".format(name, code)
 
     def deserialize(self, data: dict, hashmap: dict = {}, restore_id: bool = True) -> bool:
-        if restore_id: self.id = data['id']
-        self.is_multi_edges = self.determineMultiEdges(data)
-        self.changeSocketType(data['socket_type'])
-        hashmap[data['id']] = self
-        return True
+        if restore_id: self.node.scene.changeSocketID(self, data['id'])
+        res = super().deserialize(data, hashmap, restore_id=False)
+        self.updateInputWidget()
+        return res
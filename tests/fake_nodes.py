@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""Stand-ins for the `Nodes`, `Sockets` and `Edges` read by the code IR, shared by the code tests."""
+
+from nodeeditor.node_code import Literal, Call, ExprStmt, Flow
+
+
+class FakeNode():
+    """Stand-in for a `Node` exposing what the emitters and the passes need."""
+
+    def __init__(self, name=None):
+        self.id = id(self)
+        self.name = name
+
+
+class FakeSocket():
+    """Stand-in for an output `Socket` connected to `target`."""
+
+    def __init__(self, target=None):
+        self.socketEdges = [FakeEdge(target)] if target is not None else []
+
+
+class FakeEdge():
+    """Stand-in for an `Edge` ending at `target`."""
+
+    def __init__(self, target):
+        self.end_socket = FakeTarget(target)
+
+    def getOtherSocket(self, socket):
+        return self.end_socket
+
+
+class FakeTarget():
+    """Stand-in for the input `Socket` of `node`."""
+
+    def __init__(self, node):
+        self.node = node
+
+
+class FakeChainNode(FakeNode):
+    """Statement `Node` printing its index and continuing with the next `Node`."""
+
+    def __init__(self, index, next_node=None):
+        super().__init__("Print %d" % index)
+        self.index = index
+        self.next_node = next_node
+        self.code = None
+
+    def markCodeDirty(self):
+        self.code = None
+
+    def getCachedNodeCode(self):
+        if self.code is None:
+            self.code = [ExprStmt(Call("print", [Literal(self.index)]), self), Flow(FakeSocket(self.next_node), self)]
+        return self.code
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_code_scheduler` module."""
+
+
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+from nodeeditor.node_code_scheduler import CodeRefreshScheduler
+
+
+class TestCodeRefreshScheduler(unittest.TestCase):
+    """Tests for coalescing code view updates."""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.app = QApplication.instance() or QApplication([])
+        self.calls = []
+        self.scheduler = CodeRefreshScheduler(lambda: self.calls.append(1))
+
+    def test_000_requests_are_coalesced(self):
+        """Test if many requests in one event loop turn regenerate only once."""
+        for i in range(10): self.scheduler.requestUpdate()
+        assert(self.calls == [])
+        self.app.processEvents()
+        assert(len(self.calls) == 1)
+        assert(self.scheduler.last_coalesced == 9)
+        assert(self.scheduler.coalesced_requests == 9)
+
+    def test_001_flush(self):
+        """Test if flush regenerates only a stale view."""
+        assert(not self.scheduler.flush())
+        self.scheduler.requestUpdate()
+        assert(self.scheduler.flush())
+        self.app.processEvents()
+        assert(len(self.calls) == 1)
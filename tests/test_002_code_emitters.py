@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_code` module."""
+
+
+import unittest
+
+from nodeeditor.node_code import (Literal, Raw, Name, BinOp, Call, ExprStmt, Assign, If, For, Flow, FunctionDef,
+                                  PythonEmitter, RichTextEmitter, RootCodeCache, pythonProgram)
+
+from tests.fake_nodes import FakeNode, FakeSocket, FakeChainNode
+
+
+class TestCodeEmitters(unittest.TestCase):
+    """Tests for emitting the code IR."""
+
+    def test_000_python(self):
+        """Test if plain Python is not escaped and nested blocks are indented."""
+        block = [FunctionDef("main", [
+            If(BinOp(Name("a"), ">", Literal(1.0)), [ExprStmt(Call("print", [Raw('"big"')]))], []),
+            Assign(Name("b"), BinOp(Literal(True), "and", Literal(False))),
+        ])]
+        assert(PythonEmitter().emit(block) ==
+               'def main():\n'
+               '    if (a>1.0):\n'
+               '        print("big")\n'
+               '    else:\n'
+               '        pass\n'
+               '    b = (True and False)')
+
+    def test_001_rich_text(self):
+        """Test if rich text is escaped and the source map counts plain text columns."""
+        statement, compare = FakeNode(), FakeNode()
+        emitter = RichTextEmitter()
+        html = emitter.emit([If(BinOp(Name("a"), "<", Name("b"), compare), [], [], statement)])
+        assert('if (a&lt;b):' in html)
+        assert(emitter.source_map.getRanges(compare.id) == [(0, 3, 8)])
+        assert(emitter.source_map.getRanges(statement.id) == [(0, 0, 9), (2, 0, 5)])
+        assert(emitter.source_map.getNodeAt(0, 4) is compare)
+        assert(emitter.source_map.getNodeAt(0) is statement)
+        assert(emitter.source_map.getNodeAt(1) is None)
+
+    def test_002_deep_chain(self):
+        """Test if a chain longer than the recursion limit is emitted with nested indentation levels."""
+        last = None
+        for index in reversed(range(5000)):
+            last = FakeChainNode(index, last)
+        block = [For("i", Literal(0), Literal(3), [Flow(FakeSocket(last))])]
+        lines = PythonEmitter().emit(block).split("\n")
+        assert(len(lines) == 5001)
+        assert(lines[0] == "for i in range(0, 3):")
+        assert(lines[-1] == "    print(4999)")
+
+    def test_003_cycle(self):
+        """Test if an execution cycle is reported instead of being followed forever."""
+        first = FakeChainNode(0)
+        second = FakeChainNode(1, first)
+        first.next_node = second
+        emitter = PythonEmitter()
+        code = emitter.emit(first.getCachedNodeCode(), first)
+        assert(code == "print(0)\nprint(1)\n# execution loops back to Print 0")
+        assert(emitter.cycles == [first])
+
+    def test_004_root_cache(self):
+        """Test if a root is emitted again only when its code or the code it flows into changes."""
+        second = FakeChainNode(1)
+        first = FakeChainNode(0, second)
+        other = FakeChainNode(2)
+        cache = RootCodeCache(PythonEmitter())
+
+        def emit():
+            roots = [(first, first.getCachedNodeCode()), (other, other.getCachedNodeCode())]
+            return [text for node, text, source_map in cache.emitRoots(roots)]
+
+        assert(emit() == ["print(0)\nprint(1)", "print(2)"])
+        assert(cache.emitted_roots == 2)
+        assert(emit() == ["print(0)\nprint(1)", "print(2)"])
+        assert(cache.emitted_roots == 0)
+
+        second.index = 5
+        second.markCodeDirty()
+        assert(emit() == ["print(0)\nprint(5)", "print(2)"])
+        assert(cache.emitted_roots == 1)
+
+        # disconnecting changes where the flow leads, not the code of the root
+        first.getCachedNodeCode()[1].socket.socketEdges = []
+        assert(emit() == ["print(0)", "print(2)"])
+        assert(cache.emitted_roots == 1)
+
+    def test_005_program_source_map(self):
+        """Test if the source map of a program follows the blank lines between the roots."""
+        first, second, empty = FakeChainNode(0, FakeChainNode(1)), FakeChainNode(2), FakeNode()
+        roots = [(first, first.getCachedNodeCode()), (empty, []), (second, second.getCachedNodeCode())]
+        code, source_map = pythonProgram(roots)
+        assert(code == "print(0)\nprint(1)\n\nprint(2)\n")
+        assert(len(source_map) == 4)
+        assert(source_map.getNodeAt(2) is None)
+        assert(source_map.getNodeAt(3) is second)
+        assert(source_map.getRanges(second.id)[0][0] == 3)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_code_view` module."""
+
+
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+from nodeeditor.node_code_view import QDMCodeView
+
+
+def fragment(key, *lines):
+    return key, "<pre>%s</pre>" % "\n".join(lines)
+
+
+class TestCodeView(unittest.TestCase):
+    """Tests for incremental updates of the code view."""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.app = QApplication.instance() or QApplication([])
+        self.view = QDMCodeView()
+        self.view.setFragments([fragment(1, "a = 1"), fragment(2, "def b():", "    pass"), fragment(3, "c()")])
+
+    def test_000_only_changed_fragment_is_replaced(self):
+        """Test if changing one root replaces only its fragment."""
+        self.view.setFragments([fragment(1, "a = 1"), fragment(2, "def b():", "    print(b)"), fragment(3, "c()")])
+        assert(self.view.replaced_fragments == 2)
+        assert(self.view.toFragmentText(2) == "def b():\n    print(b)")
+        assert(self.view.toPlainText() == "a = 1\n\ndef b():\n    print(b)\n\nc()\n\n")
+        # one block per line and a blank block after each root, like the lines of the generated file
+        assert(self.view.document().findBlockByNumber(3).text() == "    print(b)")
+
+    def test_001_insert_and_remove(self):
+        """Test if roots can be added and removed."""
+        self.view.setFragments([fragment(1, "a = 1"), fragment(4, "d()"), fragment(3, "c()")])
+        assert(self.view.toPlainText() == "a = 1\n\nd()\n\nc()\n\n")
+        self.view.setFragments([fragment(3, "c()")])
+        assert(self.view.toPlainText() == "c()\n\n")
+        self.view.setFragments([fragment(3, "c()")])
+        assert(self.view.replaced_fragments == 0)
+
+    def test_002_fragments_are_matched_by_key(self):
+        """Test if changes at both ends keep the unchanged fragments between them."""
+        self.view.setFragments([fragment(0, "z()"), fragment(2, "def b():", "    pass"), fragment(3, "c(1)")])
+        assert(self.view.replaced_fragments == 4)
+        assert(self.view.toPlainText() == "z()\n\ndef b():\n    pass\n\nc(1)\n\n")
+        self.view.setFragments([fragment(3, "c(1)"), fragment(2, "def b():", "    pass")])
+        assert(self.view.toPlainText() == "c(1)\n\ndef b():\n    pass\n\n")
+        assert([key for key, html, length in self.view.fragments] == [3, 2])
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `examples.example_calculator.graph_compiler` module."""
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from examples.example_calculator.graph_compiler import compileGraph, compileGraphProgram, compileDirectory
+
+EXAMPLE_GRAPH = os.path.join(os.path.dirname(__file__), "..", "examples", "example_calculator", "333.json")
+
+
+class TestGraphCompiler(unittest.TestCase):
+    """Tests for compiling graphs without Qt."""
+
+    def test_000_compile_saved_graph(self):
+        """Test if a saved graph with variable setters compiles without creating any widget."""
+        code = compileGraph(EXAMPLE_GRAPH)
+        assert(code ==
+               'if False:\n'
+               '    float3 = 0.0\n'
+               '    print()\n'
+               '    float = 0.0\n'
+               'else:\n'
+               '    pass\n')
+
+    def test_001_compile_directory(self):
+        """Test if a project directory compiles in parallel with ordered results and reported errors."""
+        directory = tempfile.mkdtemp()
+        try:
+            for name in ("b.json", "a.json", os.path.join("AutoSave", "c.json")):
+                os.makedirs(os.path.dirname(os.path.join(directory, name)), exist_ok=True)
+                shutil.copy(EXAMPLE_GRAPH, os.path.join(directory, name))
+            with open(os.path.join(directory, "broken.json"), "w") as file: file.write("{")
+
+            results = compileDirectory(directory, jobs=2)
+            assert([os.path.basename(result[0]) for result in results] == ["a.json", "b.json", "broken.json"])
+            assert(results[2][1] is None and "InvalidFile" in results[2][2])
+            with open(os.path.join(directory, "Generated Scripts", "a.py")) as file:
+                assert(file.read() == compileGraph(EXAMPLE_GRAPH))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_002_source_map(self):
+        """Test if the source map of a compiled graph links the lines of the script to the nodes."""
+        code, source_map = compileGraphProgram(EXAMPLE_GRAPH)
+        assert(code == compileGraph(EXAMPLE_GRAPH))
+        assert(len(source_map) == len(code.splitlines()))
+        assert([node.name if node is not None else None for node in map(source_map.getNodeAt, range(6))] ==
+               ['IF Statement', 'float3', 'Print', 'float', 'IF Statement', None])
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_code_passes` module."""
+
+
+import unittest
+
+from nodeeditor.node_code import Literal, Name, BinOp, Call, ExprStmt, PythonEmitter
+from nodeeditor.node_code_passes import CommonSubexpressionPass, ConstantFoldingPass
+
+from tests.fake_nodes import FakeNode
+
+
+class TestCommonSubexpressionPass(unittest.TestCase):
+    """Tests for hoisting shared expressions."""
+
+    def emit(self, block):
+        return PythonEmitter(passes=[CommonSubexpressionPass()]).emit(block)
+
+    def test_000_diamond(self):
+        """Test if a deep diamond of shared operations is emitted once per operation."""
+        shared = BinOp(Name("a"), "+", Literal(1))
+        for i in range(50): shared = BinOp(shared, "*", shared)
+        statement = ExprStmt(Call("print", [shared]))
+        lines = self.emit([statement]).split("\n")
+        assert(len(lines) == 51)
+        assert(lines[0] == "_cse0 = (a+1)")
+        assert(lines[-1] == "print((_cse49*_cse49))")
+        assert(statement.value.args[0] is shared)
+
+    def test_001_short_circuit(self):
+        """Test if operands evaluated only by a short-circuit operator are not hoisted."""
+        x = BinOp(Name("a"), "+", Literal(1))
+        statement = ExprStmt(BinOp(BinOp(x, ">", Literal(0)), "and", BinOp(x, "<", Literal(9))))
+        assert(self.emit([statement]) == "(((a+1)>0) and ((a+1)<9))")
+
+    def test_002_impure(self):
+        """Test if function calls are never hoisted."""
+        x = BinOp(Call("input"), "+", Literal(1))
+        assert(self.emit([ExprStmt(BinOp(x, "*", x))]) == "((input()+1)*(input()+1))")
+
+    def test_003_side_effects(self):
+        """Test if operations are not hoisted before a call evaluated ahead of them."""
+        x = BinOp(Name("a"), "+", Literal(1))
+        after = ExprStmt(BinOp(Call("f"), "+", BinOp(x, "*", x)))
+        assert(self.emit([after]) == "(f()+((a+1)*(a+1)))")
+        before = ExprStmt(BinOp(BinOp(x, "*", x), "+", Call("f")))
+        assert(self.emit([before]) == "_cse0 = (a+1)\n((_cse0*_cse0)+f())")
+
+
+class TestConstantFoldingPass(unittest.TestCase):
+    """Tests for folding operations on constants."""
+
+    def test_000_fold(self):
+        """Test if nested constant operations fold and remember their nodes."""
+        code_pass = ConstantFoldingPass()
+        add_node, mul_node = FakeNode("add"), FakeNode("mul")
+        add = BinOp(Literal(2.0), "+", Literal(3.0), add_node)
+        mul = BinOp(add, "*", Literal(4.0), mul_node)
+        statement = ExprStmt(Call("print", [BinOp(mul, ">", Name("a"))]))
+        folded = code_pass.run(statement)[0]
+        assert(PythonEmitter().emit([folded]) == "print((20.0>a))")
+        assert(folded.value.args[0].left.origins == [mul_node, add_node])
+        assert(statement.value.args[0].left is mul)
+
+    def test_001_unsafe(self):
+        """Test if operations failing at run time are not folded."""
+        statement = ExprStmt(BinOp(Literal(1.0), "/", BinOp(Literal(2.0), "-", Literal(2.0))))
+        folded = ConstantFoldingPass().run(statement)[0]
+        assert(PythonEmitter().emit([folded]) == "(1.0/0.0)")
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_ordered_set` module."""
+
+
+import unittest
+
+from nodeeditor.node_ordered_set import OrderedSet
+
+
+class Item():
+    """Hashable by identity like `Nodes` and `Edges`."""
+
+    def __init__(self, name):
+        self.name = name
+
+
+class TestOrderedSet(unittest.TestCase):
+    """Tests for the container of scene `Nodes` and `Edges`."""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.items = [Item(i) for i in range(5)]
+        self.container = OrderedSet()
+        for item in self.items: self.container.append(item)
+
+    def test_000_list_api(self):
+        """Test if the read API behaves like the former list."""
+        assert(len(self.container) == 5)
+        assert(list(self.container) == self.items)
+        assert(self.container[0] is self.items[0])
+        assert(self.container[-1] is self.items[-1])
+        assert(self.container[1:3] == self.items[1:3])
+        assert(self.container.index(self.items[3]) == 3)
+        assert(self.items[2] in self.container)
+        assert(self.container.copy() == self.items)
+
+    def test_001_remove_keeps_order(self):
+        """Test if removing items keeps the insertion order of the others."""
+        self.container.remove(self.items[1])
+        self.container.remove(self.items[3])
+        self.container.append(self.items[1])
+        assert(list(self.container) == [self.items[0], self.items[2], self.items[4], self.items[1]])
+        self.assertRaises(ValueError, self.container.remove, self.items[3])
+        self.assertRaises(ValueError, self.container.index, self.items[3])
+
+    def test_002_remove_while_iterating_copy(self):
+        """Test if all items can be removed while iterating a copy."""
+        for item in self.container.copy(): self.container.remove(item)
+        assert(not self.container)
+
+    def test_003_swap(self):
+        """Test if swapping positions changes the iteration order."""
+        self.container.swap(0, 4)
+        assert(self.container[0] is self.items[4] and self.container[4] is self.items[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
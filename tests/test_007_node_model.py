@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_model` module."""
+
+
+import json
+import os
+import unittest
+
+from nodeeditor.node_model import SceneModel, EdgeModel, NO_EDGES, EDGE_SET_THRESHOLD, sortSocketsData
+
+EXAMPLE_GRAPH = os.path.join(os.path.dirname(__file__), "..", "examples", "example_calculator", "333.json")
+
+
+class TestSceneModel(unittest.TestCase):
+    """Tests for loading graphs without Qt."""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.scene = SceneModel()
+        self.scene.loadFromFile(EXAMPLE_GRAPH)
+
+    def test_000_round_trip(self):
+        """Test if a loaded graph serializes back to the same nodes and edges."""
+        with open(EXAMPLE_GRAPH) as file: data = json.load(file)
+        saved = self.scene.serialize()
+        assert([node['id'] for node in saved['nodes']] == [node['id'] for node in data['nodes']])
+        assert(saved['edges'] == data['edges'])
+
+    def test_001_indexes(self):
+        """Test if nodes, edges and sockets are found by id and removing a node unregisters it."""
+        for edge in self.scene.edges:
+            assert(self.scene.getEdgeByID(edge.id) is edge)
+            assert(self.scene.getSocketByID(edge.start_socket.id) is edge.start_socket)
+        node = self.scene.nodes[0]
+        assert(self.scene.getNodeByID(node.id) is node)
+        self.scene.removeNode(node)
+        assert(self.scene.getNodeByID(node.id) is None and node not in self.scene.nodes)
+        assert(all(self.scene.getSocketByID(socket.id) is None for socket in node.inputs + node.outputs))
+
+    def test_002_socket_values(self):
+        """Test if literal values of inputs are saved, loaded and used by the code."""
+        node = next(node for node in self.scene.nodes if any(socket.socket_type == 1 for socket in node.inputs))
+        socket = next(socket for socket in node.inputs if socket.socket_type == 1)
+        socket.setValue(2.5)
+        loaded = SceneModel()
+        loaded.deserialize(self.scene.serialize())
+        assert(loaded.getSocketByID(socket.id).value == 2.5)
+        assert(any(socket_data.get('value') == 2.5 for node_data in loaded.serialize()['nodes']
+                   for socket_data in node_data['inputs']))
+
+    def test_003_sockets_order(self):
+        """Test if serialized sockets are ordered by position and index, and ordered data is kept as it is."""
+        sockets_data = [{'position': 4, 'index': 0}, {'position': 1, 'index': 1}, {'position': 1, 'index': 0}]
+        assert(sortSocketsData(sockets_data) is sockets_data)
+        assert([(data['position'], data['index']) for data in sockets_data] == [(1, 0), (1, 1), (4, 0)])
+        ordered = list(sockets_data)
+        sortSocketsData(sockets_data)
+        assert(all(a is b for a, b in zip(ordered, sockets_data)))
+
+    def test_004_old_file_without_multi_edges(self):
+        """Test if sockets saved without 'multi_edges' are loaded with the default of their position."""
+        data = self.scene.serialize()
+        for node_data in data['nodes']:
+            for socket_data in node_data['inputs'] + node_data['outputs']: del socket_data['multi_edges']
+        loaded = SceneModel()
+        loaded.deserialize(data)
+        for node in loaded.nodes:
+            for socket in node.inputs + node.outputs:
+                assert(socket.is_multi_edges == (socket.position in (4, 6)))
+
+    def test_005_remove_edge(self):
+        """Test if a removed edge leaves its sockets and the graph index."""
+        edge = self.scene.edges[0]
+        start, end = edge.start_socket, edge.end_socket
+        assert(end.node in self.scene.graph.successors(start.node))
+        self.scene.removeEdge(edge)
+        assert(edge.start_socket is None and edge.end_socket is None)
+        assert(edge not in start.socketEdges and edge not in end.socketEdges)
+        assert(end.node not in self.scene.graph.successors(start.node))
+
+    def test_006_socket_edges_storage(self):
+        """Test if sockets share one empty edge set and keep the connection order whatever the storage."""
+        start, end = self.scene.edges[0].start_socket, self.scene.edges[0].end_socket
+        free = [socket for node in self.scene.nodes for socket in node.inputs + node.outputs if not socket.hasAnyEdge()]
+        assert(free and all(socket.socketEdges is NO_EDGES for socket in free))
+
+        edges = [EdgeModel(start, end) for i in range(EDGE_SET_THRESHOLD * 2)]
+        assert(list(start.socketEdges)[-len(edges):] == edges and start.socketEdges[-1] is edges[-1])
+        for edge in list(self.scene.edges) + edges: edge.detach()
+        assert(start.socketEdges is NO_EDGES and end.socketEdges is NO_EDGES and not NO_EDGES)
+
+
+def socketData(socket_id: int, position: int, value=None) -> dict:
+    """Return the serialized data socket `socket_id`."""
+    data = {'id': socket_id, 'index': 0, 'multi_edges': position == 4, 'position': position, 'socket_type': 1}
+    if value is not None: data['value'] = value
+    return data
+
+
+def nodeData(node_id: int, name: str, has_input: bool, has_output: bool) -> dict:
+    """Return the serialized node `node_id` with one data input and one data output at most."""
+    return {'id': node_id, 'name': name, 'pos_x': 0.0, 'pos_y': 0.0,
+            'inputs': [socketData(node_id * 10 + 1, 1, 1.0)] if has_input else [],
+            'outputs': [socketData(node_id * 10 + 2, 4)] if has_output else [],
+            'is_var': False, 'is_setter': None}
+
+
+class TestNodeCodeCache(unittest.TestCase):
+    """Tests for regenerating the code of the nodes changed since it was cached."""
+
+    def setUp(self):
+        """Set up test fixtures, if any. Chain A -> B -> C, D is not connected."""
+        self.calls = []
+
+        def code(node):
+            self.calls.append(node.name)
+            return (node.name, node.NodeCodeAtInput(0) if node.inputs else None)
+
+        self.scene = SceneModel(lambda node_data: code)
+        self.scene.deserialize({
+            'id': 1000, 'user_vars': [], 'user_events': [],
+            'nodes': [nodeData(1, "A", False, True), nodeData(2, "B", True, True), nodeData(3, "C", True, False),
+                      nodeData(4, "D", True, False)],
+            'edges': [{'id': 100, 'edge_type': 1, 'start': 12, 'end': 21},
+                      {'id': 101, 'edge_type': 1, 'start': 22, 'end': 31}],
+        })
+        self.a, self.b, self.c, self.d = self.scene.nodes
+        assert(self.recomputed() == ["A", "B", "C", "D"])
+
+    def recomputed(self) -> list:
+        """Return the names of the nodes whose code is generated again when all the code is asked for."""
+        del self.calls[:]
+        for node in self.scene.nodes: node.getCachedNodeCode()
+        return sorted(self.calls)
+
+    def test_000_unchanged(self):
+        """Test if nothing is generated again when nothing changed."""
+        versions = [node._code_version for node in self.scene.nodes]
+        assert(self.recomputed() == [])
+        assert([node._code_version for node in self.scene.nodes] == versions)
+
+    def test_001_literal(self):
+        """Test if editing a literal value regenerates only its node, and its consumers."""
+        version = self.d._code_version
+        self.d.inputs[0].setValue(2.0)
+        assert(self.d._code_version > version)
+        assert(self.recomputed() == ["D"])
+
+        self.b.inputs[0].setValue(2.0)
+        assert(self.recomputed() == ["B", "C"])
+
+    def test_002_rename(self):
+        """Test if renaming a node regenerates the nodes embedding its code and keeps the unrelated ones."""
+        version = self.a._code_version
+        self.a.name = "A2"
+        assert(self.a._code_version > version)
+        assert(self.recomputed() == ["A2", "B", "C"])
+        assert(self.c.getCachedNodeCode()[1][1][0] == "A2")
+
+    def test_003_connect_and_disconnect(self):
+        """Test if connecting and disconnecting an edge regenerates the nodes on both ends and their consumers."""
+        edge = EdgeModel(self.b.outputs[0], self.d.inputs[0])
+        self.scene.addEdge(edge)
+        assert(self.recomputed() == ["B", "C", "D"])
+        assert(self.d.getCachedNodeCode()[1][0] == "B")
+
+        self.scene.removeEdge(self.scene.getEdgeByID(100))
+        assert(self.recomputed() == ["A", "B", "C", "D"])
+        assert(self.b.getCachedNodeCode()[1] != self.a.getCachedNodeCode())
+
+        self.scene.removeEdge(edge)
+        assert(self.recomputed() == ["B", "C", "D"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_graph_index` module."""
+
+
+import unittest
+
+from nodeeditor.node_graph_index import LINK_EXEC, LINK_DATA
+from nodeeditor.node_model import SceneModel, NodeModel, SocketModel, EdgeModel
+
+
+class TestGraphIndex(unittest.TestCase):
+    """Tests for the adjacency index of a scene."""
+
+    def setUp(self):
+        """Set up test fixtures, if any. Nodes have an exec and a data socket on both sides."""
+        self.scene = SceneModel()
+        self.nodes = []
+        for i in range(4):
+            node = NodeModel(self.scene)
+            node.inputs = [SocketModel(node, 0, socket_type=0, is_input=True),
+                           SocketModel(node, 1, socket_type=1, is_input=True)]
+            node.outputs = [SocketModel(node, 0, socket_type=0), SocketModel(node, 1, socket_type=1)]
+            self.scene.addNode(node)
+            self.nodes.append(node)
+        self.graph = self.scene.graph
+
+    def connect(self, source, target, index=0):
+        edge = EdgeModel(self.nodes[source].outputs[index], self.nodes[target].inputs[index])
+        self.scene.addEdge(edge)
+        return edge
+
+    def test_000_queries(self):
+        """Test if successors, closures, roots and topological order follow the links."""
+        self.connect(2, 1)
+        self.connect(1, 0)
+        self.connect(3, 0, index=1)
+        assert(self.graph.successors(self.nodes[2]) == [self.nodes[1]])
+        assert(self.graph.upstream(self.nodes[0]) == {self.nodes[1], self.nodes[2], self.nodes[3]})
+        assert(self.graph.upstream(self.nodes[0], LINK_EXEC) == {self.nodes[1], self.nodes[2]})
+        assert(self.graph.downstream(self.nodes[3], LINK_DATA) == {self.nodes[0]})
+        assert(self.graph.roots(LINK_EXEC) == [self.nodes[2], self.nodes[3]])
+        assert(self.graph.topologicalOrder() == [self.nodes[2], self.nodes[3], self.nodes[1], self.nodes[0]])
+        assert(self.nodes[3].getCodeConsumers() == [self.nodes[0]])
+        assert(not self.graph.hasCycle())
+
+    def test_001_incremental_updates(self):
+        """Test if disconnecting, reconnecting and removing nodes update the cached results."""
+        edge = self.connect(0, 1)
+        assert(self.graph.downstream(self.nodes[0]) == {self.nodes[1]})
+        edge.end_socket = self.nodes[2].inputs[0]
+        assert(self.graph.downstream(self.nodes[0]) == {self.nodes[2]})
+        edge.end_socket = None
+        assert(self.graph.downstream(self.nodes[0]) == frozenset())
+        self.connect(0, 3)
+        self.scene.removeNode(self.nodes[3])
+        assert(self.graph.successors(self.nodes[0]) == [] and not self.graph.links)
+
+    def test_002_cycles(self):
+        """Test if cycles are reported and their nodes ordered last."""
+        self.connect(0, 1)
+        self.connect(1, 2)
+        self.connect(2, 1, index=1)
+        assert(self.graph.cycles() == [[self.nodes[1], self.nodes[2]]])
+        assert(self.graph.cycles(LINK_EXEC) == [])
+        assert(self.graph.topologicalOrder()[:2] == [self.nodes[0], self.nodes[3]])
+        assert(self.nodes[1] in self.graph.downstream(self.nodes[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
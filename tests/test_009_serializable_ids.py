@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the id allocator of `nodeeditor.node_serializable` module."""
+
+
+import copy
+import json
+import os
+import unittest
+
+from nodeeditor.node_model import SceneModel, NodeModel
+from nodeeditor.node_serializable import newID, reserveID, MAX_ID
+
+EXAMPLE_GRAPH = os.path.join(os.path.dirname(__file__), "..", "examples", "example_calculator", "333.json")
+
+
+class TestSerializableIDs(unittest.TestCase):
+    """Tests for the process-wide allocation of ids."""
+
+    def test_000_allocation(self):
+        """Test if ids are increasing and never reuse a reserved or freed one."""
+        first = newID()
+        reserved = first + 1000
+        assert(reserveID(reserved))
+        assert(newID() > reserved)
+        assert(not reserveID(MAX_ID + 1) and not reserveID(0))
+        freed = NodeModel(SceneModel()).id
+        assert(all(NodeModel(SceneModel()).id != freed for i in range(100)))
+
+    def test_001_remap_on_load(self):
+        """Test if a node id duplicated in the data is remapped while the edges keep their sockets."""
+        with open(EXAMPLE_GRAPH) as file: data = json.load(file)
+        duplicate = copy.deepcopy(data['nodes'][0])
+        for socket_data in duplicate['inputs'] + duplicate['outputs']: socket_data['id'] += 1
+        data['nodes'].append(duplicate)
+
+        scene = SceneModel()
+        scene.deserialize(data)
+        ids = [node.id for node in scene.nodes]
+        assert(len(set(ids)) == len(ids) == len(data['nodes']))
+        assert(all(scene.getNodeByID(node.id) is node for node in scene.nodes))
+        saved = scene.serialize()
+        assert(saved['edges'] == data['edges'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_json` module."""
+
+
+import io
+import json
+import os
+import unittest
+
+from nodeeditor import node_json
+from nodeeditor.node_json import dumpJSON, loadJSON, IncrementalJSONReader
+
+EXAMPLE_GRAPH = os.path.join(os.path.dirname(__file__), "..", "examples", "example_calculator", "333.json")
+
+
+class TestJSON(unittest.TestCase):
+    """Tests for the compact streaming JSON writer."""
+
+    def setUp(self):
+        """Set up test fixtures, if any. The example graph is saved indented by a former version."""
+        with open(EXAMPLE_GRAPH, "rb") as file: self.data = loadJSON(file)
+        self.backends = (node_json.orjson, node_json.ujson)
+
+    def tearDown(self):
+        """Restore the installed backends."""
+        node_json.orjson, node_json.ujson = self.backends
+
+    def dumped(self, indent=None) -> bytes:
+        file = io.BytesIO()
+        dumpJSON(self.data, file, indent)
+        return file.getvalue()
+
+    def test_000_compact(self):
+        """Test if the compact output holds the same data and is smaller than the indented one."""
+        compact = self.dumped()
+        assert(json.loads(compact) == self.data)
+        assert(len(compact) * 2 < len(self.dumped(indent=4)))
+
+    def test_001_standard_library_fallback(self):
+        """Test if the standard library writes and reads the same data when no faster backend is installed."""
+        node_json.orjson = node_json.ujson = None
+        compact = self.dumped()
+        assert(compact == json.dumps(self.data, separators=(',', ':')).encode('utf-8'))
+        assert(loadJSON(io.BytesIO(compact)) == self.data)
+
+    def test_002_incremental_reader(self):
+        """Test if the incremental reader decodes list items one by one and rejects a truncated document."""
+        for raw_data in (self.dumped(), self.dumped(indent=4)):
+            reader = IncrementalJSONReader(raw_data)
+            data = {}
+            for key, value in reader.items():
+                if key == 'nodes':
+                    data[key] = []
+                    for node_data in value:
+                        data[key].append(node_data)
+                        assert(0 < reader.progress < 1)
+                else:
+                    data[key] = list(value) if key in ('edges', 'user_vars', 'user_events') else value
+            assert(data == self.data)
+        reader = IncrementalJSONReader(self.dumped()[:-10])
+        with self.assertRaises(ValueError):
+            for key, value in reader.items():
+                if key == 'nodes': list(value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_scene_binary` module."""
+
+
+import json
+import os
+import struct
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+from nodeeditor.node_model import SceneModel, InvalidFile
+from nodeeditor.node_scene_binary import dumpsBinary, loadsBinary, MAGIC, _HEADER
+
+EXAMPLE_GRAPH = os.path.join(os.path.dirname(__file__), "..", "examples", "example_calculator", "333.json")
+
+
+class TestSceneBinary(unittest.TestCase):
+    """Tests for the binary columnar scene format."""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        with open(EXAMPLE_GRAPH) as file: self.data = json.load(file)
+        self.data['nodes'][0]['inputs'][0]['value'] = "text"
+
+    def test_000_round_trip(self):
+        """Test if the binary format gives back the JSON data and is smaller than the indented JSON."""
+        raw_data = dumpsBinary(self.data)
+        assert(raw_data.startswith(MAGIC))
+        assert(loadsBinary(raw_data) == self.data)
+        assert(len(raw_data) * 4 < len(json.dumps(self.data, indent=4)))
+
+    def test_001_load_from_file(self):
+        """Test if loadFromFile detects the binary format and rejects a truncated file."""
+        filename = os.path.join(tempfile.mkdtemp(), "scene.bin")
+        raw_data = dumpsBinary(self.data)
+        with open(filename, "wb") as file: file.write(raw_data)
+        scene = SceneModel()
+        scene.loadFromFile(filename)
+        assert([node.id for node in scene.nodes] == [node['id'] for node in self.data['nodes']])
+        assert(len(scene.edges) == len(self.data['edges']))
+
+        with open(filename, "wb") as file: file.write(raw_data[:len(raw_data) // 2])
+        self.assertRaises(InvalidFile, SceneModel().loadFromFile, filename)
+        os.remove(filename)
+
+    def test_002_corrupt_indexes(self):
+        """Test if string indexes and socket counts pointing out of the tables are rejected as invalid."""
+        raw_data = bytearray(dumpsBinary(self.data))
+        version, node_count, socket_count, edge_count, string_count, scene_size = _HEADER.unpack_from(
+            raw_data, len(MAGIC))
+        lengths = len(MAGIC) + _HEADER.size + scene_size
+        strings_size = sum(struct.unpack_from('<%dI' % string_count, raw_data, lengths))
+        nodes = lengths + 4 * string_count + strings_size
+        # the name column follows the id, pos_x and pos_y columns, the inputs column follows the flags and extra ones
+        names = nodes + (8 + 8 + 8) * node_count
+        inputs = names + (4 + 1 + 4) * node_count
+
+        corrupt = bytearray(raw_data)
+        struct.pack_into('<I', corrupt, names, string_count + 1)
+        self.assertRaises(ValueError, loadsBinary, bytes(corrupt))
+
+        corrupt = bytearray(raw_data)
+        struct.pack_into('<I', corrupt, inputs, struct.unpack_from('<I', raw_data, inputs)[0] + 1)
+        self.assertRaises(ValueError, loadsBinary, bytes(corrupt))
+
+    def test_003_save_by_extension(self):
+        """Test if the editor saves files with the binary extension in the binary format and the others as JSON."""
+        app = QApplication.instance() or QApplication([])
+        from nodeeditor.node_editor_widget import NodeEditorWidget
+        directory = tempfile.mkdtemp()
+        editor = NodeEditorWidget()
+        for name, binary in (("scene.bin", True), ("scene.json", False)):
+            filename = os.path.join(directory, name)
+            editor.fileSave(filename)
+            assert(editor.waitForSave())
+            with open(filename, "rb") as file: assert(file.read().startswith(MAGIC) == binary)
+        editor.journal.close()
+        for name in os.listdir(directory): os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_scene_saver` module."""
+
+
+import json
+import os
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+from nodeeditor.node_scene_saver import SceneSaver, writeFileAtomically
+
+EXAMPLE_GRAPH = os.path.join(os.path.dirname(__file__), "..", "examples", "example_calculator", "333.json")
+
+
+class TestSceneSaver(unittest.TestCase):
+    """Tests for the background atomic saving of scene files."""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.app = QApplication.instance() or QApplication([])
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "scene.json")
+        with open(EXAMPLE_GRAPH) as file: self.data = json.load(file)
+
+    def tearDown(self):
+        """Remove the saved files."""
+        for name in os.listdir(self.directory): os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def test_000_failed_write_keeps_the_file(self):
+        """Test if a write failing halfway leaves the previous file and no temporary file."""
+        with open(self.filename, "wb") as file: file.write(b"previous")
+
+        def write(file):
+            file.write(b"partial")
+            raise ValueError("encoding failed")
+
+        self.assertRaises(ValueError, writeFileAtomically, self.filename, write)
+        assert(os.listdir(self.directory) == ["scene.json"])
+        with open(self.filename, "rb") as file: assert(file.read() == b"previous")
+
+    def test_001_background_save(self):
+        """Test if the saver writes the snapshot on its thread and signals the result."""
+        saver = SceneSaver()
+        results = []
+        saver.saved.connect(lambda filename: results.append(("saved", filename)))
+        saver.failed.connect(lambda filename, message: results.append(("failed", filename)))
+
+        saver.save(self.data, self.filename)
+        assert(saver.wait())
+        assert(results == [("saved", self.filename)])
+        with open(self.filename) as file: assert(json.load(file) == self.data)
+
+        missing = os.path.join(self.directory, "missing", "scene.json")
+        saver.save(self.data, missing)
+        assert(not saver.wait())
+        assert(results[-1] == ("failed", missing))
+        assert(not saver.isSaving())
+
+
+if __name__ == '__main__':
+    unittest.main()
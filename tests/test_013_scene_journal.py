@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_scene_journal` module."""
+
+
+import copy
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+from nodeeditor.node_json import dumpsJSON
+from nodeeditor.node_scene_journal import diffSceneData, replayJournal, readJournal, journalFilename, _fileHeader
+
+EXAMPLE_GRAPH = os.path.join(os.path.dirname(__file__), "..", "examples", "example_calculator", "333.json")
+
+
+class TestSceneJournal(unittest.TestCase):
+    """Tests for the delta records of the scene journal."""
+
+    def setUp(self):
+        """Set up test fixtures, if any. Make a few successive states of the example graph."""
+        with open(EXAMPLE_GRAPH) as file: self.saved = json.load(file)
+        self.states = [self.saved]
+
+        moved = copy.deepcopy(self.saved)
+        moved['nodes'][0]['pos_x'] += 100
+        self.states.append(moved)
+
+        removed = copy.deepcopy(moved)
+        node_id = removed['nodes'].pop(1)['id']
+        socket_ids = {socket['id'] for node in removed['nodes'] for socket in node['inputs'] + node['outputs']}
+        removed['edges'] = [edge for edge in removed['edges'] if edge['start'] in socket_ids and edge['end'] in socket_ids]
+        self.states.append(removed)
+
+        reordered = copy.deepcopy(removed)
+        reordered['nodes'].reverse()
+        reordered['user_vars'] = [{'title': 'x', 'id': node_id, 'type': 1}]
+        self.states.append(reordered)
+
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "scene.json")
+
+    def tearDown(self):
+        """Remove the journaled files."""
+        shutil.rmtree(self.directory)
+
+    def test_000_replay(self):
+        """Test if replaying the records over the saved state, or over a later state, gives the last state."""
+        records = [diffSceneData(old, new) for old, new in zip(self.states, self.states[1:])]
+        assert(all(records))
+        assert(diffSceneData(self.saved, copy.deepcopy(self.saved)) == {})
+        assert(len(dumpsJSON(records[0])) * 4 < len(dumpsJSON(self.saved)))
+        assert(replayJournal(self.saved, records) == self.states[-1])
+        assert(replayJournal(self.states[1], records) == self.states[-1])
+
+    def test_001_read_journal(self):
+        """Test if a torn last record is dropped and a journal of an other version of the file is ignored."""
+        with open(self.filename, "w") as file: json.dump(self.saved, file)
+        record = diffSceneData(self.saved, self.states[1])
+        with open(journalFilename(self.filename), "wb") as file:
+            file.write(dumpsJSON(_fileHeader(self.filename)) + b'\n' + dumpsJSON(record) + b'\n{"nodes":[')
+        assert(readJournal(self.filename) == [record])
+
+        with open(self.filename, "a") as file: file.write(" ")
+        assert(readJournal(self.filename) is None)
+
+
+class FakeMasterWindow():
+    """Stand-in for the ``MasterWindow`` called by the history every 30 stamps."""
+
+    def FileAutoSave(self):
+        pass
+
+
+class TestEditorJournal(unittest.TestCase):
+    """Tests for journaling and recovering the changes of a graph opened in an editor."""
+
+    def setUp(self):
+        """Set up test fixtures, if any. Copy the example graph, which has user variables."""
+        self.app = QApplication.instance() or QApplication([])
+        from examples.example_calculator.graph_compiler import loadNodeRegistry
+        from examples.example_calculator.master_editor_wnd import MasterEditorWnd
+        from examples.example_calculator.editor_var_events_lists import VarEventList
+        loadNodeRegistry()
+
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "scene.json")
+        shutil.copy(EXAMPLE_GRAPH, self.filename)
+        with open(self.filename) as file: self.saved = json.load(file)
+
+        self.editor = MasterEditorWnd()
+        self.scene = self.editor.scene
+        self.var_list = VarEventList()
+        self.scene.VEListWdg = self.var_list
+        self.var_list.Scene = self.scene
+        self.scene.history.masterWndRef = FakeMasterWindow()
+
+    def tearDown(self):
+        """Remove the journaled files."""
+        self.editor.journal.close()
+        shutil.rmtree(self.directory)
+
+    def nodePositions(self) -> dict:
+        """Return the positions of the nodes of the scene by id."""
+        return {node.id: (node.pos.x(), node.pos.y()) for node in self.scene.nodes}
+
+    def writeJournal(self) -> dict:
+        """Write the journal left by a session which moved a node, return the moved state."""
+        moved = copy.deepcopy(self.saved)
+        moved['nodes'][0]['pos_x'] += 100
+        record = diffSceneData(self.saved, moved)
+        with open(journalFilename(self.filename), "wb") as file:
+            file.write(dumpsJSON(_fileHeader(self.filename)) + b'\n' + dumpsJSON(record) + b'\n')
+        return moved
+
+    def test_000_journal_file_is_lazy(self):
+        """Test if opening a graph writes no journal, the first change does and saving removes it."""
+        assert(self.editor.fileLoad(self.filename))
+        assert(self.editor.journal.isOpen())
+        assert(not os.path.exists(journalFilename(self.filename)))
+
+        self.scene.nodes[0].setPos(0, 0)
+        self.scene.history.storeHistory("Move", setModified=True)
+        assert(len(readJournal(self.filename)) == 1)
+
+        self.editor.fileSave()
+        assert(self.editor.waitForSave())
+        assert(not os.path.exists(journalFilename(self.filename)))
+        assert(self.editor.journal.isOpen())
+
+    def test_001_recovery(self):
+        """Test if the journal is replayed over the saved file, keeps the user variables and is kept until saved."""
+        moved = self.writeJournal()
+
+        self.editor.confirmJournalRecovery = lambda records: records == 1
+        assert(self.editor.fileLoad(self.filename))
+        node_id = moved['nodes'][0]['id']
+        assert(self.nodePositions()[node_id][0] == moved['nodes'][0]['pos_x'])
+        assert(len(self.scene.nodes) == len(self.saved['nodes']))
+        assert(len(self.var_list.USERVARS) == 4 and self.var_list.VarList.count() == 4)
+        assert([stamp['desc'] for stamp in self.scene.history.history_stack] ==
+               ["Initial History Stamp", "Recover unsaved changes"])
+        assert(self.editor.isModified())
+
+        # the recovered changes are journaled again, a crash now loses nothing
+        records = readJournal(self.filename)
+        assert(len(records) == 1)
+        assert(replayJournal(self.saved, records)['nodes'][0]['pos_x'] == moved['nodes'][0]['pos_x'])
+
+        self.scene.history.undo()
+        assert(self.nodePositions()[node_id][0] == self.saved['nodes'][0]['pos_x'])
+
+    def test_002_declined_recovery(self):
+        """Test if declining the recovery loads the saved file and removes the journal."""
+        moved = self.writeJournal()
+
+        self.editor.confirmJournalRecovery = lambda records: False
+        assert(self.editor.fileLoad(self.filename))
+        assert(self.nodePositions()[moved['nodes'][0]['id']][0] == self.saved['nodes'][0]['pos_x'])
+        assert(not os.path.exists(journalFilename(self.filename)))
+        assert(not self.editor.isModified())
+
+    def test_003_failed_recovery(self):
+        """Test if a recovery failing while deserializing keeps the saved file loaded, the journal on the disk and
+        journals the next changes after it."""
+        moved = self.writeJournal()
+        # the previous session stopped while writing a record
+        with open(journalFilename(self.filename), "ab") as file: file.write(b'{"nodes":[')
+        records = readJournal(self.filename)
+
+        original = self.scene.deserialize
+        def deserialize(data, *args, **kwargs):
+            # loading the saved file and rolling back to it work, deserializing the recovered changes fails
+            if data['nodes'][0] == moved['nodes'][0]:
+                self.scene.nodes[0].remove()
+                raise RuntimeError("failed")
+            return original(data, *args, **kwargs)
+
+        self.editor.confirmJournalRecovery = lambda records: True
+        self.scene.deserialize = deserialize
+        with mock.patch("nodeeditor.node_editor_widget.QMessageBox.warning") as warning:
+            assert(self.editor.fileLoad(self.filename))
+        assert(warning.called)
+        assert(self.nodePositions()[self.saved['nodes'][0]['id']][0] == self.saved['nodes'][0]['pos_x'])
+        assert(len(self.scene.nodes) == len(self.saved['nodes']))
+        assert(len(self.var_list.USERVARS) == 4)
+        assert(readJournal(self.filename) == records and len(records) == 1)
+
+        assert(self.editor.journal.isOpen())
+        self.scene.nodes[1].setPos(0, 0)
+        self.scene.history.storeHistory("Move", setModified=True)
+        assert(readJournal(self.filename)[:-1] == records and len(readJournal(self.filename)) == len(records) + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_scene_transaction` module."""
+
+
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+EXAMPLE_GRAPH = os.path.join(os.path.dirname(__file__), "..", "examples", "example_calculator", "333.json")
+
+
+def sortedSceneData(data):
+    """Return the serialized scene with its items sorted by id, restoring a History Stamp may reorder them."""
+    data = dict(data)
+    for key in ('nodes', 'edges'): data[key] = sorted(data[key], key=lambda item: item['id'])
+    return data
+
+
+class FakeMasterWindow():
+    """Stand-in for the ``MasterWindow`` called by the history every 30 stamps."""
+
+    def FileAutoSave(self):
+        pass
+
+
+class TestSceneTransaction(unittest.TestCase):
+    """Tests for grouping modifications of a scene with user variables into transactions."""
+
+    def setUp(self):
+        """Set up test fixtures, if any. Load the example graph, which has user variables."""
+        self.app = QApplication.instance() or QApplication([])
+        from examples.example_calculator.graph_compiler import loadNodeRegistry
+        from examples.example_calculator.master_editor_wnd import MasterEditorWnd
+        from examples.example_calculator.editor_var_events_lists import VarEventList
+        loadNodeRegistry()
+
+        self.editor = MasterEditorWnd()
+        self.scene = self.editor.scene
+        self.var_list = VarEventList()
+        self.scene.VEListWdg = self.var_list
+        self.var_list.Scene = self.scene
+        self.scene.history.masterWndRef = FakeMasterWindow()
+
+        self.scene.loadFromFile(EXAMPLE_GRAPH)
+        self.scene.history.clear()
+        self.scene.history.storeInitialHistoryStamp()
+        self.scene.has_been_modified = False
+
+        self.modified_calls = []
+        self.scene.addHasBeenModifiedListener(lambda: self.modified_calls.append(True))
+
+    def test_000_nested_commit(self):
+        """Test if nested levels take one snapshot and commit one History Stamp with the outermost one."""
+        snapshots = []
+        create_stamp = self.scene.history.createHistoryStamp
+        self.scene.history.createHistoryStamp = lambda desc: snapshots.append(desc) or create_stamp(desc)
+
+        with self.scene.transaction("Outer"):
+            self.scene.nodes[0].remove()
+            self.scene.history.storeHistory("first", setModified=True)
+            with self.scene.transaction("Inner"):
+                self.scene.nodes[0].remove()
+                self.scene.history.storeHistory("second", setModified=True)
+            assert(len(self.scene.history.history_stack) == 1 and not self.modified_calls)
+
+        assert(snapshots == ["Outer", "Outer"])
+        assert([stamp['desc'] for stamp in self.scene.history.history_stack] == ["Initial History Stamp", "Outer"])
+        assert(self.modified_calls == [True])
+        assert(not self.scene.isInTransaction())
+
+    def test_001_rollback_with_user_vars(self):
+        """Test if an exception restores the nodes and keeps the user variables registered once."""
+        data = self.scene.serialize()
+        assert(len(data['user_vars']) == 4)
+
+        with self.assertRaises(RuntimeError):
+            with self.scene.transaction("Outer"):
+                with self.scene.transaction("Inner"):
+                    self.scene.nodes[0].remove()
+                    self.scene.history.storeHistory("Remove", setModified=True)
+                    raise RuntimeError("failed")
+
+        assert(sortedSceneData(self.scene.serialize()) == sortedSceneData(data))
+        assert(len(self.var_list.user_vars_data) == 4 and self.var_list.VarList.count() == 4)
+        assert(len(self.scene.history.history_stack) == 1)
+        assert(not self.scene.has_been_modified and not self.modified_calls)
+        assert(not self.scene.isInTransaction())
+
+        # undo restores the user variables of the stamp in the same way
+        self.scene.history.storeHistory("Move", setModified=True)
+        self.scene.history.undo()
+        assert(len(self.var_list.USERVARS) == 4)
+
+    def test_002_deferred_code_update(self):
+        """Test if code view updates requested inside a transaction are requested once, on commit."""
+        self.editor.flushTextCode()
+        with self.scene.transaction("Edit"):
+            self.editor.UpdateTextCode()
+            self.editor.UpdateTextCode()
+            assert(not self.editor.flushTextCode())
+        assert(self.editor.flushTextCode())
+
+    def test_003_delete_selected(self):
+        """Test if deleting several selected nodes stores one History Stamp."""
+        for node in self.scene.nodes[:2]: node.grNode.setSelected(True)
+        history = self.scene.history
+        steps = len(history.history_stack)
+        count = len(self.scene.nodes)
+        self.scene.getView().deleteSelected()
+        assert(len(self.scene.nodes) == count - 2)
+        assert(len(history.history_stack) == steps + 1)
+        assert(history.history_stack[-1]['desc'] == "Delete selected")
+
+    def test_004_inner_exception_caught_by_outer(self):
+        """Test if an exception caught after leaving an inner level aborts and restores the whole transaction."""
+        from nodeeditor.node_scene_transaction import TransactionAborted
+        data = self.scene.serialize()
+
+        with self.assertRaises(TransactionAborted) as context:
+            with self.scene.transaction("Outer"):
+                self.scene.nodes[0].remove()
+                self.scene.history.storeHistory("Remove", setModified=True)
+                try:
+                    with self.scene.transaction("Inner"):
+                        # half done work of a nested operation
+                        self.scene.nodes[0].remove()
+                        raise RuntimeError("failed")
+                except RuntimeError:
+                    pass
+
+        assert(isinstance(context.exception.__cause__, RuntimeError))
+        assert(sortedSceneData(self.scene.serialize()) == sortedSceneData(data))
+        assert(len(self.var_list.user_vars_data) == 4)
+        assert(len(self.scene.history.history_stack) == 1)
+        assert(not self.scene.has_been_modified and not self.modified_calls)
+        assert(not self.scene.isInTransaction())
+
+        # the next transaction is not affected
+        with self.scene.transaction("Next"):
+            self.scene.nodes[0].remove()
+            self.scene.history.storeHistory("Remove", setModified=True)
+        assert(len(self.scene.nodes) == len(data['nodes']) - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
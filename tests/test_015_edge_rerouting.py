@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_edge_rerouting` module."""
+
+
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+
+class FakeMasterWindow():
+    """Stand-in for the ``MasterWindow`` called by the history every 30 stamps."""
+
+    def FileAutoSave(self):
+        pass
+
+
+class TestEdgeRerouting(unittest.TestCase):
+    """Tests for moving all edges of a socket to another socket."""
+
+    def setUp(self):
+        """Set up test fixtures, if any. Connect one output to many inputs."""
+        self.app = QApplication.instance() or QApplication([])
+        from examples.example_calculator.graph_compiler import loadNodeRegistry
+        from examples.example_calculator.master_editor_wnd import MasterEditorWnd
+        from examples.example_calculator.editor_var_events_lists import VarEventList
+        from examples.example_calculator.nodes.nodes_configuration import FUN_ADD, get_node_by_type
+        from nodeeditor import node_edge_rerouting
+        from nodeeditor.node_edge import Edge
+        loadNodeRegistry()
+        node_edge_rerouting.DEBUG_REROUTING = False
+
+        self.editor = MasterEditorWnd()
+        scene = self.editor.scene
+        scene.VEListWdg = VarEventList()
+        scene.VEListWdg.Scene = scene
+        scene.history.masterWndRef = FakeMasterWindow()
+
+        self.source = get_node_by_type(FUN_ADD)(scene)
+        self.target = get_node_by_type(FUN_ADD)(scene)
+        self.consumers = [get_node_by_type(FUN_ADD)(scene) for i in range(20)]
+        for node in self.consumers: Edge(scene, self.source.outputs[0], node.inputs[0])
+
+    def test_000_batched_updates(self):
+        """Test if rerouting many edges refreshes each of both sockets once."""
+        updates = []
+        for socket in (self.source.outputs[0], self.target.outputs[0]):
+            socket.updateConnectionState = lambda socket=socket, update=socket.updateConnectionState: \
+                updates.append(socket) or update()
+
+        rerouting = self.editor.graph_graphics_view.rerouting
+        rerouting.startRerouting(self.source.outputs[0])
+        rerouting.stopRerouting(self.target.outputs[0])
+
+        assert(not self.source.outputs[0].hasAnyEdge())
+        assert([edge.getOtherSocket(self.target.outputs[0]).node for edge in self.target.outputs[0].socketEdges] ==
+               self.consumers)
+        assert(sorted(map(id, updates)) == sorted(map(id, (self.source.outputs[0], self.target.outputs[0]))))
+        assert(not self.source.outputs[0].grSocket.isConnected and self.target.outputs[0].grSocket.isConnected)
+
+
+if __name__ == '__main__':
+    unittest.main()
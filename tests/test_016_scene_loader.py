@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_scene_loader` module."""
+
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), "..", "examples", "example_calculator")
+
+
+class FakeMasterWindow():
+    """Stand-in for the ``MasterWindow`` called by the history every 30 stamps."""
+
+    def FileAutoSave(self):
+        pass
+
+
+class TestSceneLoader(unittest.TestCase):
+    """Tests for loading scene files progressively into an editor."""
+
+    def setUp(self):
+        """Set up test fixtures, if any. Copy two example graphs, loading them opens their journals."""
+        self.app = QApplication.instance() or QApplication([])
+        from examples.example_calculator.graph_compiler import loadNodeRegistry
+        from examples.example_calculator.master_editor_wnd import MasterEditorWnd
+        from examples.example_calculator.editor_var_events_lists import VarEventList
+        loadNodeRegistry()
+
+        self.directory = tempfile.mkdtemp()
+        self.filenames = []
+        for name in ("333.json", "444.json"):
+            self.filenames.append(os.path.join(self.directory, name))
+            shutil.copy(os.path.join(EXAMPLES, name), self.filenames[-1])
+
+        self.editor = MasterEditorWnd()
+        scene = self.editor.scene
+        scene.VEListWdg = VarEventList()
+        scene.VEListWdg.Scene = scene
+        scene.history.masterWndRef = FakeMasterWindow()
+
+    def tearDown(self):
+        """Remove the copied graphs."""
+        self.editor.journal.close()
+        shutil.rmtree(self.directory)
+
+    def test_000_second_load_cancels_the_first(self):
+        """Test if loading a file while an other one is loading cancels the first load."""
+        results = []
+        first = self.editor.fileLoadAsync(self.filenames[0])
+        first.addFinishedListener(lambda success: results.append(("first", success)))
+
+        second = self.editor.fileLoadAsync(self.filenames[1])
+        second.addFinishedListener(lambda success: results.append(("second", success)))
+        assert(results == [("first", False)] and not first.is_running)
+        while second.is_running: second.step()
+
+        with open(self.filenames[1]) as file: data = json.load(file)
+        assert(results[-1] == ("second", True))
+        assert(sorted(node.id for node in self.editor.scene.nodes) == sorted(node['id'] for node in data['nodes']))
+        assert(self.editor.filename == self.filenames[1] and self.editor.loader is None)
+        assert(not self.editor.scene.isInTransaction())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `examples.example_calculator.editor_files_wdg` module."""
+
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtCore import QItemSelectionModel
+from qtpy.QtWidgets import QApplication
+
+EXAMPLE_GRAPH = os.path.join(os.path.dirname(__file__), "..", "examples", "example_calculator", "333.json")
+
+
+class FakeMasterWindow():
+    """Stand-in for the ``MasterWindow`` opening the files selected in the project tree."""
+
+    def __init__(self):
+        self.opened = []
+
+    def onFileOpen(self, all_files):
+        self.opened.append(all_files)
+
+
+class TestFilesWidget(unittest.TestCase):
+    """Tests for opening graphs from the project tree."""
+
+    def setUp(self):
+        """Set up test fixtures, if any. Make a project directory with graphs and an other file."""
+        self.app = QApplication.instance() or QApplication([])
+        # imported by the master window, as in the application: the two modules import each other
+        from examples.example_calculator.master_window import MasterWindow
+        from examples.example_calculator.editor_files_wdg import FilesWDG
+
+        self.directory = tempfile.mkdtemp()
+        for name in ("graph.json", "graph.bin", "notes.txt"):
+            shutil.copy(EXAMPLE_GRAPH, os.path.join(self.directory, name))
+
+        # the default project directory is in the Windows user profile
+        with mock.patch.object(FilesWDG, "CreateDefaultDir"):
+            self.files_wdg = FilesWDG()
+        self.files_wdg.Project_Directory = self.directory
+        self.files_wdg.tree_wdg.setRootIndex(self.files_wdg.Model.index(self.directory))
+        self.files_wdg.masterRef = FakeMasterWindow()
+
+    def tearDown(self):
+        """Remove the project directory."""
+        shutil.rmtree(self.directory)
+
+    def test_000_open_selected_files(self):
+        """Test if the selected JSON and binary graphs are opened once each and the other files are skipped."""
+        selection = self.files_wdg.tree_wdg.selectionModel()
+        for name in ("graph.json", "graph.bin", "notes.txt"):
+            selection.select(self.files_wdg.Model.index(os.path.join(self.directory, name)),
+                             QItemSelectionModel.Select | QItemSelectionModel.Rows)
+
+        self.files_wdg.OpenSelectedFiles()
+        assert([sorted(map(os.path.basename, files)) for files in self.files_wdg.masterRef.opened] ==
+               [["graph.bin", "graph.json"]])
+
+
+if __name__ == '__main__':
+    unittest.main()